@@ -1,24 +1,48 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from src.data import fetch_data
+from src.data import fetch_data, download_yfinance
+from src.store import OHLCVStore
+from src.cache import LRUCache, freeze
 from src.strategy import calculate_signals
 from src.backtest import run_backtest
-from src.metrics import calculate_metrics
+from src.metrics import compute_metrics, format_metrics, rolling_metrics
 from src.utils import plot_interactive_results
+from src import instrument
 import os
+import contextlib
+import importlib.util
 from dotenv import load_dotenv
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
+def gemini_installed() -> bool:
+    # The Gemini client is slow to import, so startup only checks it exists;
+    # it is imported when an insight is requested
+    try:
+        return importlib.util.find_spec("google.generativeai") is not None
+    except ModuleNotFoundError:
+        return False
 
 # Load environment variables
 load_dotenv()
 
 st.set_page_config(page_title="Automated Quant Trader", layout="wide")
 
+@st.cache_resource
+def get_store():
+    # One on-disk bar cache per server process, shared by all sessions
+    return OHLCVStore(os.getenv("OHLCV_CACHE_DIR", ".cache/ohlcv"), provider=download_yfinance)
+
+def get_pipeline_cache():
+    # Per-session memo of pipeline stages, so re-running seen settings is instant
+    if 'pipeline_cache' not in st.session_state:
+        max_mb = int(os.getenv("PIPELINE_CACHE_MB", "512"))
+        st.session_state.pipeline_cache = LRUCache(max_bytes=max_mb * 2**20)
+    return st.session_state.pipeline_cache
+
+def recording_timings(enabled: bool):
+    # Spans are only collected (with memory tracing) when the timings panel is on
+    return instrument.recording(trace_memory=True) if enabled else contextlib.nullcontext([])
+
 # Custom CSS for consistent, professional, and smaller fonts
 st.markdown("""
     <style>
@@ -91,10 +115,22 @@ elif strategy_type == "Stochastic Oscillator":
 
 trade_qty = st.sidebar.number_input("Standard Trade Quantity (units)", value=100)
 initial_capital = st.sidebar.number_input("Initial Capital ($)", value=100000.0)
+with st.sidebar.expander("💸 Trading Costs"):
+    costs = {
+        'commission_bps': st.number_input("Commission (bps of notional)", min_value=0.0, value=0.0),
+        'spread_bps': st.number_input("Bid-ask spread (bps)", min_value=0.0, value=0.0),
+        'impact_bps': st.number_input("Market impact (bps at 100% of bar volume)", min_value=0.0, value=0.0,
+                                      help="Slippage grows with the square root of the order's share of the bar's volume."),
+    }
+costs = {k: v for k, v in costs.items() if v}
+compact_mode = st.sidebar.checkbox("🗜️ Compact mode (float32)", value=False,
+                                   help="Store results as float32 without chart-only columns (about 4x less memory).")
+show_timings = st.sidebar.checkbox("⏱️ Show stage timings", value=False,
+                                   help="Time each pipeline stage (with memory tracing) and show a breakdown.")
 
 st.sidebar.divider()
 st.sidebar.header("✨ AI Features")
-gemini_api_key = os.getenv("GEMINI_API_KEY") if genai else None
+gemini_api_key = os.getenv("GEMINI_API_KEY") if gemini_installed() else None
 
 if gemini_api_key:
     st.sidebar.success("✅ Gemini AI Connected")
@@ -107,13 +143,30 @@ if st.button("🚀 Run Automated Simulation", use_container_width=True):
         st.error("Start Date must be before End Date.")
     else:
         try:
-            with st.spinner(f"Fetching data and simulating {strategy_type} for {ticker_input}..."):
-                data = fetch_data(ticker_input, start_date_input.strftime('%Y-%m-%d'), end_date_input.strftime('%Y-%m-%d'))
-                data_with_signals = calculate_signals(data, strategy_type, params)
-                results = run_backtest(data_with_signals, initial_capital)
+            with st.spinner(f"Fetching data and simulating {strategy_type} for {ticker_input}..."), \
+                    recording_timings(show_timings) as timings:
+                # Each stage is keyed on its own inputs only: data is shared across
+                # strategies, signal frames across capital changes
+                cache = get_pipeline_cache()
+                start_str, end_str = start_date_input.strftime('%Y-%m-%d'), end_date_input.strftime('%Y-%m-%d')
+                data_key = ('data', ticker_input, start_str, end_str)
+                signals_key = ('signals', data_key, strategy_type, freeze(params), compact_mode)
+                results_key = ('backtest', signals_key, initial_capital, freeze(costs))
+
+                with instrument.span("fetch_data", symbol=ticker_input, cached=data_key in cache) as s:
+                    data = cache.get_or_compute(data_key, lambda: fetch_data(ticker_input, start_str, end_str, store=get_store()))
+                    s['rows'] = len(data)
+                with instrument.span("calculate_signals", strategy=strategy_type, rows=len(data), cached=signals_key in cache):
+                    data_with_signals = cache.get_or_compute(signals_key, lambda: calculate_signals(data, strategy_type, params, compact=compact_mode))
+                with instrument.span("run_backtest", rows=len(data), cached=results_key in cache):
+                    results = cache.get_or_compute(results_key, lambda: run_backtest(data_with_signals, initial_capital, compact=compact_mode, costs=costs or None))
+                with instrument.span("calculate_metrics", rows=len(data), cached=('metrics', results_key) in cache):
+                    metrics = cache.get_or_compute(('metrics', results_key), lambda: compute_metrics(results))
                 
+                st.session_state.results_key = results_key
                 st.session_state.backtest_results = results
-                st.session_state.backtest_metrics = calculate_metrics(results)
+                st.session_state.backtest_metrics = metrics
+                st.session_state.timings = timings
                 st.session_state.current_ticker = ticker_input
                 st.session_state.current_strategy = strategy_type
                 st.session_state.current_params = params
@@ -128,7 +181,8 @@ if st.button("🚀 Run Automated Simulation", use_container_width=True):
 
 if st.session_state.backtest_ready:
     res = st.session_state.backtest_results
-    met = st.session_state.backtest_metrics
+    values = st.session_state.backtest_metrics
+    met = format_metrics(values)
     t_sym = st.session_state.current_ticker
     
     st.divider()
@@ -146,8 +200,7 @@ if st.session_state.backtest_ready:
     st.divider()
     
     # Comparison and Winners
-    mkt_return_pct = float(met["Market Return"].strip('%')) / 100
-    mkt_final_value = initial_capital * (1 + mkt_return_pct)
+    mkt_final_value = initial_capital * (1 + values["Market Return"])
     mkt_net_profit = mkt_final_value - initial_capital
 
     if net_profit > mkt_net_profit:
@@ -167,8 +220,29 @@ if st.session_state.backtest_ready:
     # Visualization
     st.divider()
     st.subheader("📈 Visualization")
-    fig = plot_interactive_results(res, t_sym)
+    # Built figures are kept until the results they show change
+    figure_key = ('figure', st.session_state.get('results_key'), t_sym)
+    with recording_timings(show_timings) as plot_timings:
+        with instrument.span("plot_interactive_results", rows=len(res), cached=figure_key in get_pipeline_cache()):
+            fig = get_pipeline_cache().get_or_compute(figure_key, lambda: plot_interactive_results(res, t_sym),
+                                                      size=int(res.memory_usage(index=True).sum()))
     st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("📉 Rolling Metrics"):
+        rolling_window = st.number_input("Window (bars)", min_value=5, max_value=max(5, len(res)), value=min(63, max(5, len(res))))
+        rolling = rolling_metrics(res, int(rolling_window))
+        st.line_chart(rolling[['Rolling_Sharpe']])
+        st.line_chart(rolling[['Rolling_Volatility', 'Rolling_Drawdown']])
+
+    if show_timings:
+        with st.expander("⏱️ Stage Timings", expanded=True):
+            stage_log = pd.DataFrame(st.session_state.get('timings', []) + plot_timings)
+            if not stage_log.empty:
+                stage_log['ms'] = stage_log.pop('seconds') * 1e3
+                for col in ('bytes_allocated', 'peak_bytes'):
+                    if col in stage_log:
+                        stage_log[col.replace('bytes', 'MB')] = stage_log.pop(col) / 2**20
+                st.dataframe(stage_log, use_container_width=True)
     
     with st.expander("📝 View Automated Trade Log"):
         trades = res[res['Position'] != 0].copy()
@@ -184,6 +258,7 @@ if st.session_state.backtest_ready:
         st.subheader("🔮 AI Performance Deep-Dive")
         if st.button("🪄 Generate AI Strategy Insight", use_container_width=True):
             try:
+                import google.generativeai as genai
                 genai.configure(api_key=gemini_api_key)
                 model = genai.GenerativeModel('gemini-2.0-flash') # State of the art Flash model
 
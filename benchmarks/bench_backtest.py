@@ -0,0 +1,54 @@
+"""
+Compares the full `run_backtest` + `compute_metrics` path with the lean
+`run_backtest(..., metrics_only=True)` mode: wall time, peak traced memory
+and the largest difference between the two metric sets, on clean prices
+and with a few missing Close values.
+
+    python -m benchmarks.bench_backtest [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest import run_backtest
+from src.metrics import compute_metrics
+from src.strategy import calculate_signals
+
+def _measure(fn, repeats):
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return result, (time.perf_counter() - start) / repeats, peak
+
+def _row(label, signals, repeats):
+    full, full_t, full_peak = _measure(lambda: compute_metrics(run_backtest(signals)), repeats)
+    lean, lean_t, lean_peak = _measure(lambda: run_backtest(signals, metrics_only=True), repeats)
+    diff = max(abs(full[k] - lean[k]) / max(abs(full[k]), 1.0) for k in full)
+    print(f"{label:>10}{full_t * 1e3:>10.2f}{lean_t * 1e3:>10.2f}{full_t / lean_t:>8.1f}x"
+          f"{full_peak / 2**20:>14.2f}{lean_peak / 2**20:>14.2f}{diff:>12.1e}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'bars':>10}{'full ms':>10}{'lean ms':>10}{'speedup':>9}{'full peak MB':>14}{'lean peak MB':>14}"
+          f"{'max |diff|':>12}")
+    for n in args.sizes:
+        signals = calculate_signals(make_ohlcv(n), "SMA Crossover", {'short_window': 50, 'long_window': 200})
+        _row(f"{n}", signals, args.repeats)
+        # Missing prices inside the series: both paths hold equity flat over them
+        gappy = signals.copy()
+        gappy.iloc[np.linspace(1, n - 2, 5).astype(int), gappy.columns.get_loc('Close')] = np.nan
+        _row(f"{n} NaN", gappy, args.repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Runs a config-driven batch over synthetic symbols into a fresh SQLite
+results store, interrupts it part-way (a fetch fails hard after half the
+symbols), resumes it, and then times ranking queries over the stored runs.
+
+    python -m benchmarks.bench_batch [--symbols 200] [--bars 2520] [--workers 4]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_ohlcv
+from src.batch import ResultsStore, run_batch
+
+class Crash(BaseException):
+    pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=2520)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    logging.getLogger("src.batch").setLevel(logging.WARNING)
+
+    symbols = [f"S{i:04d}" for i in range(args.symbols)]
+    config = {
+        "start_date": "2000-01-03", "end_date": "2010-01-01",
+        "batch": {
+            "symbols": symbols,
+            "strategies": {
+                "SMA Crossover": {"short_window": list(range(5, 55, 5)), "long_window": list(range(60, 260, 20))},
+                "RSI Strategy": {"period": [7, 14, 21, 28], "overbought": [65, 70, 75, 80],
+                                 "oversold": [20, 25, 30, 35]},
+                "Bollinger Bands": {"window": [10, 20, 30, 40], "num_std": [1.5, 2.0, 2.5, 3.0]},
+                "MACD Crossover": {"fast": [8, 12, 16], "slow": [21, 26, 34], "signal": [5, 9, 13]},
+            },
+        },
+    }
+    fetched = []
+
+    def fetch(symbol, start, end, crash_after=None):
+        if crash_after is not None and len(fetched) >= crash_after:
+            raise Crash()
+        fetched.append(symbol)
+        return make_ohlcv(args.bars, seed=int(symbol[1:]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "runs.sqlite")
+        start = time.perf_counter()
+        try:
+            run_batch(config, db, lambda *a: fetch(*a, crash_after=args.symbols // 2), max_workers=args.workers)
+        except Crash:
+            pass
+        first = time.perf_counter() - start
+        with ResultsStore(db) as store:
+            stored = store.count()
+        print(f"first run interrupted after {first:.1f} s with {stored:,} runs stored")
+
+        report = run_batch(config, db, fetch, max_workers=args.workers)
+        print(f"resumed: {report['skipped']:,} skipped, {report['completed']:,} run in {report['seconds']:.1f} s "
+              f"({report['completed'] / report['seconds']:,.0f} runs/s)")
+
+        with ResultsStore(db) as store:
+            print(f"{store.count():,} runs stored ({os.path.getsize(db) / 1e6:.0f} MB)")
+            for label, kwargs in [("top 20 by Sharpe", {}),
+                                  ("top 20 by Sharpe, one strategy", {"strategy": "RSI Strategy"}),
+                                  ("top 20 by Sharpe, one symbol", {"symbol": symbols[0]}),
+                                  ("20 worst drawdowns", {"metric": "Max Drawdown", "ascending": True})]:
+                start = time.perf_counter()
+                for _ in range(10):
+                    top = store.top(n=20, **kwargs)
+                print(f"{label:<34}{(time.perf_counter() - start) / 10 * 1e3:>8.2f} ms  ({len(top)} rows)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Runs signals + backtest for a synthetic universe in the default float64
+mode and in compact mode, keeping every result frame as a screen would.
+Reports per-stage peak traced memory, the memory the kept results occupy,
+and the compact-vs-float64 tolerance check for every strategy.
+
+    python -m benchmarks.bench_compact [--symbols 100] [--bars 5040]
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src import instrument
+from src.backtest import run_backtest
+from src.compact import COMPACT_RTOL, verify_compact
+from src.strategy import calculate_signals
+
+def _run(universe, strategy, params, compact):
+    kept = {}
+    start = time.perf_counter()
+    with instrument.recording(trace_memory=True) as records:
+        for symbol, data in universe.items():
+            with instrument.span("calculate_signals", symbol=symbol):
+                signals = calculate_signals(data, strategy, params, compact=compact)
+            with instrument.span("run_backtest", symbol=symbol):
+                kept[symbol] = run_backtest(signals, compact=compact)
+            del signals
+    elapsed = time.perf_counter() - start
+    peaks = {}
+    for r in records:
+        peaks[r["stage"]] = max(peaks.get(r["stage"], 0), r["peak_bytes"])
+    retained = sum(int(df.memory_usage(deep=True).sum()) for df in kept.values())
+    return peaks, retained, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--bars", type=int, default=5040)
+    args = parser.parse_args()
+
+    universe = {f"S{i:04d}": make_ohlcv(args.bars, seed=i) for i in range(args.symbols)}
+    strategy = "Bollinger Bands"
+    params = DEFAULT_PARAMS[strategy]
+    print(f"{args.symbols} symbols x {args.bars} bars, {strategy} (peaks are per symbol, MB)")
+    print(f"{'mode':<10}{'signals peak':>14}{'backtest peak':>15}{'results kept':>14}{'seconds':>9}")
+    for label, compact in (("float64", False), ("compact", True)):
+        peaks, retained, elapsed = _run(universe, strategy, params, compact)
+        print(f"{label:<10}{peaks['calculate_signals'] / 2**20:>14.2f}{peaks['run_backtest'] / 2**20:>15.2f}"
+              f"{retained / 2**20:>14.1f}{elapsed:>9.2f}")
+
+    print(f"\ntolerance check (signals exact, metrics within rtol {COMPACT_RTOL:g})")
+    print(f"{'strategy':<24}{'signal diffs':>13}{'max rel err':>13}{'worst metric':>24}{'ok':>5}")
+    data = universe["S0000"]
+    for strategy, params in DEFAULT_PARAMS.items():
+        report = verify_compact(data, strategy, params)
+        print(f"{strategy:<24}{report['signal_mismatches']:>13}{report['max_rel_error']:>13.1e}"
+              f"{str(report['worst_metric']):>24}{str(report['ok']):>5}")
+
+if __name__ == "__main__":
+    main()
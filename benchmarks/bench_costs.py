@@ -0,0 +1,83 @@
+"""
+Measures what the trading-cost model adds to a parameter sweep and to the
+column-wise backtest alone, with no costs, with commission and spread, and
+with volume-based impact as well (also over a missing Close); then how
+much each strategy's returns shrink once costs are paid.
+
+    python -m benchmarks.bench_costs [--bars 5040] [--columns 256] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.backtest import backtest_columns, run_backtest
+from src.metrics import compute_metrics
+from src.strategy import calculate_signals
+from src.sweep import param_grid, signal_block, sweep
+
+FIXED = {"commission_bps": 1.0, "spread_bps": 5.0}
+WITH_IMPACT = {**FIXED, "impact_bps": 50.0}
+
+def _best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=5040)
+    parser.add_argument("--columns", type=int, default=256, help="parameter combinations per block")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_ohlcv(args.bars)
+    close, volume = data['Close'].to_numpy(), data['Volume'].to_numpy()
+    prices = {col: data[col].to_numpy() for col in ("Close", "High", "Low")}
+    # A high-turnover block: Stochastic thresholds over a grid
+    k_period = np.resize(np.arange(5, 37), args.columns).astype(np.float64)
+    signals = signal_block(prices, "Stochastic Oscillator", {
+        'k_period': k_period, 'd_period': np.full(args.columns, 3.0),
+        'overbought': np.full(args.columns, 80.0), 'oversold': np.full(args.columns, 20.0)})
+    trades = int(np.abs(np.diff(signals, axis=0)).astype(bool).sum())
+
+    grid = {'k_period': list(range(5, 37)), 'd_period': [2, 3, 4, 5], 'overbought': [70, 80], 'oversold': [20, 30]}
+    settings = (("none", None), ("commission + spread", FIXED), ("+ volume impact", WITH_IMPACT))
+    print(f"sweep: Stochastic Oscillator, {args.bars} bars x "
+          f"{len(param_grid('Stochastic Oscillator', grid))} combinations")
+    print(f"{'costs':<22}{'ms':>9}{'overhead':>10}")
+    base = None
+    for label, costs in settings:
+        seconds = _best(lambda: sweep(data, "Stochastic Oscillator", grid, costs=costs), args.repeat)
+        base = base or seconds
+        print(f"{label:<22}{seconds * 1e3:>9.1f}{(seconds / base - 1) * 100:>9.0f}%")
+
+    print(f"\nbacktest_columns alone: {args.bars} bars x {args.columns} columns, {trades} trades in the block")
+    print(f"{'costs':<22}{'ms':>9}{'overhead':>10}")
+    base = None
+    for label, costs in settings:
+        seconds = _best(lambda: backtest_columns(close, signals, costs=costs, volume=volume), args.repeat)
+        base = base or seconds
+        print(f"{label:<22}{seconds * 1e3:>9.1f}{(seconds / base - 1) * 100:>9.0f}%")
+    # A missing Close: equity is held flat over it, still in one cumulative pass
+    gappy = close.copy()
+    gappy[args.bars // 2] = np.nan
+    seconds = _best(lambda: backtest_columns(gappy, signals, costs=WITH_IMPACT, volume=volume), args.repeat)
+    print(f"{'  one missing Close':<22}{seconds * 1e3:>9.1f}{(seconds / base - 1) * 100:>9.0f}%")
+
+    print(f"\ncost drag per strategy ({', '.join(f'{k}={v:g}' for k, v in WITH_IMPACT.items())})")
+    print(f"{'strategy':<24}{'trades':>7}{'return':>9}{'net':>9}{'sharpe':>8}{'net':>8}")
+    for strategy, params in DEFAULT_PARAMS.items():
+        sig = calculate_signals(data, strategy, params)
+        gross = compute_metrics(run_backtest(sig))
+        result = run_backtest(sig, costs=WITH_IMPACT)
+        net = compute_metrics(result)
+        print(f"{strategy:<24}{int((result['Cost'] > 0).sum()):>7}{gross['Total Return']:>9.1%}"
+              f"{net['Total Return']:>9.1%}{gross['Sharpe Ratio']:>8.2f}{net['Sharpe Ratio']:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Times cold imports of the entry points in fresh interpreters and checks that
+none of them pulls in a heavy dependency it defers (plotting, yfinance, the
+Gemini client). Exits non-zero when an import is over its budget or loads a
+deferred module, so startup regressions fail CI.
+
+    python -m benchmarks.bench_import [--repeats 5] [--scale 1.0]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Entry point -> (budget in ms, modules that must not be imported)
+TARGETS = {
+    "main": (1000, ["plotly", "matplotlib", "yfinance", "streamlit", "google.generativeai"]),
+    "src.batch": (1000, ["plotly", "matplotlib", "yfinance", "streamlit"]),
+    "src.utils": (1000, ["plotly", "matplotlib", "yfinance"]),
+    # Streamlit imports plotly itself, so only the other deferrals apply to the app
+    "app": (3000, ["matplotlib", "yfinance", "google.generativeai"]),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "loaded": sorted(m for m in {forbidden!r} if m in sys.modules)}}))
+"""
+
+def _probe(module, forbidden):
+    out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, forbidden=forbidden)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow machines)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'entry point':<12}{'median ms':>11}{'budget ms':>11}  deferred modules loaded")
+    for module, (budget, forbidden) in TARGETS.items():
+        runs = [_probe(module, forbidden) for _ in range(args.repeats)]
+        median = statistics.median(r["ms"] for r in runs)
+        loaded = sorted({m for r in runs for m in r["loaded"]})
+        over = median > budget * args.scale
+        failed |= over or bool(loaded)
+        print(f"{module:<12}{median:>11.0f}{budget * args.scale:>11.0f}  {', '.join(loaded) or '-'}"
+              f"{'  OVER BUDGET' if over else ''}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
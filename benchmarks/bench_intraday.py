@@ -0,0 +1,81 @@
+"""
+Backtests years of synthetic 1-minute bars held in an `OHLCVStore`: the
+in-memory path (load the frame, `calculate_signals`, `run_backtest` in
+metrics-only mode) against the chunked out-of-core path (`backtest_store`),
+plus chunked resampling to coarser bars. Reports wall time, peak traced
+memory and the largest relative difference between the two metric sets.
+
+    python -m benchmarks.bench_intraday [--bars 2000000] [--chunk-rows 250000]
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest import run_backtest
+from src.bars import resample_ohlcv, resample_store
+from src.chunked import backtest_store
+from src.store import OHLCVStore
+from src.strategy import calculate_signals
+
+STRATEGIES = {
+    "SMA Crossover": {'short_window': 50, 'long_window': 200},
+    "Bollinger Bands": {'window': 20, 'num_std': 2.0},
+    "MACD Crossover": {'fast': 12, 'slow': 26, 'signal': 9},
+}
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+def _diff(a, b):
+    return max(abs(a[k] - b[k]) / max(abs(a[k]), 1.0) for k in a)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=2_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=250_000)
+    args = parser.parse_args()
+
+    # Per-bar drift/volatility scaled to one-minute bars (390 per session)
+    history = make_ohlcv(args.bars, freq="min", start="2020-01-01", mu=0.05 / 390, sigma=0.2 / 390 ** 0.5)
+    end = history.index[-1] + pd.Timedelta(days=1)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root, provider=lambda symbol, start, stop, interval: history)
+        store.get("SYN", history.index[0], end, "1m")
+        print(f"{args.bars:,} one-minute bars, chunks of {args.chunk_rows:,}")
+
+        print(f"{'strategy':<18}{'in-memory s':>12}{'chunked s':>11}{'in-mem peak MB':>16}{'chunked peak MB':>17}"
+              f"{'max |diff|':>12}")
+        for strategy, params in STRATEGIES.items():
+            def in_memory():
+                data = store.get("SYN", "2020-01-01", end, "1m")
+                return run_backtest(calculate_signals(data, strategy, params), metrics_only=True)
+
+            full, full_t, full_peak = _measure(in_memory)
+            chunked, chunked_t, chunked_peak = _measure(
+                lambda: backtest_store(store, "SYN", strategy, params, "1m", chunk_rows=args.chunk_rows))
+            print(f"{strategy:<18}{full_t:>12.2f}{chunked_t:>11.2f}{full_peak / 2**20:>16.1f}"
+                  f"{chunked_peak / 2**20:>17.1f}{_diff(full, chunked):>12.1e}")
+
+        print(f"\n{'resample':<10}{'bars out':>10}{'in-memory s':>13}{'chunked s':>11}{'in-mem peak MB':>16}"
+              f"{'chunked peak MB':>17}{'equal':>7}")
+        for rule in ("5min", "1h", "1D"):
+            full, full_t, full_peak = _measure(
+                lambda: resample_ohlcv(store.get("SYN", "2020-01-01", end, "1m"), rule))
+            chunked, chunked_t, chunked_peak = _measure(
+                lambda: resample_store(store, "SYN", rule, "1m", args.chunk_rows))
+            print(f"{rule:<10}{len(chunked):>10,}{full_t:>13.2f}{chunked_t:>11.2f}{full_peak / 2**20:>16.1f}"
+                  f"{chunked_peak / 2**20:>17.1f}{str(full.equals(chunked)):>7}")
+
+if __name__ == "__main__":
+    main()
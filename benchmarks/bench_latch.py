@@ -0,0 +1,75 @@
+"""
+Benchmarks the vectorized latch used by the RSI, Bollinger and Stochastic
+strategies against the original per-bar loop, and checks that both produce
+identical Signal columns. The loop only runs over the first `--legacy-bars`
+bars (its cost per bar is constant) and its time is extrapolated to the
+full size; `--legacy-bars 0` runs it over everything (minutes at 1M bars).
+
+    python -m benchmarks.bench_latch [--sizes 10000 100000 1000000] [--legacy-bars 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from src.strategy import calculate_signals
+
+STRATEGIES = {
+    "RSI Strategy": {'period': 14, 'overbought': 70, 'oversold': 30},
+    "Bollinger Bands": {'window': 20, 'num_std': 2.0},
+    "Stochastic Oscillator": {'k_period': 14, 'd_period': 3, 'overbought': 80, 'oversold': 20},
+}
+
+def _legacy_latch(df, value_col, lower, upper):
+    # The per-bar loop the strategies used before `latch_signal`
+    df['Signal'] = 0.0
+    for i in range(1, len(df)):
+        lo = df[lower].iloc[i] if isinstance(lower, str) else lower
+        hi = df[upper].iloc[i] if isinstance(upper, str) else upper
+        if df[value_col].iloc[i] < lo:
+            df.loc[df.index[i], 'Signal'] = 1.0
+        elif df[value_col].iloc[i] > hi:
+            df.loc[df.index[i], 'Signal'] = 0.0
+        else:
+            df.loc[df.index[i], 'Signal'] = df['Signal'].iloc[i-1]
+    return df['Signal'].to_numpy()
+
+def _legacy_signal(result, strategy, params):
+    df = result.drop(columns=['Signal', 'Position'])
+    if strategy == "RSI Strategy":
+        return _legacy_latch(df, 'RSI', params['oversold'], params['overbought'])
+    if strategy == "Bollinger Bands":
+        return _legacy_latch(df, 'Close', 'Lower_Band', 'Upper_Band')
+    return _legacy_latch(df, '%K', params['oversold'], params['overbought'])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-bars", type=int, default=2_000,
+                        help="bars the (slow) legacy loop runs over; 0 for all")
+    args = parser.parse_args()
+
+    print(f"{'strategy':<24}{'bars':>10}{'vectorized s':>14}{'loop s':>12}{'speedup':>10}  identical")
+    extrapolated = False
+    for n in args.sizes:
+        data = make_ohlcv(n)
+        for strategy, params in STRATEGIES.items():
+            start = time.perf_counter()
+            result = calculate_signals(data, strategy, params)
+            fast = time.perf_counter() - start
+
+            # The latch only looks back, so a prefix of the result is checked on its own
+            sample = result.iloc[:args.legacy_bars] if args.legacy_bars else result
+            start = time.perf_counter()
+            expected = _legacy_signal(sample, strategy, params)
+            slow = (time.perf_counter() - start) * n / len(sample)
+            identical = np.array_equal(sample['Signal'].to_numpy(), expected)
+            mark = "*" if len(sample) < n else " "
+            extrapolated |= len(sample) < n
+            print(f"{strategy:<24}{n:>10}{fast:>14.4f}{slow:>11.2f}{mark}{slow / fast:>9.0f}x  {identical}")
+    if extrapolated:
+        print(f"* extrapolated from the first {args.legacy_bars} bars")
+
+if __name__ == "__main__":
+    main()
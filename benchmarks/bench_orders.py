@@ -0,0 +1,63 @@
+"""
+Replays a universe's Position changes through the local trade simulator two
+ways: one `place_order` call per order, and one `place_orders` batch into a
+columnar `TradeLedger`. Reports orders per second and checks that both end
+with the same cash, positions and fills.
+
+    python -m benchmarks.bench_orders [--symbols 500] [--bars 2520] [--cash 200000]
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.moomoo import LocalTradeSimulator, TradeLedger, orders_from_positions
+from src.panel import calculate_panel_signals, to_panel
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=2520)
+    parser.add_argument("--cash", type=float, default=200000.0,
+                        help="starting cash; small enough that some buys are rejected")
+    parser.add_argument("--qty", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger("src.moomoo").setLevel(logging.WARNING)
+
+    panel = to_panel({f"S{i:04d}": make_ohlcv(args.bars, seed=i) for i in range(args.symbols)})
+    strategy = "SMA Crossover"
+    signals = calculate_panel_signals(panel, strategy, DEFAULT_PARAMS[strategy])
+    orders = orders_from_positions(panel['Close'], signals.diff(), args.qty)
+    n = len(orders['qtys'])
+    print(f"{args.symbols} symbols x {args.bars} bars, {strategy}: {n} orders")
+
+    simulator = LocalTradeSimulator()
+    sequential = {"cash": args.cash, "positions": {}, "history": []}
+    start = time.perf_counter()
+    filled = np.array([
+        simulator.place_order(sequential, symbol, qty, "BUY" if side > 0 else "SELL", price)[0]
+        for symbol, qty, side, price in zip(orders['symbols'], orders['qtys'].astype(int).tolist(),
+                                            orders['sides'], orders['prices'].tolist())
+    ])
+    loop_t = time.perf_counter() - start
+
+    simulator = LocalTradeSimulator(TradeLedger())
+    batch = {"cash": args.cash, "positions": {}, "history": []}
+    start = time.perf_counter()
+    accepted = simulator.place_orders(batch, **orders)
+    batch_t = time.perf_counter() - start
+
+    print(f"{'mode':<12}{'seconds':>9}{'orders/s':>13}")
+    print(f"{'sequential':<12}{loop_t:>9.3f}{n / loop_t:>13,.0f}")
+    print(f"{'batch':<12}{batch_t:>9.3f}{n / batch_t:>13,.0f}")
+    print(f"speedup {loop_t / batch_t:.1f}x, {int((~accepted).sum())} rejected")
+    fills = simulator.ledger.to_frame()
+    same = (np.array_equal(filled, accepted) and sequential['cash'] == batch['cash']
+            and sequential['positions'] == batch['positions']
+            and np.array_equal(fills['price'].to_numpy(), [t['price'] for t in sequential['history']]))
+    print(f"identical cash, positions and fills: {same}")
+
+if __name__ == "__main__":
+    main()
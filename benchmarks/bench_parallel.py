@@ -0,0 +1,41 @@
+"""
+Runs every strategy over a synthetic universe with `run_universe` at
+increasing worker counts, reporting throughput, scaling and whether the
+results are identical to the single-process run.
+
+    python -m benchmarks.bench_parallel [--symbols 500] [--bars 2520]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.parallel import run_universe
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=2520)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({1, *(w for w in (2, 4, 8, 16, 32, 64) if w < cores), cores})
+    universe = {f"SYM{i:04d}": make_ohlcv(args.bars, seed=i) for i in range(args.symbols)}
+    jobs = [(symbol, strategy, params) for symbol in universe for strategy, params in DEFAULT_PARAMS.items()]
+    print(f"{len(universe)} symbols x {args.bars} bars, {len(jobs)} jobs, {cores} cores")
+
+    print(f"{'workers':>8}{'seconds':>10}{'jobs/s':>10}{'speedup':>10}{'efficiency':>12}  identical")
+    baseline = base_time = None
+    for n in workers:
+        start = time.perf_counter()
+        results = run_universe(universe, jobs, max_workers=n)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline, base_time = results, elapsed
+        speedup = base_time / elapsed
+        print(f"{n:>8}{elapsed:>10.2f}{len(jobs) / elapsed:>10.0f}{speedup:>9.2f}x{speedup / n:>11.0%}"
+              f"  {results.equals(baseline)}")
+
+if __name__ == "__main__":
+    main()
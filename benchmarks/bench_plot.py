@@ -0,0 +1,50 @@
+"""
+Measures `plot_interactive_results` on long histories: figure build time,
+JSON serialization time (what Streamlit sends to the browser), payload size
+and trace types, for full-resolution SVG traces versus the adaptive
+(downsampled / WebGL) modes. Browser paint time is not measurable headlessly;
+payload size is the proxy for it.
+
+    python -m benchmarks.bench_plot [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest import run_backtest
+from src.strategy import calculate_signals
+from src.utils import plot_interactive_results
+
+MODES = {
+    "full (SVG)": dict(max_points=None, webgl_threshold=float('inf')),
+    "full (WebGL)": dict(max_points=None),
+    "minmax 4000": dict(method="minmax"),
+    "lttb 4000": dict(method="lttb"),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'bars':>9}  {'mode':<14}{'build ms':>10}{'json ms':>10}{'payload MB':>12}{'markers':>9}  traces")
+    for n in args.sizes:
+        data = make_ohlcv(n, freq="min")
+        results = run_backtest(calculate_signals(data, "Bollinger Bands", {'window': 20, 'num_std': 2.0}))
+        expected_markers = int((results['Position'].abs() == 1).sum())
+        for mode, kwargs in MODES.items():
+            start = time.perf_counter()
+            fig = plot_interactive_results(results, "SYN", **kwargs)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            payload = fig.to_json()
+            serialize = time.perf_counter() - start
+
+            markers = sum(len(t.x) for t in fig.data if t.mode == 'markers')
+            assert markers == expected_markers, "buy/sell markers were dropped"
+            kinds = sorted({type(t).__name__ for t in fig.data})
+            print(f"{n:>9}  {mode:<14}{build * 1e3:>10.1f}{serialize * 1e3:>10.1f}"
+                  f"{len(payload) / 2**20:>12.2f}{markers:>9}  {','.join(kinds)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Replays synthetic 1-minute bars through the streaming signal and the trade
+simulator for every strategy, as fast as possible and (optionally) paced at
+`--speed` times real time. Reports sustained bars per second, decision
+latency percentiles and p99 lag behind the feed, and checks the fills against the batch
+`calculate_signals` Position column.
+
+    python -m benchmarks.bench_replay [--bars 100000] [--speed 6000]
+"""
+import argparse
+import logging
+
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.replay import run_replay
+from src.strategy import calculate_signals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--speed", type=float, default=None,
+                        help="also replay paced at this multiple of real time (e.g. 6000 = 100 bars/s)")
+    args = parser.parse_args()
+    logging.getLogger("src.replay").setLevel(logging.WARNING)
+    logging.getLogger("src.moomoo").setLevel(logging.WARNING)
+
+    data = make_ohlcv(args.bars, seed=0, freq="min", mu=0.05 / 390, sigma=0.2 / 390 ** 0.5)
+    speeds = [None] + ([args.speed] if args.speed else [])
+    print(f"{'strategy':<24}{'speed':>7}{'bars/s':>11}{'p50 us':>9}{'p99 us':>9}{'max us':>10}{'lag p99':>9}{'orders':>8}{'match':>7}")
+    for strategy, params in DEFAULT_PARAMS.items():
+        position = calculate_signals(data.copy(), strategy, params)['Position'].to_numpy()
+        expected = int(np.isin(position, (1, -1)).sum())
+        for speed in speeds:
+            bars = data if speed is None else data.iloc[:int(speed / 60 * 5)]  # about 5 s paced
+            report = run_replay(bars, strategy, params, speed=speed, portfolio={
+                "cash": 1e12, "positions": {}, "history": []})
+            match = speed is not None or report["orders"] == report["filled"] == expected
+            label = "max" if speed is None else f"{speed:g}x"
+            print(f"{strategy:<24}{label:>7}{report['bars_per_second']:>11,.0f}{report['p50_us']:>9.1f}"
+                  f"{report['p99_us']:>9.1f}{report['max_us']:>10.1f}{report['lag_p99_us']:>9.0f}{report['orders']:>8}{str(match):>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Exercises `OHLCVStore` offline against a synthetic provider: a cold fetch,
+leading/trailing range fills and warm repeat requests, with timings and the
+store's hit/miss/bytes counters.
+
+    python -m benchmarks.bench_store [--bars 5000] [--repeats 100]
+"""
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv
+from src.store import OHLCVStore
+
+class FakeProvider:
+    """Serves slices of one synthetic history and counts the rows it returns."""
+
+    def __init__(self, n_bars: int):
+        self.history = make_ohlcv(n_bars)
+        self.calls = []
+
+    def __call__(self, symbol, start, end, interval):
+        self.calls.append((symbol, start, end, interval))
+        idx = self.history.index
+        return self.history[(idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    provider = FakeProvider(args.bars)
+    dates = provider.history.index
+    q1, mid, q3 = dates[len(dates) // 4], dates[len(dates) // 2], dates[3 * len(dates) // 4]
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root, provider=provider)
+        steps = [
+            ("cold middle range", q1, q3),
+            ("leading fill", dates[0], mid),
+            ("trailing fill", mid, dates[-1] + pd.Timedelta(days=1)),
+        ]
+        for label, start, end in steps:
+            t0 = time.perf_counter()
+            df = store.get("SYN", start, end)
+            elapsed = time.perf_counter() - t0
+            print(f"{label:<20} rows={len(df):>7}  provider calls={len(provider.calls)}  {elapsed * 1e3:8.2f} ms")
+
+        calls_before = len(provider.calls)
+        t0 = time.perf_counter()
+        for _ in range(args.repeats):
+            df = store.get("SYN", q1, q3)
+        elapsed = (time.perf_counter() - t0) / args.repeats
+        print(f"{'warm repeat':<20} rows={len(df):>7}  provider calls={len(provider.calls) - calls_before}  "
+              f"{elapsed * 1e3:8.2f} ms/request")
+
+        full = store.get("SYN", dates[0], dates[-1] + pd.Timedelta(days=1))
+        expected = provider.history
+        assert full.index.equals(expected.index) and (full.to_numpy() == expected.to_numpy()).all()
+        print(store.stats)
+
+if __name__ == "__main__":
+    main()
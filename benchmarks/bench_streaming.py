@@ -0,0 +1,43 @@
+"""
+Checks every streaming strategy against the batch `calculate_signals` over
+full synthetic histories and measures the per-bar update cost.
+
+    python -m benchmarks.bench_streaming [--bars 20000] [--seeds 5]
+
+Exits non-zero if any streamed Signal differs from the batch result.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.streaming import create_stream, verify_stream
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=20_000)
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'strategy':<24}{'bars checked':>14}{'mismatches':>12}{'us/update':>11}")
+    for strategy, params in DEFAULT_PARAMS.items():
+        checked = mismatches = 0
+        for seed in range(args.seeds):
+            data = make_ohlcv(args.bars, seed=seed)
+            report = verify_stream(data, strategy, params)
+            checked += report["bars"]
+            mismatches += report["mismatches"]
+
+        bars = data[['Close', 'High', 'Low']].to_dict('records')
+        stream = create_stream(strategy, params)
+        start = time.perf_counter()
+        for bar in bars:
+            stream.update(bar)
+        per_bar = (time.perf_counter() - start) / len(bars) * 1e6
+        print(f"{strategy:<24}{checked:>14}{mismatches:>12}{per_bar:>11.2f}")
+        failed |= mismatches > 0
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
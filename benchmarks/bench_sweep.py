@@ -0,0 +1,63 @@
+"""
+Compares the batched parameter sweep against calling `calculate_signals`,
+`run_backtest` and `calculate_metrics` once per combination, and reports the
+largest metric difference between the two.
+
+    python -m benchmarks.bench_sweep [--bars 5000] [--loop-limit 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest import run_backtest
+from src.metrics import calculate_metrics
+from src.strategy import calculate_signals
+from src.sweep import SWEEP_PARAMS, sweep
+
+GRIDS = {
+    "SMA Crossover": {'short_window': range(10, 101, 2), 'long_window': range(50, 251, 5)},
+    "EMA Crossover": {'short_window': range(10, 101, 2), 'long_window': range(50, 251, 5)},
+    "SMA Long Only": {'window': range(10, 301)},
+    "RSI Strategy": {'period': range(5, 31), 'overbought': range(60, 91, 5), 'oversold': range(10, 41, 5)},
+    "Bollinger Bands": {'window': range(10, 101, 2), 'num_std': np.arange(1.0, 3.01, 0.25)},
+    "MACD Crossover": {'fast': range(5, 21), 'slow': range(21, 51, 2), 'signal': range(5, 21, 3)},
+    "Stochastic Oscillator": {'k_period': range(5, 31), 'd_period': [3], 'overbought': range(70, 91, 5),
+                              'oversold': range(10, 31, 5)},
+}
+
+def _reference(data, strategy, params):
+    results = run_backtest(calculate_signals(data, strategy, params))
+    calculate_metrics(results)
+    return results['Equity_Curve'].iloc[-1] / results['Equity_Curve'].iloc[0] - 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--loop-limit", type=int, default=200,
+                        help="number of combinations to time with the per-combination loop")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+    data = make_ohlcv(args.bars)
+
+    print(f"{'strategy':<24}{'combos':>8}{'sweep s':>10}{'combos/s':>11}{'loop combos/s':>15}{'speedup':>9}"
+          f"{'max |dTR|':>12}")
+    for strategy, grid in GRIDS.items():
+        start = time.perf_counter()
+        table = sweep(data, strategy, grid, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+
+        sample = table.iloc[np.linspace(0, len(table) - 1, min(args.loop_limit, len(table))).astype(int)]
+        start = time.perf_counter()
+        combos = sample[SWEEP_PARAMS[strategy]].to_dict('records')
+        expected = np.array([_reference(data, strategy, params) for params in combos])
+        loop_elapsed = time.perf_counter() - start
+
+        error = np.max(np.abs(sample["Total Return"].to_numpy() - expected))
+        rate, loop_rate = len(table) / elapsed, len(sample) / loop_elapsed
+        print(f"{strategy:<24}{len(table):>8}{elapsed:>10.3f}{rate:>11.0f}{loop_rate:>15.0f}"
+              f"{rate / loop_rate:>8.0f}x{error:>12.2e}")
+
+if __name__ == "__main__":
+    main()
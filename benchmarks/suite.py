@@ -0,0 +1,123 @@
+"""
+Times every pipeline stage on synthetic GBM data at several sizes: the seven
+`calculate_signals` strategies, `run_backtest`, `calculate_metrics` and
+`plot_interactive_results`. Wall time (best of N) and peak traced memory are
+written to a JSON file; `--compare` flags regressions against a stored
+baseline and exits non-zero if any are found.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json [--tolerance 0.25]
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.backtest import run_backtest
+from src.metrics import calculate_metrics
+from src.strategy import calculate_signals
+
+def measure(fn, repeats: int) -> dict:
+    """Best-of-`repeats` wall time plus peak traced memory of one extra run."""
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+def run_suite(sizes, repeats: int, plot: bool = True) -> dict:
+    results = {}
+    for n in sizes:
+        data = make_ohlcv(n)
+        signals = {}
+        for strategy, params in DEFAULT_PARAMS.items():
+            results[f"signals/{strategy}/{n}"] = measure(lambda: calculate_signals(data, strategy, params), repeats)
+            signals[strategy] = calculate_signals(data, strategy, params)
+
+        frame = signals["SMA Crossover"]
+        results[f"backtest/{n}"] = measure(lambda: run_backtest(frame), repeats)
+        backtest = run_backtest(frame)
+        results[f"metrics/{n}"] = measure(lambda: calculate_metrics(backtest), repeats)
+        if plot:
+            from src.utils import plot_interactive_results
+            results[f"plot/{n}"] = measure(lambda: plot_interactive_results(backtest, "SYN"), repeats)
+        print(f"  {n} bars done", file=sys.stderr)
+    return results
+
+def compare(current: dict, baseline: dict, tolerance: float, min_seconds: float) -> list:
+    """
+    Returns (benchmark, metric, baseline, current, ratio) for every result that
+    is more than `tolerance` worse than the baseline. Timings below
+    `min_seconds` in both runs are too noisy to judge and are skipped.
+    """
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if max(now["seconds"], before["seconds"]) >= min_seconds:
+            ratio = now["seconds"] / before["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append((name, "seconds", before["seconds"], now["seconds"], ratio))
+        if before["peak_bytes"]:
+            ratio = now["peak_bytes"] / before["peak_bytes"]
+            if ratio > 1 + tolerance:
+                regressions.append((name, "peak_bytes", before["peak_bytes"], now["peak_bytes"], ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown/growth, e.g. 0.25 = 25%%")
+    parser.add_argument("--min-seconds", type=float, default=0.02,
+                        help="ignore timings shorter than this in both runs (too noisy)")
+    parser.add_argument("--no-plot", action="store_true", help="skip plot_interactive_results")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.repeats, plot=not args.no_plot)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<40}{'ms':>12}{'peak MB':>10}")
+    for name, r in results.items():
+        print(f"{name:<40}{r['seconds'] * 1e3:>12.2f}{r['peak_bytes'] / 2**20:>10.2f}")
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        for name, metric, before, now, ratio in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.4g} -> {now:.4g} ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+if __name__ == "__main__":
+    main()
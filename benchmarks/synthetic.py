@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+# The app's default slider values for each strategy
+DEFAULT_PARAMS = {
+    "SMA Crossover": {'short_window': 50, 'long_window': 200},
+    "EMA Crossover": {'short_window': 50, 'long_window': 200},
+    "SMA Long Only": {'window': 200},
+    "RSI Strategy": {'period': 14, 'overbought': 70, 'oversold': 30},
+    "Bollinger Bands": {'window': 20, 'num_std': 2.0},
+    "MACD Crossover": {'fast': 12, 'slow': 26, 'signal': 9},
+    "Stochastic Oscillator": {'k_period': 14, 'd_period': 3, 'overbought': 80, 'oversold': 20},
+}
+
+def make_ohlcv(n_bars: int, seed: int = 0, start: str = "2000-01-03", freq: str = "B",
+               s0: float = 100.0, mu: float = 0.05, sigma: float = 0.2) -> pd.DataFrame:
+    """
+    Generates a synthetic OHLCV frame from geometric Brownian motion.
+    """
+    rng = np.random.default_rng(seed)
+    dt = 1 / 252
+    shocks = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n_bars)
+    close = s0 * np.exp(np.cumsum(shocks))
+    open_ = np.empty_like(close)
+    open_[0] = s0
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.standard_normal(n_bars)) * sigma * np.sqrt(dt) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(100_000, 5_000_000, n_bars).astype(float)
+    if freq == "B":
+        # pandas steps business days one at a time; calendar days minus weekends give the same index
+        days = pd.date_range(start=start, periods=n_bars * 7 // 5 + 7, freq="D")
+        index = days[days.dayofweek < 5][:n_bars].rename("Date")
+        index.freq = "B"
+    else:
+        index = pd.date_range(start=start, periods=n_bars, freq=freq, name="Date")
+    return pd.DataFrame({"Close": close, "High": high, "Low": low, "Open": open_, "Volume": volume},
+                        index=index)
@@ -1,40 +1,80 @@
+import argparse
+import os
 import yaml
 import logging
-from src.data import fetch_data
+from src.data import fetch_data, download_yfinance
+from src.store import OHLCVStore
 from src.strategy import calculate_signals
 from src.backtest import run_backtest
 from src.metrics import calculate_metrics
-from src.utils import plot_results
+from src import instrument
 
-def main():
-    # Load config
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
+def run_single(config, store, plot=True):
     symbol = config['symbol']
     start_date = config['start_date']
     end_date = config['end_date']
-    short_window = config['strategy']['short_window']
-    long_window = config['strategy']['long_window']
+    strategy_type = config['strategy'].get('type', "SMA Crossover")
+    params = {k: v for k, v in config['strategy'].items() if k not in ('type', 'initial_capital')}
     initial_capital = config['strategy']['initial_capital']
+    costs = {k: v for k, v in (config.get('costs') or {}).items() if v}
     
     # 1. Fetch Data
-    data = fetch_data(symbol, start_date, end_date)
+    with instrument.span("fetch_data", symbol=symbol) as s:
+        data = fetch_data(symbol, start_date, end_date, store=store)
+        s['rows'] = len(data)
     
     # 2. Calculate Signals
-    data_with_signals = calculate_signals(data, short_window, long_window)
+    with instrument.span("calculate_signals", rows=len(data)):
+        data_with_signals = calculate_signals(data, strategy_type, params)
     
     # 3. Run Backtest
-    results = run_backtest(data_with_signals, initial_capital)
+    with instrument.span("run_backtest", rows=len(data)):
+        results = run_backtest(data_with_signals, initial_capital, costs=costs or None)
     
     # 4. Calculate Metrics
-    metrics = calculate_metrics(results)
+    with instrument.span("calculate_metrics", rows=len(data)):
+        metrics = calculate_metrics(results)
     print("\n--- Performance Metrics ---")
     for k, v in metrics.items():
         print(f"{k}: {v}")
     
-    # 5. Plot Results
-    plot_results(results, symbol)
+    # 5. Plot Results (matplotlib is only imported when a chart is wanted)
+    if plot:
+        from src.utils import plot_results
+        with instrument.span("plot_results", rows=len(data)):
+            plot_results(results, symbol)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the strategy in config.yaml, or its batch section.")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--no-plot", action="store_true", help="skip the chart (no plotting libraries imported)")
+    parser.add_argument("--batch", action="store_true", help="run every job in the config's batch section")
+    parser.add_argument("--db", default=os.getenv("BATCH_RESULTS_DB", "results/runs.sqlite"),
+                        help="results store for --batch / --top (finished jobs are skipped on rerun)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=0, help="print the N best stored runs and exit")
+    parser.add_argument("--metric", default="Sharpe Ratio")
+    parser.add_argument("--symbol", default=None)
+    parser.add_argument("--strategy", default=None)
+    args = parser.parse_args()
+
+    # Load config
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+    store = OHLCVStore(os.getenv("OHLCV_CACHE_DIR", ".cache/ohlcv"), provider=download_yfinance)
+
+    if args.top:
+        from src.batch import ResultsStore
+        with ResultsStore(args.db) as results:
+            print(results.top(args.metric, args.top, symbol=args.symbol, strategy=args.strategy).to_string())
+    elif args.batch:
+        from src.batch import run_batch
+        report = run_batch(config, args.db, lambda symbol, start, end: fetch_data(symbol, start, end, store=store),
+                           max_workers=args.workers)
+        print(f"{report['completed']} runs stored, {report['skipped']} already done, "
+              f"{len(report['failed'])} symbols failed ({report['seconds']:.1f} s)")
+    else:
+        run_single(config, store, plot=not args.no_plot)
 
 if __name__ == "__main__":
     main()
@@ -1,17 +1,114 @@
 import pandas as pd
 import numpy as np
 
-def run_backtest(data: pd.DataFrame, initial_capital: float = 100000.0) -> pd.DataFrame:
+from src.bars import periods_per_year
+from src.strategy import COMPACT_DTYPE
+
+# Trading costs. A Position change trades |change| of equity at the bar's
+# Close (a full entry or exit trades the whole book once) and pays, per unit
+# traded, `commission_bps` plus half of `spread_bps`, plus square-root market
+# impact: `impact_bps` x sqrt(participation), where participation is the
+# traded notional over the bar's dollar volume (Close x Volume), capped at 1.
+# The notional is taken from the cost-free equity, which is never below the
+# equity actually held, so impact is if anything overstated. Costs come off
+# the strategy return of the bar the trade is made on. Trades are sparse, so
+# only their bars are gathered (one index array over all bars and columns)
+# and adjusted; nothing loops over trades. Finding them takes one full-size
+# bool mask; impact also needs the cost-free equity, which is built in blocks
+# of IMPACT_BLOCK columns, each only up to its last trade bar. The first bar
+# has no Position, so a position held from the first bar is entered at no cost.
+COST_KEYS = ("commission_bps", "spread_bps", "impact_bps")
+IMPACT_BLOCK = 64
+
+def _apply_costs(returns: np.ndarray, before: np.ndarray, after: np.ndarray, costs: dict, close: np.ndarray,
+                 volume: np.ndarray, initial_capital: float) -> tuple:
+    """
+    Takes trading costs off `returns` in place, where returns[i] is the
+    return of a bar on which the Signal goes from before[i] to after[i]
+    (`close` and `volume` are that bar's). Returns the trades' index (as
+    from `np.nonzero`) and the fraction of equity paid at each.
+    """
+    unknown = set(costs) - set(COST_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown cost settings: {', '.join(sorted(unknown))}")
+    changed = np.not_equal(after, before, order='F')
+    trades = np.unravel_index(np.flatnonzero(changed.ravel(order='F')), changed.shape, order='F')
+    turnover = np.abs(np.nan_to_num(after[trades] - before[trades]))
+    cost = turnover * ((costs.get('commission_bps', 0.0) + costs.get('spread_bps', 0.0) / 2) / 1e4)
+    if costs.get('impact_bps'):
+        if volume is None:
+            raise ValueError("Volume-based slippage needs a Volume column")
+        notional = _trade_equity(returns, trades) * initial_capital * turnover
+        bar = trades[0]
+        dollar_volume = np.asarray(close, dtype=np.float64)[bar] * np.asarray(volume, dtype=np.float64)[bar]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            participation = notional / dollar_volume
+        # fmin also counts a bar without volume (NaN or infinite participation) as fully taken
+        cost += turnover * np.sqrt(np.fmin(participation, 1.0)) * (costs['impact_bps'] / 1e4)
+    r = returns[trades]
+    returns[trades] = r - cost * (1.0 + r)
+    return trades, cost
+
+def _trade_equity(returns: np.ndarray, trades: tuple) -> np.ndarray:
+    """
+    Cost-free equity (growth of 1) at the close of each trade bar, held flat
+    over a missing return as in run_backtest. `trades` is in column-major
+    order, so each block of columns owns a contiguous run of it.
+    """
+    rows = trades[0]
+    cols = trades[1] if len(trades) > 1 else np.zeros_like(rows)
+    block = returns.reshape(len(returns), -1)
+    out = np.empty(len(rows))
+    for start in range(0, block.shape[1], IMPACT_BLOCK):
+        lo, hi = np.searchsorted(cols, (start, start + IMPACT_BLOCK))
+        if lo == hi:
+            continue
+        # One NaN-safe cumulative pass, down to the block's last trade bar only
+        equity = block[:rows[lo:hi].max() + 1, start:start + IMPACT_BLOCK] + 1.0
+        np.copyto(equity, 1.0, where=np.isnan(equity))
+        np.cumprod(equity, axis=0, out=equity)
+        out[lo:hi] = equity[rows[lo:hi], cols[lo:hi] - start]
+    return out
+
+def run_backtest(data: pd.DataFrame, initial_capital: float = 100000.0, metrics_only: bool = False,
+                 risk_free_rate: float = 0.0, compact: bool = False, costs: dict = None):
     """
     Runs a vectorized backtest based on signals and positions.
+
+    With `costs` (e.g. {"commission_bps": 1, "spread_bps": 2, "impact_bps":
+    10}, see COST_KEYS) every Position change pays commission, half the
+    spread and volume-based slippage (impact needs a Volume column); the
+    result gets a Cost column, the fraction of equity paid on each bar.
+
+    With `metrics_only=True` no result frame is built: the Close and Signal
+    arrays go straight through `backtest_columns` and the numeric metrics dict
+    (as from `compute_metrics`) is returned instead, annualized for the bar
+    spacing of the index.
+
+    With `compact=True` the input is not copied: the result holds the input's
+    columns plus Strategy_Returns, Equity_Curve and Drawdown, computed in
+    float64 and stored as float32. Market_Returns and Peak, which only the
+    charts use, are left out (see `src.compact.with_plot_columns`).
     """
+    volume = data['Volume'].to_numpy() if costs and 'Volume' in data else None
+    if metrics_only:
+        return backtest_columns(data['Close'].to_numpy(), data['Signal'].to_numpy(), initial_capital, risk_free_rate,
+                                periods_per_year(data.index), costs, volume)
+    if compact:
+        return _compact_backtest(data, initial_capital, costs, volume)
+
     df = data.copy()
     
-    # Buy and hold returns
-    df['Market_Returns'] = df['Close'].pct_change()
+    # Buy and hold returns; a missing Close is a gap, not carried forward (pandas 2 pads by default)
+    df['Market_Returns'] = df['Close'].pct_change(fill_method=None)
     
     # Strategy returns (Shift Signal by 1 to avoid lookahead bias)
     df['Strategy_Returns'] = df['Market_Returns'] * df['Signal'].shift(1)
+    if costs:
+        returns = df['Strategy_Returns'].to_numpy(dtype=np.float64, copy=True)
+        df['Cost'] = _cost_column(returns, df['Signal'].to_numpy(dtype=np.float64), costs,
+                                  df['Close'].to_numpy(), volume, initial_capital)
+        df['Strategy_Returns'] = returns
     
     # Cumulative returns
     df['Equity_Curve'] = (1.0 + df['Strategy_Returns'].fillna(0)).cumprod() * initial_capital
@@ -21,3 +118,109 @@ def run_backtest(data: pd.DataFrame, initial_capital: float = 100000.0) -> pd.Da
     df['Drawdown'] = (df['Equity_Curve'] - df['Peak']) / df['Peak']
     
     return df
+
+def _compact_backtest(data: pd.DataFrame, initial_capital: float, costs: dict = None,
+                      volume: np.ndarray = None) -> pd.DataFrame:
+    close = data['Close'].to_numpy(dtype=np.float64)
+    signal = data['Signal'].to_numpy(dtype=np.float64)
+    returns = np.full(len(close), np.nan)
+    if len(close) > 1:
+        # Same operations as the full path: pct_change (gaps not filled), then times the previous Signal
+        returns[1:] = (close[1:] / close[:-1] - 1.0) * signal[:-1]
+    extra = {}
+    if costs:
+        extra['Cost'] = _cost_column(returns, signal, costs, close, volume, initial_capital).astype(COMPACT_DTYPE)
+    equity = np.cumprod(1.0 + np.nan_to_num(returns)) * initial_capital
+    peak = np.maximum.accumulate(equity)
+    # Built over the input's column arrays: `assign` would deep-copy them on pandas 2
+    df = pd.DataFrame({**{c: data[c] for c in data}, 'Strategy_Returns': returns.astype(COMPACT_DTYPE),
+                       'Equity_Curve': equity.astype(COMPACT_DTYPE),
+                       'Drawdown': ((equity - peak) / peak).astype(COMPACT_DTYPE), **extra},
+                      index=data.index, copy=False)
+    df.attrs.update(data.attrs)
+    return df
+
+def _cost_column(returns: np.ndarray, signal: np.ndarray, costs: dict, close: np.ndarray, volume: np.ndarray,
+                 initial_capital: float) -> np.ndarray:
+    """Applies costs to a single backtest's per-bar `returns` in place; returns the per-bar Cost column."""
+    column = np.zeros(len(returns))
+    if len(returns) > 1:
+        trades, cost = _apply_costs(returns[1:], signal[:-1], signal[1:], costs, close[1:],
+                                    None if volume is None else volume[1:], initial_capital)
+        column[1:][trades] = cost
+    return column
+
+def backtest_columns(close: np.ndarray, signals: np.ndarray, initial_capital: float = 100000.0,
+                     risk_free_rate: float = 0.0, periods_per_year: float = 252, costs: dict = None,
+                     volume: np.ndarray = None) -> dict:
+    """
+    Runs the `run_backtest` equity/drawdown math and the `calculate_metrics`
+    statistics column-wise on NumPy arrays: `close` is (bars,), `signals` is
+    (bars,) or (bars x strategies). Returns numeric metrics, one value per column.
+    `costs` and `volume` (bars,) are as for `run_backtest`.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signals = np.asarray(signals, dtype=np.float64)
+    squeeze = signals.ndim == 1
+    if squeeze:
+        signals = signals[:, None]
+    n = len(close)
+
+    # One scratch buffer is reused for returns, equity and drawdown
+    returns = np.divide(close[1:], close[:-1])
+    returns -= 1.0
+    # Position on bar i is the signal from bar i-1 (no lookahead)
+    if signals.shape[1] == 1:
+        returns *= signals[:-1, 0]
+        growth = returns[:, None]
+    else:
+        # Column-major layout keeps each column contiguous for the cumulative passes
+        growth = np.multiply(signals[:-1], returns[:, None], order='F')
+    if costs and n > 1:
+        # The trade made on bar i (its Signal change) pays on bar i's return
+        _apply_costs(growth, signals[:-1], signals[1:], costs, close[1:], None if volume is None else volume[1:],
+                     initial_capital)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volatility = growth.std(axis=0, ddof=1) * np.sqrt(periods_per_year)
+    gaps = np.isnan(volatility)
+    if gaps.any():
+        # A missing Close or Signal leaves NaN returns: as in run_backtest and
+        # compute_metrics they are left out of the volatility and the equity
+        # is held flat over them. They are zeroed in place and the variance
+        # taken from the sums over the remaining count (no scratch block).
+        missing = np.isnan(growth)
+        count = n - 1 - missing.sum(axis=0)
+        np.copyto(growth, 0.0, where=missing)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = growth.sum(axis=0) / count
+            var = (np.einsum('ij,ij->j', growth, growth) - count * mean * mean) / (count - 1)
+        var[count < 2] = np.nan
+        volatility[gaps] = np.sqrt(np.maximum(var[gaps], 0.0)) * np.sqrt(periods_per_year)
+    growth += 1.0
+    np.cumprod(growth, axis=0, out=growth)
+    total_return = (growth[-1] if n > 1 else np.ones(signals.shape[1])) - 1.0
+
+    market_return = close[-1] / close[0] - 1
+
+    # Equity starts at 1.0 (times capital), so the running peak never drops below it
+    peak = np.maximum.accumulate(growth, axis=0)
+    np.maximum(peak, 1.0, out=peak)
+    np.divide(growth, peak, out=growth)
+    max_drawdown = growth.min(axis=0, initial=1.0) - 1.0
+
+    annual_return = (1 + total_return) ** (periods_per_year / n) - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe_ratio = np.where(volatility != 0, (annual_return - risk_free_rate) / volatility, 0.0)
+
+    metrics = {
+        "Total Return": total_return,
+        "Market Return": np.full(signals.shape[1], market_return),
+        "Annualized Return": annual_return,
+        "Annualized Volatility": volatility,
+        "Sharpe Ratio": sharpe_ratio,
+        "Max Drawdown": max_drawdown,
+        "Final Equity": (total_return + 1.0) * initial_capital,
+    }
+    if squeeze:
+        metrics = {k: float(v[0]) for k, v in metrics.items()}
+    return metrics
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+# Bar-size helpers: how many bars make a year (for annualizing metrics) and
+# OHLCV resampling to coarser bars, either in memory or chunk by chunk over
+# the memory-mapped columns of an `OHLCVStore`.
+
+TRADING_DAYS = 252
+
+# Aggregation of each OHLCV column when bars are merged
+OHLCV_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Adj Close": "last", "Volume": "sum"}
+
+def periods_per_year(index, trading_days: int = TRADING_DAYS) -> float:
+    """
+    Number of bars in a year for a timestamp index: 252 for daily bars, 52
+    weekly, 12 monthly, and bars-per-session x sessions-per-year intraday.
+    Markets that also trade at weekends (e.g. crypto) count 365 sessions.
+    Falls back to `trading_days` when the index is not datetime-like or too short.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return float(trading_days)
+    # A few thousand bars are plenty to read the spacing off, even for minute data
+    index = index[:20_000]
+    step = np.median(np.diff(index.as_unit('ns').asi8)) / 1e9 / 86400
+    if step >= 25:
+        return 12.0
+    if step >= 5:
+        return 52.0
+
+    days = index.normalize()
+    weekend = (days.unique().dayofweek >= 5).mean() > 0.1
+    sessions = 365 if weekend else trading_days
+    if step >= 0.9:
+        return float(sessions)
+    bars_per_day = np.median(pd.Series(1, index=days).groupby(level=0).size())
+    return float(bars_per_day * sessions)
+
+def resample_ohlcv(df: pd.DataFrame, rule: str, origin=None) -> pd.DataFrame:
+    """
+    Aggregates OHLCV bars to the coarser bar size `rule` (a pandas offset such
+    as "5min", "1h", "1D", "W-FRI"), dropping bins with no bars.
+    """
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in df}
+    kwargs = {} if origin is None else {"origin": origin}
+    out = df.resample(rule, **kwargs).agg(agg)
+    count = df['Close'].resample(rule, **kwargs).count()
+    return out[count > 0]
+
+def resample_store(store, symbol: str, rule: str, interval: str = "1m", chunk_rows: int = 1_000_000) -> pd.DataFrame:
+    """
+    Resamples everything stored for `symbol` at `interval` to `rule`, reading
+    the memory-mapped columns `chunk_rows` bars at a time. Bars of a bin that
+    straddles a chunk boundary are carried into the next chunk, so the result
+    equals `resample_ohlcv` on the full history.
+    """
+    loaded = store.load(symbol, interval)
+    if loaded is None:
+        raise ValueError(f"No {interval} bars stored for {symbol}")
+    index, columns = loaded
+    meta = store.meta(symbol, interval)
+    if len(index) == 0:
+        return pd.DataFrame(columns=list(columns))
+
+    # Every chunk bins relative to the same origin, so bin edges line up
+    # (calendar rules such as "1D" or "W-FRI" are anchored already)
+    origin = _timestamps(index[:1], meta)[0].floor('D') if isinstance(to_offset(rule), Tick) else None
+    kwargs = {} if origin is None else {"origin": origin}
+    out, carry = [], None
+    for lo in range(0, len(index), chunk_rows):
+        hi = min(lo + chunk_rows, len(index))
+        chunk = pd.DataFrame({col: np.asarray(values[lo:hi]) for col, values in columns.items()},
+                             index=_timestamps(index[lo:hi], meta))
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+        if hi < len(index):
+            # The last bin may continue in the next chunk: hold its bars back
+            first_rows = pd.Series(np.arange(len(chunk)), index=chunk.index).resample(rule, **kwargs).min()
+            split = int(first_rows.dropna().iloc[-1])
+            chunk, carry = chunk.iloc[:split], chunk.iloc[split:]
+        out.append(resample_ohlcv(chunk, rule, origin))
+    return pd.concat(out)
+
+def _timestamps(values, meta) -> pd.DatetimeIndex:
+    """Int64 UTC nanoseconds from the store as a DatetimeIndex in the stored timezone."""
+    index = pd.DatetimeIndex(np.asarray(values).astype('datetime64[ns]'), name=(meta or {}).get('index_name') or 'Date')
+    tz = (meta or {}).get('tz')
+    return index.tz_localize('UTC').tz_convert(tz) if tz else index
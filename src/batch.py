@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import backtest_columns
+from src.bars import periods_per_year
+from src.sweep import param_grid, signal_block
+
+logger = logging.getLogger(__name__)
+
+# Config-driven batch backtests. The `batch` section of config.yaml lists
+# symbols and, per strategy, a grid of parameter values; every (symbol,
+# strategy, params) combination is one job with a stable id. Jobs for the same
+# symbol and strategy run together as one vectorized sweep chunk in a worker
+# process, and each finished chunk is committed to a SQLite results table in
+# one transaction. The table doubles as the checkpoint: a restarted run skips
+# every job id already stored with a result.
+
+# Numeric metrics stored per run, as `backtest_columns` names them, and their column names
+METRIC_COLUMNS = {
+    "Total Return": "total_return",
+    "Market Return": "market_return",
+    "Annualized Return": "annualized_return",
+    "Annualized Volatility": "annualized_volatility",
+    "Sharpe Ratio": "sharpe_ratio",
+    "Max Drawdown": "max_drawdown",
+    "Final Equity": "final_equity",
+}
+
+def job_id(symbol: str, strategy_type: str, params: dict, start, end, initial_capital: float,
+           risk_free_rate: float, costs: dict = None) -> str:
+    """Stable id for one run: the same inputs always hash to the same id."""
+    parts = [symbol, strategy_type, sorted(params.items()), str(start), str(end), float(initial_capital),
+             float(risk_free_rate)]
+    if costs:
+        # Only runs with costs hash them, so frictionless ids stay as they were
+        parts.append(sorted(costs.items()))
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()[:20]
+
+def expand_jobs(config: dict) -> pd.DataFrame:
+    """
+    Every job in the config's `batch` section, one row each: job_id, symbol,
+    strategy, params (a dict), start, end. Dates, capital and trading costs
+    default to the top-level config values; a scalar parameter value counts
+    as a one-element list.
+    """
+    batch = config['batch']
+    start = batch.get('start_date', config.get('start_date'))
+    end = batch.get('end_date', config.get('end_date'))
+    capital = batch.get('initial_capital', config.get('strategy', {}).get('initial_capital', 100000.0))
+    rf = batch.get('risk_free_rate', 0.0)
+    costs = _batch_costs(config)
+    rows = []
+    for strategy_type, grid in batch['strategies'].items():
+        grid = {name: values if isinstance(values, list) else [values] for name, values in grid.items()}
+        combos = param_grid(strategy_type, grid).to_dict('records')
+        for symbol in batch['symbols']:
+            for params in combos:
+                rows.append((job_id(symbol, strategy_type, params, start, end, capital, rf, costs),
+                             symbol, strategy_type, params, start, end))
+    jobs = pd.DataFrame(rows, columns=["job_id", "symbol", "strategy", "params", "start", "end"])
+    return jobs.drop_duplicates("job_id", ignore_index=True)
+
+def _batch_costs(config: dict) -> dict:
+    """Trading costs for batch jobs: the batch section's, else the top-level `costs`."""
+    costs = config['batch'].get('costs', config.get('costs')) or {}
+    return {k: v for k, v in costs.items() if v}
+
+class ResultsStore:
+    """
+    SQLite table of finished runs: one row per job with its symbol,
+    strategy, params (JSON) and date range, plus one indexed REAL column per
+    metric so ranking queries (`top`) read only the leading index entries.
+    """
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        metrics = ", ".join(f"{col} REAL" for col in METRIC_COLUMNS.values())
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs (job_id TEXT PRIMARY KEY, symbol TEXT NOT NULL, "
+                f"strategy TEXT NOT NULL, params TEXT NOT NULL, start TEXT, end TEXT, {metrics}, finished_at REAL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS runs_symbol_strategy ON runs (symbol, strategy)")
+            for col in METRIC_COLUMNS.values():
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS runs_{col} ON runs ({col})")
+
+    def completed(self) -> set:
+        """
+        Job ids already stored with results. A run stored without a Total
+        Return (its equity came out NaN) does not count, so a rerun computes
+        it again and replaces the row.
+        """
+        return {row[0] for row in self.conn.execute("SELECT job_id FROM runs WHERE total_return IS NOT NULL")}
+
+    def append(self, jobs: pd.DataFrame, metrics: dict):
+        """Stores the metrics (name -> array, one value per job row) for `jobs` in one transaction."""
+        finished = time.time()
+        columns = [np.asarray(metrics[name], dtype=np.float64) for name in METRIC_COLUMNS]
+        rows = [
+            (job.job_id, job.symbol, job.strategy, json.dumps(job.params), str(job.start), str(job.end),
+             *(None if np.isnan(col[i]) else float(col[i]) for col in columns), finished)
+            for i, job in enumerate(jobs.itertuples(index=False))
+        ]
+        placeholders = ", ".join("?" * (7 + len(METRIC_COLUMNS)))
+        with self.conn:
+            self.conn.executemany(f"INSERT OR REPLACE INTO runs VALUES ({placeholders})", rows)
+
+    def top(self, metric: str = "Sharpe Ratio", n: int = 20, ascending: bool = False, symbol: str = None,
+            strategy: str = None) -> pd.DataFrame:
+        """The `n` best runs by `metric`, optionally for one symbol and/or strategy."""
+        col = METRIC_COLUMNS[metric]
+        where, args = [f"{col} IS NOT NULL"], []
+        if symbol is not None:
+            where.append("symbol = ?")
+            args.append(symbol)
+        if strategy is not None:
+            where.append("strategy = ?")
+            args.append(strategy)
+        query = (f"SELECT * FROM runs WHERE {' AND '.join(where)} "
+                 f"ORDER BY {col} {'ASC' if ascending else 'DESC'} LIMIT ?")
+        df = pd.read_sql_query(query, self.conn, params=[*args, n])
+        return df.rename(columns={v: k for k, v in METRIC_COLUMNS.items()})
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _run_chunk(data: pd.DataFrame, strategy_type: str, params: list, initial_capital: float,
+               risk_free_rate: float, costs: dict = None) -> dict:
+    """Metrics for one strategy over a list of param dicts on one symbol's bars."""
+    prices = {col: data[col].to_numpy(dtype=np.float64) for col in ("Close", "High", "Low") if col in data}
+    columns = {name: [p[name] for p in params] for name in params[0]}
+    signals = signal_block(prices, strategy_type, columns)
+    volume = data['Volume'].to_numpy() if costs and 'Volume' in data else None
+    return backtest_columns(prices['Close'], signals, initial_capital, risk_free_rate, periods_per_year(data.index),
+                            costs, volume)
+
+def run_batch(config: dict, db_path: str, fetch, max_workers: int = None, chunk_size: int = 256) -> dict:
+    """
+    Runs every job of `config` (see `expand_jobs`) not already in the
+    results store at `db_path`. `fetch(symbol, start, end)` returns a
+    symbol's OHLCV frame; symbols are fetched one at a time in this process
+    while earlier ones are being backtested in `max_workers` processes.
+
+    Returns a dict with the number of "jobs", "skipped" (already stored)
+    and "completed", the "failed" symbols, and "seconds".
+    """
+    wall_start = time.perf_counter()
+    batch = config['batch']
+    capital = batch.get('initial_capital', config.get('strategy', {}).get('initial_capital', 100000.0))
+    rf = batch.get('risk_free_rate', 0.0)
+    costs = _batch_costs(config)
+    jobs = expand_jobs(config)
+
+    with ResultsStore(db_path) as store:
+        done = store.completed()
+        pending = jobs[~jobs['job_id'].isin(done)]
+        logger.info(f"{len(jobs)} jobs, {len(jobs) - len(pending)} already stored, {len(pending)} to run")
+        completed, failed = 0, []
+        max_workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            running = {}
+
+            def collect(block: bool):
+                nonlocal completed
+                if not running:
+                    return
+                finished, _ = wait(running, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk = running.pop(future)
+                    try:
+                        store.append(chunk, future.result())
+                        completed += len(chunk)
+                    except Exception as e:
+                        logger.error(f"Batch chunk for {chunk['symbol'].iloc[0]} failed: {e}")
+                        failed.append(chunk['symbol'].iloc[0])
+
+            for (symbol, start, end), group in pending.groupby(["symbol", "start", "end"], sort=False):
+                try:
+                    data = fetch(symbol, start, end)
+                except Exception as e:
+                    logger.error(f"Skipping {symbol}: {e}")
+                    failed.append(symbol)
+                    continue
+                for strategy_type, jobs_for in group.groupby("strategy", sort=False):
+                    for i in range(0, len(jobs_for), chunk_size):
+                        chunk = jobs_for.iloc[i:i + chunk_size]
+                        future = pool.submit(_run_chunk, data, strategy_type, list(chunk['params']), capital, rf,
+                                             costs)
+                        running[future] = chunk
+                # Bound the queue so a long job list does not hold every symbol's data at once
+                while len(running) > 4 * max_workers:
+                    collect(block=True)
+                collect(block=False)
+            while running:
+                collect(block=True)
+
+    seconds = time.perf_counter() - wall_start
+    logger.info(f"Batch finished: {completed} runs stored in {seconds:.1f} s")
+    return {"jobs": len(jobs), "skipped": len(jobs) - len(pending), "completed": completed,
+            "failed": sorted(set(failed)), "seconds": seconds}
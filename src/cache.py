@@ -0,0 +1,120 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+def _nbytes(value) -> int:
+    """Approximate in-memory size of a cached value."""
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        usage = value.memory_usage(index=False, deep=False)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return 64
+
+class CacheStats:
+    """Hit/miss/eviction counters for an `LRUCache`."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {**vars(self), "hit_rate": self.hit_rate}
+
+    def __repr__(self):
+        return (f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions}, "
+                f"hit_rate={self.hit_rate:.1%})")
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by the total size of its values in bytes.
+    Values larger than the whole budget are returned but never stored.
+    """
+
+    def __init__(self, max_bytes: int, sizeof=_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()  # key -> (value, nbytes)
+        self.current_bytes = 0
+        self.stats = CacheStats()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size: int = None):
+        """Stores `value`; `size` overrides the estimated size in bytes."""
+        size = self.sizeof(value) if size is None else size
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (value, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted
+            self.stats.evictions += 1
+
+    def get_or_compute(self, key, compute, size: int = None):
+        """Returns the cached value for `key`, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value, size)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+_MISSING = object()
+
+def freeze(value):
+    """Turns dicts/lists (e.g. strategy params) into hashable, order-independent cache key parts."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+class IndicatorCache(LRUCache):
+    """
+    Memoizes indicator primitives computed on one dataset, keyed by
+    (indicator, column, parameters...), so several strategies or parameter
+    sets evaluated on the same data share the work. Pass it as
+    `calculate_signals(data, strategy_type, params, cache=cache)`.
+    """
+
+    def __init__(self, data: pd.DataFrame, max_bytes: int = 256 * 2**20):
+        super().__init__(max_bytes)
+        self.data = data
+
+    def matches(self, data: pd.DataFrame) -> bool:
+        """True if `data` is the dataset this cache was built for."""
+        if data is self.data:
+            return True
+        return (len(data) == len(self.data) and data.index.equals(self.data.index)
+                and np.array_equal(data['Close'].to_numpy(), self.data['Close'].to_numpy(), equal_nan=True))
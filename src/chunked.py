@@ -0,0 +1,199 @@
+import numpy as np
+
+from src.bars import _timestamps, periods_per_year, resample_store
+from src.indicators import ewm_mean, rolling_max, rolling_mean, rolling_min, rolling_std
+from src.strategy import latch_signal
+
+# Out-of-core backtests for histories too long to hold as one DataFrame (years
+# of minute bars). Prices are fed through in chunks; each chunk is computed
+# with the same NumPy kernels as the batched paths, prefixed with just enough
+# history for the rolling windows. EMA values and latched signals are carried
+# from one chunk to the next, so the result does not depend on the chunk size.
+
+def lookback(strategy_type: str, params: dict) -> int:
+    """Bars of history a chunk needs in front of it to reproduce the rolling windows."""
+    if strategy_type == "SMA Crossover":
+        return max(params['short_window'], params['long_window']) - 1
+    elif strategy_type == "SMA Long Only":
+        return params['window'] - 1
+    elif strategy_type == "RSI Strategy":
+        return params['period']
+    elif strategy_type == "Bollinger Bands":
+        return params['window'] - 1
+    elif strategy_type == "Stochastic Oscillator":
+        return params['k_period'] - 1
+    elif strategy_type in ("EMA Crossover", "MACD Crossover"):
+        return 0
+    raise ValueError(f"Unknown strategy: {strategy_type}")
+
+class ChunkedSignals:
+    """
+    Produces the `calculate_signals` Signal column one chunk of bars at a
+    time: `update(prices)` takes a dict of 'Close' (and 'High'/'Low' where
+    needed) arrays for the next bars and returns their signals.
+    """
+
+    def __init__(self, strategy_type: str, params: dict):
+        self.strategy_type = strategy_type
+        self.params = params
+        self.lookback = lookback(strategy_type, params)
+        self.tail = None   # last `lookback` bars of each price column
+        self.ema = {}      # last value of each EMA
+        self.state = None  # last latched signal
+
+    def update(self, prices: dict) -> np.ndarray:
+        prices = {col: np.asarray(values, dtype=np.float64) for col, values in prices.items()}
+        if self.tail is not None:
+            prices = {col: np.concatenate((self.tail[col], values)) for col, values in prices.items()}
+        skip = 0 if self.tail is None else len(self.tail['Close'])
+        signals = self._signals(prices, skip)
+        keep = min(self.lookback, len(prices['Close']))
+        self.tail = {col: values[len(values) - keep:].copy() for col, values in prices.items()}
+        return signals
+
+    def _ema(self, name, x, span):
+        seed = self.ema.get(name)
+        if seed is None:
+            out = ewm_mean(x, span)
+        else:
+            # With adjust=False the previous EMA value acts as the first observation
+            out = ewm_mean(np.concatenate(([seed], x)), span)[1:]
+        if len(out):
+            self.ema[name] = out[-1]
+        return out
+
+    def _latch(self, enter, exit_):
+        out = latch_signal(enter, exit_, self.state)
+        if len(out):
+            self.state = out[-1]
+        return out
+
+    def _signals(self, prices, skip):
+        p = self.params
+        close = prices['Close']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.strategy_type == "SMA Crossover":
+                short_ma = rolling_mean(close, p['short_window'], min_periods=1)[skip:]
+                long_ma = rolling_mean(close, p['long_window'], min_periods=1)[skip:]
+                return (short_ma > long_ma).astype(np.float64)
+            elif self.strategy_type == "EMA Crossover":
+                return (self._ema('short', close, p['short_window'])
+                        > self._ema('long', close, p['long_window'])).astype(np.float64)
+            elif self.strategy_type == "SMA Long Only":
+                ma = rolling_mean(close, p['window'], min_periods=1)[skip:]
+                return (close[skip:] > ma).astype(np.float64)
+            elif self.strategy_type == "RSI Strategy":
+                delta = np.diff(close, prepend=np.nan)
+                gain = rolling_mean(np.where(delta > 0, delta, 0.0), p['period'])[skip:]
+                loss = rolling_mean(np.where(delta < 0, -delta, 0.0), p['period'])[skip:]
+                rsi = 100 - (100 / (1 + gain / loss))
+                return self._latch(rsi < p['oversold'], rsi > p['overbought'])
+            elif self.strategy_type == "Bollinger Bands":
+                ma = rolling_mean(close, p['window'])[skip:]
+                std = rolling_std(close, p['window'])[skip:]
+                close = close[skip:]
+                return self._latch(close < ma - p['num_std'] * std, close > ma + p['num_std'] * std)
+            elif self.strategy_type == "MACD Crossover":
+                macd = self._ema('fast', close, p['fast']) - self._ema('slow', close, p['slow'])
+                return (macd > self._ema('signal', macd, p['signal'])).astype(np.float64)
+            elif self.strategy_type == "Stochastic Oscillator":
+                low_min = rolling_min(prices['Low'], p['k_period'])[skip:]
+                high_max = rolling_max(prices['High'], p['k_period'])[skip:]
+                k = 100 * ((close[skip:] - low_min) / (high_max - low_min))
+                return self._latch(k < p['oversold'], k > p['overbought'])
+
+class ChunkedBacktest:
+    """
+    `backtest_columns` metrics accumulated over chunks: feed `update(close,
+    signals)` consecutive chunks, then read `result()`. Only the running
+    equity, peak, drawdown and return moments are kept between chunks.
+    """
+
+    def __init__(self, initial_capital: float = 100000.0, risk_free_rate: float = 0.0,
+                 periods_per_year: float = 252):
+        self.initial_capital = initial_capital
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.bars = 0
+        self.first_close = self.last_close = self.last_signal = None
+        self.equity = self.peak = 1.0
+        self.max_drawdown = 0.0
+        # Count, mean and sum of squared deviations of the strategy returns
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+
+    def update(self, close, signals):
+        close = np.asarray(close, dtype=np.float64)
+        signals = np.asarray(signals, dtype=np.float64)
+        if len(close) == 0:
+            return
+        if self.first_close is None:
+            self.first_close = close[0]
+            returns = close[1:] / close[:-1] - 1.0
+            returns *= signals[:-1]
+        else:
+            returns = np.diff(close, prepend=self.last_close) / np.append(self.last_close, close[:-1])
+            returns *= np.append(self.last_signal, signals[:-1])
+        self.bars += len(close)
+        self.last_close, self.last_signal = close[-1], signals[-1]
+        if len(returns) == 0:
+            return
+
+        # Chan et al. pairwise update of the running mean and variance
+        n, mean = len(returns), returns.mean()
+        m2 = ((returns - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+        growth = np.cumprod(returns + 1.0) * self.equity
+        peak = np.maximum(np.maximum.accumulate(growth), self.peak)
+        self.max_drawdown = min(self.max_drawdown, (growth / peak).min() - 1.0)
+        self.equity, self.peak = growth[-1], peak[-1]
+
+    def result(self) -> dict:
+        """Numeric metrics with the same keys and definitions as `backtest_columns`."""
+        total_return = self.equity - 1.0
+        volatility = np.sqrt(self.m2 / (self.count - 1)) * np.sqrt(self.periods_per_year) if self.count > 1 else np.nan
+        annual_return = (1 + total_return) ** (self.periods_per_year / max(self.bars, 1)) - 1
+        sharpe_ratio = (annual_return - self.risk_free_rate) / volatility if volatility else 0.0
+        return {
+            "Total Return": float(total_return),
+            "Market Return": float(self.last_close / self.first_close - 1) if self.bars else np.nan,
+            "Annualized Return": float(annual_return),
+            "Annualized Volatility": float(volatility),
+            "Sharpe Ratio": float(sharpe_ratio),
+            "Max Drawdown": float(self.max_drawdown),
+            "Final Equity": float(self.equity * self.initial_capital),
+        }
+
+def backtest_store(store, symbol: str, strategy_type: str, params: dict, interval: str = "1m",
+                   resample: str = None, chunk_rows: int = 1_000_000, initial_capital: float = 100000.0,
+                   risk_free_rate: float = 0.0) -> dict:
+    """
+    Backtests one strategy over everything stored for `symbol` at `interval`
+    without loading the history into memory: the memory-mapped columns are
+    read `chunk_rows` bars at a time. With `resample` (e.g. "15min", "1h")
+    the bars are first aggregated to that size. Metrics are annualized for
+    the bar size actually traded.
+    """
+    if resample:
+        bars = resample_store(store, symbol, resample, interval, chunk_rows)
+        index = bars.index
+        columns = {col: bars[col].to_numpy() for col in bars}
+    else:
+        loaded = store.load(symbol, interval)
+        if loaded is None:
+            raise ValueError(f"No {interval} bars stored for {symbol}")
+        raw_index, columns = loaded
+        index = _timestamps(raw_index[:20_000], store.meta(symbol, interval))
+
+    needed = [col for col in ("Close", "High", "Low") if col in columns]
+    signals = ChunkedSignals(strategy_type, params)
+    backtest = ChunkedBacktest(initial_capital, risk_free_rate, periods_per_year(index))
+    n = len(columns['Close'])
+    for lo in range(0, n, chunk_rows):
+        prices = {col: columns[col][lo:lo + chunk_rows] for col in needed}
+        backtest.update(prices['Close'], signals.update(prices))
+    return backtest.result()
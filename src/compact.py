@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from src.backtest import run_backtest
+from src.metrics import compute_metrics
+from src.strategy import PLOT_COLUMNS, calculate_signals
+
+# Compact mode (`calculate_signals(..., compact=True)` and
+# `run_backtest(..., compact=True)`) stores prices and backtest columns as
+# float32 and drops the chart-only columns. Signals are computed from the
+# float64 input and are exact; everything downstream sees prices rounded to
+# float32 (about 7 significant digits), so the metrics carry a small relative
+# error that grows roughly with the square root of the number of bars.
+#
+# Tolerance checked by `verify_compact`: every Signal identical, and every
+# metric within COMPACT_RTOL relative (COMPACT_ATOL absolute, for values near
+# zero) of the float64 pipeline.
+COMPACT_RTOL = 1e-4
+COMPACT_ATOL = 1e-6
+
+def with_plot_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds back the chart-only columns a compact frame leaves out: the
+    strategy's indicator lines (recomputed from the stored prices), and
+    Market_Returns and Peak when the frame is a backtest result.
+    """
+    if all(c in df for c in ('Short_MA', 'Long_MA')):
+        return df
+    strategy_type, params = df.attrs.get('strategy'), df.attrs.get('params')
+    if strategy_type is None:
+        raise ValueError("Frame has no plot columns and no strategy to rebuild them from")
+    prices = df[[c for c in ('Close', 'High', 'Low') if c in df]].astype(np.float64)
+    lines = calculate_signals(prices, strategy_type, params)
+    out = df.assign(**{c: lines[c] for c in PLOT_COLUMNS if c in lines})
+    if 'Equity_Curve' in df:
+        out['Market_Returns'] = prices['Close'].pct_change(fill_method=None)
+        out['Peak'] = df['Equity_Curve'].astype(np.float64).cummax()
+    return out
+
+def verify_compact(data: pd.DataFrame, strategy_type: str, params: dict, initial_capital: float = 100000.0,
+                   risk_free_rate: float = 0.0) -> dict:
+    """
+    Runs the float64 and the compact pipeline on `data` and compares them.
+    Returns "signal_mismatches", the largest relative metric error
+    ("max_rel_error" and the metric it occurred in, "worst_metric"), the
+    result frames' sizes in bytes ("full_bytes", "compact_bytes") and "ok"
+    (within the documented tolerance).
+    """
+    full = run_backtest(calculate_signals(data, strategy_type, params), initial_capital)
+    compact = run_backtest(calculate_signals(data, strategy_type, params, compact=True), initial_capital,
+                           compact=True)
+    mismatches = int((full['Signal'].to_numpy() != compact['Signal'].to_numpy()).sum())
+    expected = compute_metrics(full, risk_free_rate)
+    actual = compute_metrics(compact, risk_free_rate)
+    ok = mismatches == 0
+    worst, worst_metric = 0.0, None
+    for key, value in expected.items():
+        error = abs(actual[key] - value)
+        ok &= bool(np.isclose(actual[key], value, rtol=COMPACT_RTOL, atol=COMPACT_ATOL))
+        relative = error / max(abs(value), COMPACT_ATOL)
+        if relative > worst:
+            worst, worst_metric = relative, key
+    return {
+        "signal_mismatches": mismatches,
+        "max_rel_error": worst,
+        "worst_metric": worst_metric,
+        "full_bytes": int(full.memory_usage(deep=True).sum()),
+        "compact_bytes": int(compact.memory_usage(deep=True).sum()),
+        "ok": ok,
+    }
@@ -1,22 +1,43 @@
-import yfinance as yf
 import pandas as pd
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def fetch_data(symbol: str, start: str, end: str) -> pd.DataFrame:
+def download_yfinance(symbol: str, start: str, end: str, interval: str = "1d") -> pd.DataFrame:
     """
-    Fetches historical OHLCV data for a given ticker symbol.
+    Downloads OHLCV bars for [start, end) from Yahoo Finance. This is the default
+    provider for `OHLCVStore`.
+    """
+    # yfinance is slow to import; only pay for it when bars are actually downloaded
+    import yfinance as yf
+    data = yf.download(symbol, start=start, end=end, interval=interval)
+    # yfinance reports failures as an empty frame; a range with no bars (YFPricesMissingError)
+    # is a valid answer, anything else (network, rate limit) is raised so it is not cached
+    error = getattr(yf.shared, '_ERRORS', {}).get(symbol.upper())
+    if (data is None or data.empty) and error and not error.startswith("YFPricesMissingError"):
+        raise ConnectionError(f"Download failed for {symbol}: {error}")
+    if data is None:
+        data = pd.DataFrame()
+    # Flatten multi-index columns if they exist (yfinance sometimes returns them)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+def fetch_data(symbol: str, start: str, end: str, interval: str = "1d", store=None) -> pd.DataFrame:
+    """
+    Fetches historical OHLCV data for a given ticker symbol. When an `OHLCVStore`
+    is given, bars already on disk are served from it and only the missing
+    date ranges are downloaded.
     """
     logger.info(f"Fetching data for {symbol} from {start} to {end}")
     try:
-        data = yf.download(symbol, start=start, end=end)
+        if store is not None:
+            data = store.get(symbol, start, end, interval)
+        else:
+            data = download_yfinance(symbol, start, end, interval)
         if data.empty:
             raise ValueError(f"No data found for {symbol}")
-        # Flatten multi-index columns if they exist (yfinance sometimes returns them)
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
         return data
     except Exception as e:
         logger.error(f"Error fetching data: {e}")
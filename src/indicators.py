@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# NumPy indicator kernels working down axis 0 of 1D (bars,) or 2D
+# (bars x columns) float arrays. They mirror the pandas rolling/ewm calls in
+# `src/strategy.py` (NaN handling included) so batched code paths can compute
+# many parameter sets or symbols in one pass. Rolling sums agree with pandas to
+# floating-point tolerance; EWMs are computed by pandas itself.
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    return (x[:, None], True) if x.ndim == 1 else (x, False)
+
+def _prefix_sum(values):
+    """Cumulative sums down axis 0 with a leading row of zeros."""
+    out = np.zeros((values.shape[0] + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+def _window_diff(prefix, windows):
+    """Per-column rolling sums from a prefix sum, one slice per distinct window."""
+    n = prefix.shape[0] - 1
+    out = np.empty((n, prefix.shape[1]))
+    ends = np.arange(1, n + 1)
+    for w in np.unique(windows):
+        starts = np.maximum(ends - w, 0)
+        if len(windows) == 1 or (windows == w).all():
+            # One window for every column: contiguous row slices, no gather
+            np.subtract(prefix[1:], prefix[starts], out=out)
+            continue
+        cols = np.flatnonzero(windows == w)
+        out[:, cols] = prefix[np.ix_(ends, cols)] - prefix[np.ix_(starts, cols)]
+    return out
+
+def _centred(x):
+    """
+    `x` minus its column means with NaNs zeroed, and the validity mask.
+    Centering keeps prefix sums small, which limits cancellation error.
+    """
+    valid = ~np.isnan(x)
+    counts = valid.sum(axis=0)
+    centre = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(counts, 1)
+    return np.where(valid, x - centre, 0.0), valid, centre
+
+def _windows(x, window, min_periods):
+    windows = np.broadcast_to(np.asarray(window, dtype=np.int64), (x.shape[1],))
+    if min_periods is None:
+        return windows, windows
+    return windows, np.broadcast_to(np.asarray(min_periods, dtype=np.int64), windows.shape)
+
+def rolling_mean(x, window, min_periods=None):
+    """
+    Equivalent of `Series.rolling(window, min_periods).mean()` applied to every
+    column. `window` may be a scalar or one window per column.
+    """
+    x, squeeze = _as_2d(x)
+    windows, min_periods = _windows(x, window, min_periods)
+    filled, valid, centre = _centred(x)
+    sums = _window_diff(_prefix_sum(filled), windows)
+    counts = _window_diff(_prefix_sum(valid.astype(np.float64)), windows)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = sums / counts + centre
+    out[counts < np.maximum(min_periods, 1)] = np.nan
+    return out[:, 0] if squeeze else out
+
+def _grid_sums(x, windows):
+    """
+    Rolling sums, sums of squares and counts of one series for many windows,
+    gathered from a single prefix sum into (bars x len(windows)) blocks.
+    """
+    filled, valid, centre = _centred(x[:, None])
+    prefix = _prefix_sum(np.column_stack([filled[:, 0], filled[:, 0] ** 2, valid[:, 0]]))
+    ends = np.arange(1, len(x) + 1)
+    starts = np.maximum(ends[:, None] - windows[None, :], 0)
+    sums, squares, counts = (prefix[ends, j][:, None] - prefix[starts, j] for j in range(3))
+    return sums, squares, counts, centre[0]
+
+def rolling_mean_grid(x, windows, min_periods=None):
+    """
+    Rolling means of one series for many windows, as a (bars x len(windows)) block.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    min_periods = windows if min_periods is None else min_periods
+    sums, _, counts, centre = _grid_sums(x, windows)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = sums / counts + centre
+    out[counts < np.maximum(min_periods, 1)] = np.nan
+    return out
+
+def rolling_std(x, window, min_periods=None):
+    """
+    Equivalent of `Series.rolling(window, min_periods).std()` (ddof=1) applied to
+    every column. `window` may be a scalar or one window per column.
+    """
+    x, squeeze = _as_2d(x)
+    windows, min_periods = _windows(x, window, min_periods)
+    filled, valid, _ = _centred(x)
+    sums = _window_diff(_prefix_sum(filled), windows)
+    squares = _window_diff(_prefix_sum(filled * filled), windows)
+    counts = _window_diff(_prefix_sum(valid.astype(np.float64)), windows)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (squares - sums * sums / counts) / (counts - 1)
+    np.maximum(var, 0.0, out=var)
+    out = np.sqrt(var)
+    out[counts < np.maximum(min_periods, 2)] = np.nan
+    return out[:, 0] if squeeze else out
+
+def rolling_std_grid(x, windows, min_periods=None):
+    """Rolling standard deviations of one series for many windows."""
+    x = np.asarray(x, dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    min_periods = windows if min_periods is None else min_periods
+    sums, squares, counts, _ = _grid_sums(x, windows)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (squares - sums * sums / counts) / (counts - 1)
+    np.maximum(var, 0.0, out=var)
+    out = np.sqrt(var)
+    out[counts < np.maximum(min_periods, 2)] = np.nan
+    return out
+
+def _rolling_extreme(x, window, reducer):
+    x, squeeze = _as_2d(x)
+    out = np.full(x.shape, np.nan)
+    if window <= x.shape[0]:
+        view = np.lib.stride_tricks.sliding_window_view(x, window, axis=0)
+        # A NaN anywhere in a full window yields NaN, as pandas does with min_periods=window
+        reducer(view, axis=-1, out=out[window - 1:])
+    return out[:, 0] if squeeze else out
+
+def rolling_min(x, window):
+    """Equivalent of `Series.rolling(window).min()` applied to every column."""
+    return _rolling_extreme(x, int(window), np.min)
+
+def rolling_max(x, window):
+    """Equivalent of `Series.rolling(window).max()` applied to every column."""
+    return _rolling_extreme(x, int(window), np.max)
+
+def ewm_mean(x, span):
+    """
+    Equivalent of `Series.ewm(span=span, adjust=False).mean()` applied to every
+    column. `span` may be a scalar or one span per column; a 1D `x` with
+    several spans returns one column per span.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    spans = np.atleast_1d(np.asarray(span, dtype=np.float64))
+    squeeze = x.ndim == 1 and np.ndim(span) == 0
+    if x.ndim == 1:
+        x = np.broadcast_to(x[:, None], (len(x), len(spans)))
+    spans = np.broadcast_to(spans, (x.shape[1],))
+
+    # The recursion is sequential in time, so hand each distinct span's columns
+    # to pandas' compiled kernel rather than looping over bars in Python
+    out = np.empty(x.shape)
+    for value in np.unique(spans):
+        cols = np.flatnonzero(spans == value)
+        block = x[:, cols] if len(cols) < x.shape[1] else x
+        out[:, cols] = pd.DataFrame(block).ewm(span=value, adjust=False).mean().to_numpy()
+    return out[:, 0] if squeeze else out
@@ -0,0 +1,116 @@
+import contextvars
+import logging
+import os
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# Lightweight stage timing. Wrap pipeline stages in `span(...)`; when
+# instrumentation is off (the default) `span` returns a shared no-op object,
+# so the only cost is one function call. Turn it on globally with
+# `ALGO_TRACE=1` / `enable()`, or for one block of code with `recording()`,
+# which also collects the records (e.g. for the Streamlit timing panel).
+#
+# Every finished span is emitted as a log record on this module's logger with
+# the measurements as a dict in its `span` attribute (stage, seconds, rows,
+# bytes_allocated, peak_bytes plus any caller fields), so any logging handler
+# or formatter can ship them as structured data.
+
+_enabled = os.getenv("ALGO_TRACE", "") not in ("", "0")
+_trace_memory = os.getenv("ALGO_TRACE_MEMORY", "") not in ("", "0")
+_collector = contextvars.ContextVar("instrument_collector", default=None)
+
+def enable(trace_memory: bool = False):
+    """Turns instrumentation on for the whole process."""
+    global _enabled, _trace_memory
+    _enabled, _trace_memory = True, trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable():
+    global _enabled, _trace_memory
+    _enabled = _trace_memory = False
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setitem__(self, key, value):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    def __init__(self, stage, fields, records, trace_memory):
+        self.record = {"stage": stage, **fields}
+        self.records = records
+        self.trace_memory = trace_memory
+
+    def __setitem__(self, key, value):
+        self.record[key] = value
+
+    def __enter__(self):
+        self.trace_memory = self.trace_memory and tracemalloc.is_tracing()
+        if self.trace_memory:
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["seconds"] = time.perf_counter() - self.start
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.record["bytes_allocated"] = current - self.mem_start
+            # Exact for non-nested spans; an inner span resets the shared peak
+            self.record["peak_bytes"] = peak - self.mem_start
+        if exc_type is not None:
+            self.record["error"] = exc_type.__name__
+        if self.records is not None:
+            self.records.append(self.record)
+        logger.info("%s took %.1f ms", self.record["stage"], self.record["seconds"] * 1e3,
+                    extra={"span": self.record})
+        return False
+
+def span(stage: str, **fields):
+    """
+    Times the enclosed block as pipeline stage `stage`. Extra keyword fields
+    (and anything assigned to the returned object, e.g. `s['rows'] = len(df)`)
+    are attached to the record.
+    """
+    collector = _collector.get()
+    if collector is None and not _enabled:
+        return _NULL_SPAN
+    records, trace_memory = collector if collector is not None else (None, _trace_memory)
+    return _Span(stage, fields, records, trace_memory)
+
+class recording:
+    """
+    Collects the records of every span finished inside the block, whether or
+    not instrumentation is globally enabled:
+
+        with recording() as records:
+            run_pipeline()
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.records = []
+        self.trace_memory = trace_memory
+
+    def __enter__(self):
+        # Memory tracing slows everything down, so only run it for this block
+        self.started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        self.token = _collector.set((self.records, self.trace_memory))
+        return self.records
+
+    def __exit__(self, *exc):
+        _collector.reset(self.token)
+        if self.started_tracing:
+            tracemalloc.stop()
+        return False
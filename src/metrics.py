@@ -1,26 +1,167 @@
+import math
+
 import pandas as pd
 import numpy as np
 
-def calculate_metrics(df: pd.DataFrame, risk_free_rate: float = 0.0) -> dict:
+from src.bars import periods_per_year as infer_periods_per_year
+
+# Performance statistics of a `run_backtest` result. `compute_metrics` gives
+# the whole-period numbers, `rolling_metrics` the same statistics over a
+# trailing window of bars as series (one vectorized pass), and
+# `RunningMetrics` keeps them up to date one bar at a time for live feeds.
+# All three return plain numbers; `format_metrics` turns them into display
+# strings.
+
+# Rolling variances below this are taken as 0: the online rolling sums can
+# leave a residual of ~1e-19 over a flat window that follows volatile bars,
+# and a per-bar standard deviation under 1e-7 is less than one price tick.
+VARIANCE_FLOOR = 1e-14
+
+def compute_metrics(df: pd.DataFrame, risk_free_rate: float = 0.0, periods_per_year: float = None) -> dict:
     """
-    Calculates key performance metrics.
+    Calculates key performance metrics as plain numbers. Returns are annualized
+    with `periods_per_year`, inferred from the bar spacing of the index when
+    not given (252 for daily bars).
     """
-    returns = df['Strategy_Returns'].dropna()
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(df.index)
+    # float64 arithmetic even when the columns are stored compactly as float32
+    returns = df['Strategy_Returns'].dropna().astype(np.float64)
     
-    total_return = (df['Equity_Curve'].iloc[-1] / df['Equity_Curve'].iloc[0]) - 1
-    annual_return = (1 + total_return) ** (252 / len(df)) - 1
+    total_return = (float(df['Equity_Curve'].iloc[-1]) / float(df['Equity_Curve'].iloc[0])) - 1
+    annual_return = (1 + total_return) ** (periods_per_year / len(df)) - 1
     
-    volatility = returns.std() * np.sqrt(252)
+    volatility = returns.std() * np.sqrt(periods_per_year)
     sharpe_ratio = (annual_return - risk_free_rate) / volatility if volatility != 0 else 0
     
     max_drawdown = df['Drawdown'].min()
-    market_return = (df['Close'].iloc[-1] / df['Close'].iloc[0]) - 1
+    market_return = (float(df['Close'].iloc[-1]) / float(df['Close'].iloc[0])) - 1
     
     return {
-        "Total Return": f"{total_return:.2%}",
-        "Market Return": f"{market_return:.2%}",
-        "Annualized Return": f"{annual_return:.2%}",
-        "Annualized Volatility": f"{volatility:.2%}",
-        "Sharpe Ratio": f"{sharpe_ratio:.2f}",
-        "Max Drawdown": f"{max_drawdown:.2%}"
+        "Total Return": float(total_return),
+        "Market Return": float(market_return),
+        "Annualized Return": float(annual_return),
+        "Annualized Volatility": float(volatility),
+        "Sharpe Ratio": float(sharpe_ratio),
+        "Max Drawdown": float(max_drawdown),
+        "Final Equity": float(df['Equity_Curve'].iloc[-1]),
     }
+
+def rolling_metrics(df: pd.DataFrame, window: int, risk_free_rate: float = 0.0,
+                    periods_per_year: float = None) -> pd.DataFrame:
+    """
+    Rolling statistics over the trailing `window` bars of a `run_backtest`
+    result, in O(n) for any window. Rolling_Return, Rolling_Volatility and
+    Rolling_Sharpe at bar t are the "Annualized Return", "Annualized
+    Volatility" and "Sharpe Ratio" `compute_metrics` reports for bars
+    t - window + 1 .. t (NaN until a full window is available);
+    Rolling_Drawdown is the drawdown from the highest equity in that window.
+    """
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(df.index)
+    returns = df['Strategy_Returns'].astype(np.float64)
+    equity = df['Equity_Curve'].astype(np.float64)
+
+    total_return = equity / equity.shift(window - 1) - 1
+    annual_return = (1 + total_return) ** (periods_per_year / window) - 1
+    variance = returns.rolling(window, min_periods=2).var()
+    volatility = np.sqrt(variance.mask(variance < VARIANCE_FLOOR, 0.0)) * np.sqrt(periods_per_year)
+    volatility.iloc[:window - 1] = np.nan
+    sharpe_ratio = ((annual_return - risk_free_rate) / volatility).where(volatility != 0, 0.0)
+    sharpe_ratio[volatility.isna()] = np.nan
+    drawdown = equity / equity.rolling(window, min_periods=1).max() - 1
+    return pd.DataFrame({
+        "Rolling_Return": annual_return,
+        "Rolling_Volatility": volatility,
+        "Rolling_Sharpe": sharpe_ratio,
+        "Rolling_Drawdown": drawdown,
+    }, index=df.index)
+
+class RunningMetrics:
+    """
+    `compute_metrics` kept current one bar at a time: `update(close, signal)`
+    applies the `run_backtest` rules to each new bar in O(1), keeping the
+    equity, its running peak and drawdown, and the Welford mean and variance
+    of the strategy returns. `result()` at any point gives the metrics of the
+    bars seen so far; equity and drawdown figures are identical to the batch
+    computation, volatility and Sharpe agree to floating-point rounding.
+    """
+
+    def __init__(self, initial_capital: float = 100000.0, risk_free_rate: float = 0.0,
+                 periods_per_year: float = 252):
+        self.initial_capital = initial_capital
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.bars = 0
+        self.first_close = self.last_close = self.last_signal = None
+        self.growth = 1.0
+        self.equity = self.peak = float(initial_capital)
+        self.drawdown = self.max_drawdown = 0.0
+        # Count, mean and sum of squared deviations of the strategy returns
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+
+    def update(self, close: float, signal: float) -> float:
+        """Adds one bar (its Close and the Signal decided on it) and returns the new equity."""
+        close, signal = float(close), float(signal)
+        if self.bars == 0:
+            self.first_close = close
+        else:
+            # The position held over this bar is the previous bar's Signal (no lookahead)
+            r = (close / self.last_close - 1.0) * self.last_signal
+            if not math.isnan(r):
+                self.count += 1
+                delta = r - self.mean
+                self.mean += delta / self.count
+                self.m2 += delta * (r - self.mean)
+                self.growth *= 1.0 + r
+        self.bars += 1
+        self.last_close, self.last_signal = close, signal
+        self.equity = self.growth * self.initial_capital
+        self.peak = max(self.peak, self.equity)
+        self.drawdown = (self.equity - self.peak) / self.peak
+        self.max_drawdown = min(self.max_drawdown, self.drawdown)
+        return self.equity
+
+    @property
+    def volatility(self) -> float:
+        """Annualized volatility of the strategy returns so far (NaN before two returns)."""
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(self.m2 / (self.count - 1)) * math.sqrt(self.periods_per_year)
+
+    def result(self) -> dict:
+        """Numeric metrics with the same keys and definitions as `compute_metrics`."""
+        if self.bars == 0:
+            raise ValueError("No bars seen yet")
+        total_return = self.equity / self.initial_capital - 1
+        annual_return = (1 + total_return) ** (self.periods_per_year / self.bars) - 1
+        volatility = self.volatility
+        sharpe_ratio = (annual_return - self.risk_free_rate) / volatility if volatility != 0 else 0
+        return {
+            "Total Return": float(total_return),
+            "Market Return": float(self.last_close / self.first_close - 1),
+            "Annualized Return": float(annual_return),
+            "Annualized Volatility": float(volatility),
+            "Sharpe Ratio": float(sharpe_ratio),
+            "Max Drawdown": float(self.max_drawdown),
+            "Final Equity": float(self.equity),
+        }
+
+def format_metrics(metrics: dict) -> dict:
+    """
+    Formats numeric metrics for display (percentages, ratios).
+    """
+    return {
+        "Total Return": f"{metrics['Total Return']:.2%}",
+        "Market Return": f"{metrics['Market Return']:.2%}",
+        "Annualized Return": f"{metrics['Annualized Return']:.2%}",
+        "Annualized Volatility": f"{metrics['Annualized Volatility']:.2%}",
+        "Sharpe Ratio": f"{metrics['Sharpe Ratio']:.2f}",
+        "Max Drawdown": f"{metrics['Max Drawdown']:.2%}"
+    }
+
+def calculate_metrics(df: pd.DataFrame, risk_free_rate: float = 0.0, periods_per_year: float = None) -> dict:
+    """
+    Calculates key performance metrics.
+    """
+    return format_metrics(compute_metrics(df, risk_free_rate, periods_per_year))
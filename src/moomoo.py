@@ -1,56 +1,271 @@
+import glob
 import logging
+import os
+import tempfile
+import time
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BUY, SELL = 1, -1
+
+class TradeLedger:
+    """
+    Columnar record of fills: typed arrays for time (int64 ns), symbol code,
+    side (+1 buy / -1 sell), quantity and price, grown in place. At most
+    `capacity` rows are held in memory; beyond that the oldest rows are
+    written to `.npz` files or, without a `spill_dir`, dropped (and counted
+    in `dropped`). Each ledger spills into its own new subdirectory of
+    `spill_dir` (`spill_path`, made on the first spill), so ledgers sharing
+    a directory, or files left there by an earlier run, never mix.
+    """
+
+    COLUMNS = {"time": np.int64, "symbol": np.int32, "side": np.int8, "qty": np.float64, "price": np.float64}
+
+    def __init__(self, capacity: int = 1_000_000, spill_dir: str = None):
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.spill_path = None
+        self.symbols = []        # code -> symbol
+        self.codes = {}          # symbol -> code
+        self.size = 0
+        self.dropped = 0
+        self.spills = 0
+        self.data = {name: np.empty(min(capacity, 1024), dtype=dtype) for name, dtype in self.COLUMNS.items()}
+
+    def __len__(self):
+        return self.size
+
+    def encode(self, symbols) -> np.ndarray:
+        """Symbol codes for an array of symbols, registering new ones."""
+        uniques, inverse = np.unique(np.asarray(symbols, dtype=object), return_inverse=True)
+        for symbol in uniques:
+            if symbol not in self.codes:
+                self.codes[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+        return np.array([self.codes[s] for s in uniques], dtype=np.int32)[inverse]
+
+    def append(self, times, codes, sides, qtys, prices):
+        """Appends a batch of fills (arrays of equal length, symbols already encoded)."""
+        columns = dict(zip(self.COLUMNS, (times, codes, sides, qtys, prices)))
+        n = len(codes)
+        offset = 0
+        while offset < n:
+            if self.size == self.capacity:
+                self._make_room()
+            room = min(self.capacity - self.size, n - offset)
+            self._reserve(self.size + room)
+            for name, values in columns.items():
+                self.data[name][self.size:self.size + room] = np.broadcast_to(values, (n,))[offset:offset + room]
+            self.size += room
+            offset += room
+
+    def _reserve(self, rows):
+        current = len(self.data['time'])
+        if rows <= current:
+            return
+        new = min(max(rows, current * 2), self.capacity)
+        for name, values in self.data.items():
+            grown = np.empty(new, dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.data[name] = grown
+
+    def _make_room(self):
+        if self.spill_dir:
+            if self.spill_path is None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self.spill_path = tempfile.mkdtemp(prefix="ledger-", dir=self.spill_dir)
+            path = os.path.join(self.spill_path, f"ledger-{self.spills:05d}.npz")
+            np.savez(path, **{name: values[:self.size] for name, values in self.data.items()})
+            self.spills += 1
+            self.size = 0
+        else:
+            # Keep the newer half so appends stay amortized O(1)
+            keep = self.size // 2
+            for values in self.data.values():
+                values[:keep] = values[self.size - keep:self.size]
+            self.dropped += self.size - keep
+            self.size = keep
+
+    def to_frame(self, include_spilled: bool = True) -> pd.DataFrame:
+        """The fills as a DataFrame (spilled rows first), with timestamps and symbol names decoded."""
+        parts = []
+        if include_spilled and self.spill_path:
+            for path in sorted(glob.glob(os.path.join(self.spill_path, "ledger-*.npz"))):
+                with np.load(path) as f:
+                    parts.append({name: f[name] for name in self.COLUMNS})
+        parts.append({name: values[:self.size] for name, values in self.data.items()})
+        columns = {name: np.concatenate([p[name] for p in parts]) for name in self.COLUMNS}
+        symbols = np.array(self.symbols, dtype=object)
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(columns['time'], unit='ns'),
+            "symbol": symbols[columns['symbol']] if len(symbols) else columns['symbol'].astype(object),
+            "side": np.where(columns['side'] == BUY, "BUY", "SELL"),
+            "qty": columns['qty'],
+            "price": columns['price'],
+        })
+
 class LocalTradeSimulator:
-    def __init__(self):
-        # We'll use Streamlit session state to persist the portfolio, 
+    def __init__(self, ledger: TradeLedger = None):
+        # We'll use Streamlit session state to persist the portfolio,
         # so this class just provides the logic for "placing" orders.
-        pass
+        # With a ledger, fills are recorded there instead of portfolio['history'].
+        self.ledger = ledger
 
     def place_order(self, portfolio, symbol, qty, side, current_price):
         """
         Simulates an order and updates the provided portfolio dictionary.
+        `side` is 'BUY' or 'SELL' in any case and is recorded upper-case;
+        a non-positive quantity is rejected.
         """
         try:
+            if not qty > 0:
+                return False, "Quantity must be positive."
+            side = side.upper()
             order_value = qty * current_price
-            
-            if side.upper() == 'BUY':
+
+            if side == 'BUY':
                 if portfolio['cash'] < order_value:
                     return False, "Insufficient virtual cash balance."
-                
+
                 portfolio['cash'] -= order_value
                 portfolio['positions'][symbol] = portfolio['positions'].get(symbol, 0) + qty
                 msg = f"Simulated BUY of {qty} {symbol} at ${current_price:.2f}"
-            
-            elif side.upper() == 'SELL':
+
+            elif side == 'SELL':
                 current_qty = portfolio['positions'].get(symbol, 0)
                 if current_qty < qty:
                     return False, f"Insufficient position in {symbol} to sell."
-                
+
                 portfolio['cash'] += order_value
                 portfolio['positions'][symbol] -= qty
                 if portfolio['positions'][symbol] == 0:
                     del portfolio['positions'][symbol]
                 msg = f"Simulated SELL of {qty} {symbol} at ${current_price:.2f}"
-            
+
             else:
                 return False, "Invalid side. Use BUY or SELL."
 
             # Log transaction
-            transaction = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "symbol": symbol,
-                "side": side,
-                "qty": qty,
-                "price": current_price
-            }
-            portfolio['history'].append(transaction)
-            logger.info(msg)
+            if self.ledger is not None:
+                self.ledger.append(time.time_ns(), self.ledger.encode([symbol]),
+                                   BUY if side == 'BUY' else SELL, qty, current_price)
+            else:
+                transaction = {
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "symbol": symbol,
+                    "side": side,
+                    "qty": qty,
+                    "price": current_price
+                }
+                portfolio['history'].append(transaction)
+            logger.debug(msg)
             return True, msg
 
         except Exception as e:
             logger.error(f"Simulator error: {e}")
             return False, str(e)
+
+    def place_orders(self, portfolio, symbols, qtys, sides, prices, timestamps=None) -> np.ndarray:
+        """
+        Places a batch of orders in sequence, with the same acceptance rules
+        and resulting cash and positions as calling `place_order` for each in
+        turn, and returns a bool array of which were filled. `sides` holds
+        'BUY'/'SELL' strings or +1/-1; orders with an invalid side or a
+        non-positive quantity are rejected. Fills go to the ledger, stamped
+        with `timestamps` (int64 ns or datetimes) or the current time.
+        """
+        qtys = np.asarray(qtys, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(qtys)
+        sides = np.asarray(sides)
+        if sides.dtype.kind in "iuf":
+            side = np.sign(sides).astype(np.int8)
+        else:
+            upper = np.char.upper(sides.astype(str))
+            side = np.where(upper == 'BUY', BUY, np.where(upper == 'SELL', SELL, 0)).astype(np.int8)
+        # Hash-based (first-appearance order), much cheaper than sorting the strings
+        codes, symbol_list = pd.factorize(np.asarray(symbols, dtype=object))
+        values = qtys * prices
+        accepted = (side != 0) & (qtys > 0)
+
+        positions = portfolio['positions']
+        held = [float(positions.get(s, 0)) for s in symbol_list]
+        present = [s in positions for s in symbol_list]
+        cash = portfolio['cash']
+
+        # The acceptance checks chain through cash and positions, so they run
+        # in order, but over plain floats taken out of the arrays in one go;
+        # everything else (parsing, encoding, the ledger) is whole-array.
+        active = np.flatnonzero(accepted)
+        rejected = []
+        for i, code, buy, qty, value in zip(active.tolist(), codes[active].tolist(), (side[active] == BUY).tolist(),
+                                            qtys[active].tolist(), values[active].tolist()):
+            if buy:
+                if cash < value:
+                    rejected.append(i)
+                    continue
+                cash -= value
+                held[code] += qty
+            else:
+                if held[code] < qty:
+                    rejected.append(i)
+                    continue
+                cash += value
+                held[code] -= qty
+        accepted[rejected] = False
+
+        filled = np.flatnonzero(accepted)
+        portfolio['cash'] = cash
+        touched = np.zeros(len(symbol_list), dtype=bool)
+        touched[codes[filled]] = True
+        # A symbol whose last fill was a sell down to zero is removed, as in `place_order`
+        last_side = np.zeros(len(symbol_list), dtype=np.int8)
+        last_side[codes[filled]] = side[filled]
+        for j in np.flatnonzero(touched):
+            if held[j] == 0 and last_side[j] == SELL:
+                positions.pop(symbol_list[j], None)
+            else:
+                positions[symbol_list[j]] = _number(held[j], positions.get(symbol_list[j]), present[j])
+
+        if len(filled):
+            if timestamps is None:
+                times = time.time_ns()
+            else:
+                times = pd.DatetimeIndex(np.asarray(timestamps)[filled]).as_unit('ns').asi8
+            if self.ledger is not None:
+                codes_out = self.ledger.encode(symbol_list)[codes[filled]]
+                self.ledger.append(times, codes_out, side[filled], qtys[filled], prices[filled])
+            else:
+                stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                portfolio['history'].extend(
+                    {"timestamp": stamp, "symbol": symbol_list[codes[i]], "side": "BUY" if side[i] == BUY else "SELL",
+                     "qty": qtys[i], "price": prices[i]} for i in filled)
+        logger.info(f"Simulated {len(filled)} of {n} orders ({n - len(filled)} rejected)")
+        return accepted
+
+def _number(value, previous, present):
+    """Keeps integer share counts as ints, like the sequential path does with int quantities."""
+    if float(value).is_integer() and (not present or isinstance(previous, (int, np.integer))):
+        return int(value)
+    return float(value)
+
+def orders_from_positions(close: pd.DataFrame, position: pd.DataFrame, qty: float = 1) -> dict:
+    """
+    Turns a (dates x symbols) Position matrix (Signal changes, +1 enter / -1
+    exit) into an order batch for `place_orders`, in time order: a buy of
+    `qty` on each entry and a sell on each exit, at that bar's Close.
+    """
+    values = np.nan_to_num(position.reindex_like(close).to_numpy(dtype=np.float64))
+    rows, cols = np.nonzero(values)
+    return {
+        "symbols": close.columns.to_numpy(dtype=object)[cols],
+        "qtys": np.full(len(rows), qty, dtype=np.float64),
+        "sides": np.sign(values[rows, cols]).astype(np.int8),
+        "prices": close.to_numpy(dtype=np.float64)[rows, cols],
+        "timestamps": close.index[rows],
+    }
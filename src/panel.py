@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+from src.bars import periods_per_year
+from src.indicators import ewm_mean, rolling_max, rolling_mean, rolling_min, rolling_std
+from src.strategy import latch_signal
+
+# Multi-symbol ("panel") versions of `calculate_signals` and `run_backtest`.
+# Prices are (dates x symbols) matrices and every strategy runs column-wise in
+# one vectorized pass. Each symbol is only live between its first and last
+# valid Close: before listing and after delisting its signal is 0 and it is
+# left out of the metrics; NaN gaps in between are forward-filled (no trading
+# on a missing bar), so a gap-free symbol gets exactly the signals
+# `calculate_signals` gives for its own frame.
+
+PRICE_FIELDS = ("Close", "High", "Low")
+
+def to_panel(universe: dict) -> pd.DataFrame:
+    """
+    Aligns per-symbol OHLCV frames on the union of their dates as one frame
+    with (field, symbol) columns, the layout `yf.download` uses for several tickers.
+    """
+    panel = pd.concat(universe, axis=1).swaplevel(axis=1)
+    return panel.sort_index(axis=1, level=0, sort_remaining=False)
+
+def listed_mask(close) -> np.ndarray:
+    """True from each symbol's first to its last valid Close."""
+    valid = ~np.isnan(np.asarray(close, dtype=np.float64))
+    started = np.logical_or.accumulate(valid, axis=0)
+    not_ended = np.logical_or.accumulate(valid[::-1], axis=0)[::-1]
+    return started & not_ended
+
+def forward_fill(values):
+    """Forward-fills NaNs down each column of a 2D array."""
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(values, rows, axis=0)
+
+def _prices(panel, fields):
+    """(dates x symbols) float arrays per field, forward-filled while listed, plus the listed mask."""
+    close = panel['Close'].to_numpy(dtype=np.float64)
+    listed = listed_mask(close)
+    prices = {}
+    for field in fields:
+        values = forward_fill(close if field == 'Close' else panel[field].to_numpy(dtype=np.float64))
+        values[~listed] = np.nan
+        prices[field] = values
+    return prices, listed
+
+def _sma_crossover(prices, listed, p):
+    close = prices['Close']
+    short_ma = rolling_mean(close, p['short_window'], min_periods=1)
+    long_ma = rolling_mean(close, p['long_window'], min_periods=1)
+    return (short_ma > long_ma).astype(np.float64)
+
+def _ema_crossover(prices, listed, p):
+    close = prices['Close']
+    return (ewm_mean(close, p['short_window']) > ewm_mean(close, p['long_window'])).astype(np.float64)
+
+def _sma_long_only(prices, listed, p):
+    close = prices['Close']
+    signals = (close > rolling_mean(close, p['window'], min_periods=1)).astype(np.float64)
+    # On the listing bar the MA is that close; don't let rounding in the kernel break the tie
+    first = listed.copy()
+    first[1:] &= ~listed[:-1]
+    signals[first] = 0.0
+    return signals
+
+def _rsi_strategy(prices, listed, p):
+    delta = np.diff(prices['Close'], axis=0, prepend=np.nan)
+    # Zero-filled like `calculate_rsi`, but only from the listing bar on
+    gain = np.where(listed, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(listed, np.where(delta < 0, -delta, 0.0), np.nan)
+    gain, loss = rolling_mean(gain, p['period']), rolling_mean(loss, p['period'])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi = 100 - (100 / (1 + gain / loss))
+    return latch_signal(rsi < p['oversold'], rsi > p['overbought'])
+
+def _bollinger_bands(prices, listed, p):
+    close = prices['Close']
+    ma = rolling_mean(close, p['window'])
+    std = rolling_std(close, p['window'])
+    return latch_signal(close < ma - p['num_std'] * std, close > ma + p['num_std'] * std)
+
+def _macd(prices, listed, p):
+    close = prices['Close']
+    macd = ewm_mean(close, p['fast']) - ewm_mean(close, p['slow'])
+    return (macd > ewm_mean(macd, p['signal'])).astype(np.float64)
+
+def _stochastic(prices, listed, p):
+    low_min = rolling_min(prices['Low'], p['k_period'])
+    high_max = rolling_max(prices['High'], p['k_period'])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k = 100 * ((prices['Close'] - low_min) / (high_max - low_min))
+    return latch_signal(k < p['oversold'], k > p['overbought'])
+
+_BUILDERS = {
+    "SMA Crossover": (_sma_crossover, ("Close",)),
+    "EMA Crossover": (_ema_crossover, ("Close",)),
+    "SMA Long Only": (_sma_long_only, ("Close",)),
+    "RSI Strategy": (_rsi_strategy, ("Close",)),
+    "Bollinger Bands": (_bollinger_bands, ("Close",)),
+    "MACD Crossover": (_macd, ("Close",)),
+    "Stochastic Oscillator": (_stochastic, PRICE_FIELDS),
+}
+
+def calculate_panel_signals(panel, strategy_type: str, params: dict) -> pd.DataFrame:
+    """
+    Signals for every symbol at once. `panel` holds (dates x symbols) price
+    frames per field: a frame with (field, symbol) columns (see `to_panel`)
+    or a dict such as {'Close': close, 'High': high, 'Low': low}. Returns a
+    (dates x symbols) Signal frame, 0 outside each symbol's listed span.
+    """
+    if strategy_type not in _BUILDERS:
+        raise ValueError(f"Unknown strategy: {strategy_type}")
+    build, fields = _BUILDERS[strategy_type]
+    missing = [f for f in fields if f not in panel]
+    if missing:
+        raise ValueError(f"{strategy_type} needs {', '.join(missing)} prices")
+    prices, listed = _prices(panel, fields)
+    signals = build(prices, listed, params)
+    signals[~listed] = 0.0
+    close = panel['Close']
+    return pd.DataFrame(signals, index=close.index, columns=close.columns)
+
+def run_panel_backtest(close: pd.DataFrame, signals: pd.DataFrame, initial_capital: float = 100000.0,
+                       metrics_only: bool = False, risk_free_rate: float = 0.0) -> pd.DataFrame:
+    """
+    Backtests every column of a (dates x symbols) Signal frame against the
+    matching Close column, with the `run_backtest` rules (signal applied from
+    the next bar). Returns the equity curves (NaN outside each listed span),
+    or with `metrics_only=True` one row of numeric metrics per symbol, each
+    computed over that symbol's own listed bars.
+    """
+    prices = close.to_numpy(dtype=np.float64)
+    listed = listed_mask(prices)
+    prices = forward_fill(prices)
+    position = signals.reindex_like(close).to_numpy(dtype=np.float64)
+
+    returns = np.full(prices.shape, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns[1:] = (prices[1:] / prices[:-1] - 1.0) * position[:-1]
+    # A symbol's first listed bar has no return, as in the single-symbol backtest
+    returns[~listed | ~np.roll(listed, 1, axis=0)] = np.nan
+    returns[0] = np.nan
+
+    growth = np.cumprod(1.0 + np.nan_to_num(returns), axis=0)
+    if not metrics_only:
+        equity = np.where(listed, growth * initial_capital, np.nan)
+        return pd.DataFrame(equity, index=close.index, columns=close.columns)
+
+    periods = periods_per_year(close.index)
+    bars = listed.sum(axis=0)
+    first = np.argmax(listed, axis=0)
+    last = len(listed) - 1 - np.argmax(listed[::-1], axis=0)
+    cols = np.arange(prices.shape[1])
+
+    total_return = growth[last, cols] - 1.0
+    market_return = prices[last, cols] / prices[first, cols] - 1.0
+    counted = ~np.isnan(returns)
+    n_returns = counted.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(counted, returns, 0.0).sum(axis=0) / n_returns
+        squares = np.where(counted, (returns - mean) ** 2, 0.0).sum(axis=0)
+        volatility = np.sqrt(squares / (n_returns - 1)) * np.sqrt(periods)
+        volatility[n_returns < 2] = np.nan
+        annual_return = (1 + total_return) ** (periods / bars) - 1
+        sharpe_ratio = np.where(volatility != 0, (annual_return - risk_free_rate) / volatility, 0.0)
+    peak = np.maximum(np.maximum.accumulate(growth, axis=0), 1.0)
+    max_drawdown = (growth / peak).min(axis=0, initial=1.0) - 1.0
+
+    metrics = pd.DataFrame({
+        "Total Return": total_return,
+        "Market Return": market_return,
+        "Annualized Return": annual_return,
+        "Annualized Volatility": volatility,
+        "Sharpe Ratio": sharpe_ratio,
+        "Max Drawdown": max_drawdown,
+        "Final Equity": (total_return + 1.0) * initial_capital,
+        "Bars": bars,
+    }, index=close.columns)
+    # Symbols that were never listed have no metrics
+    metrics.loc[bars == 0, metrics.columns != "Bars"] = np.nan
+    return metrics
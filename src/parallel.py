@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import backtest_columns
+from src.bars import periods_per_year
+from src.sweep import signal_block
+
+PRICE_COLUMNS = ("Close", "High", "Low")
+
+class SharedUniverse:
+    """
+    Packs the price arrays of many symbols into one shared-memory block so
+    worker processes can read them without pickling or copying.
+
+    The block is a (columns x total_bars) float64 array; each symbol owns a
+    contiguous [offset, offset + length) slice of every row. The layout also
+    records each symbol's bars per year for annualizing. Use as a context
+    manager so the block is unlinked when done.
+    """
+
+    def __init__(self, universe: dict):
+        self.layout = {}
+        offset = 0
+        for symbol, df in universe.items():
+            self.layout[symbol] = (offset, len(df), periods_per_year(df.index))
+            offset += len(df)
+
+        nbytes = max(len(PRICE_COLUMNS) * offset * 8, 1)
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        block = np.ndarray((len(PRICE_COLUMNS), offset), dtype=np.float64, buffer=self.shm.buf)
+        for symbol, df in universe.items():
+            start, length, _ = self.layout[symbol]
+            for row, col in enumerate(PRICE_COLUMNS):
+                block[row, start:start + length] = df[col].to_numpy(dtype=np.float64)
+        self.total_bars = offset
+
+    @property
+    def spec(self) -> tuple:
+        """The shared block's (shm name, shape), as `_attach` takes them."""
+        return self.shm.name, (len(PRICE_COLUMNS), self.total_bars)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Per-process view of a shared float64 block plus the settings its jobs
+# need, set by `_attach` in each worker (src.walkforward shares these too)
+_worker = {}
+
+def _attach(name, shape, settings, order='C'):
+    shm = shared_memory.SharedMemory(name=name, track=False)
+    _worker['shm'] = shm
+    _worker['block'] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order=order)
+    _worker.update(settings)
+
+def _detach():
+    _worker.pop('block', None)
+    shm = _worker.pop('shm', None)
+    if shm is not None:
+        shm.close()
+    _worker.clear()
+
+def _run_job(job):
+    symbol, strategy_type, params = job
+    start, length, periods = _worker['layout'][symbol]
+    # Views into shared memory: nothing is copied until the indicators are built
+    prices = {col: _worker['block'][row, start:start + length] for row, col in enumerate(PRICE_COLUMNS)}
+    signals = signal_block(prices, strategy_type, {k: [v] for k, v in params.items()})[:, 0]
+    return backtest_columns(prices['Close'], signals, _worker['capital'], _worker['risk_free_rate'], periods)
+
+def run_universe(universe: dict, jobs: list, initial_capital: float = 100000.0, risk_free_rate: float = 0.0,
+                 max_workers: int = None, chunksize: int = None) -> pd.DataFrame:
+    """
+    Backtests (symbol, strategy_type, params) jobs across a process pool.
+
+    `universe` maps each symbol to an OHLCV DataFrame; its Close/High/Low
+    arrays are placed in shared memory once and workers receive only the job
+    descriptors. Every job is computed independently, so the returned metrics
+    (one row per job, in job order) do not depend on the number of workers.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+
+    with SharedUniverse(universe) as shared:
+        initargs = (*shared.spec, {'layout': shared.layout, 'capital': initial_capital,
+                                   'risk_free_rate': risk_free_rate})
+        if max_workers == 1:
+            _attach(*initargs)
+            try:
+                results = [_run_job(job) for job in jobs]
+            finally:
+                _detach()
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach, initargs=initargs) as pool:
+                results = list(pool.map(_run_job, jobs, chunksize=chunksize))
+
+    rows = pd.DataFrame({
+        "Symbol": [job[0] for job in jobs],
+        "Strategy": [job[1] for job in jobs],
+        "Params": [job[2] for job in jobs],
+    })
+    return pd.concat([rows, pd.DataFrame(results, index=rows.index)], axis=1)
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+from src.bars import periods_per_year
+from src.indicators import rolling_std
+from src.metrics import compute_metrics
+from src.panel import forward_fill, listed_mask
+
+# Portfolio backtests over a (dates x symbols) universe. Per-symbol Signals
+# (as from `calculate_panel_signals`) choose which names are held; weights are
+# set on a rebalance schedule and drift with prices in between, and each
+# rebalance pays a cost proportional to turnover. As in `run_backtest`, the
+# weights decided on a bar's close earn the next bar's return. Everything is
+# vectorized over the symbol axis; only the short list of rebalance dates is
+# compounded sequentially.
+
+def target_weights(close: pd.DataFrame, signals: pd.DataFrame, scheme: str = "equal",
+                   vol_lookback: int = 60) -> pd.DataFrame:
+    """
+    Long-only target weights from Signals, summing to 1 whenever anything is
+    held (otherwise all cash). "equal" splits the book evenly across the
+    names with a Signal; "inverse_vol" sizes them by 1 / rolling volatility
+    of daily returns over `vol_lookback` bars, so names without that much
+    history are not bought yet.
+    """
+    held = np.nan_to_num(signals.reindex_like(close).to_numpy(dtype=np.float64)) > 0
+    held &= listed_mask(close)
+    if scheme == "equal":
+        raw = held.astype(np.float64)
+    elif scheme == "inverse_vol":
+        prices = forward_fill(close.to_numpy(dtype=np.float64))
+        returns = np.full(prices.shape, np.nan)
+        returns[1:] = prices[1:] / prices[:-1] - 1.0
+        vol = rolling_std(returns, vol_lookback)
+        with np.errstate(divide='ignore'):
+            raw = np.where(held & (vol > 0), 1.0 / vol, 0.0)
+    else:
+        raise ValueError(f"Unknown weighting scheme: {scheme}")
+    total = raw.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = np.where(total > 0, raw / total, 0.0)
+    return pd.DataFrame(weights, index=close.index, columns=close.columns)
+
+def rebalance_dates(index: pd.DatetimeIndex, rebalance="M") -> np.ndarray:
+    """
+    Positions of the bars on which the portfolio is rebalanced: every bar
+    ("D"), every n-th bar (an int), or the last bar of each calendar week,
+    month, quarter or year ("W", "M", "Q", "Y"). The first bar always
+    rebalances, to invest the initial capital.
+    """
+    n = len(index)
+    if rebalance == "D":
+        return np.arange(n)
+    if isinstance(rebalance, (int, np.integer)):
+        return np.arange(0, n, rebalance)
+    if rebalance not in ("W", "M", "Q", "Y"):
+        raise ValueError(f"Unknown rebalance schedule: {rebalance}")
+    periods = pd.DatetimeIndex(index).tz_localize(None).to_period(rebalance).asi8
+    last_of_period = np.flatnonzero(periods[1:] != periods[:-1])
+    return np.unique(np.concatenate(([0], last_of_period, [n - 1] if n else [])).astype(np.int64))
+
+def run_portfolio(close: pd.DataFrame, signals: pd.DataFrame, initial_capital: float = 100000.0,
+                  scheme: str = "equal", rebalance="M", cost_bps: float = 10.0,
+                  vol_lookback: int = 60) -> pd.DataFrame:
+    """
+    Backtests a portfolio that holds the names with a Signal, weighted by
+    `scheme` (see `target_weights`) and rebalanced on `rebalance` (see
+    `rebalance_dates`). Each rebalance costs `cost_bps` basis points of the
+    traded notional (turnover = sum of absolute weight changes).
+
+    Returns one row per bar: Strategy_Returns, Equity_Curve, Peak, Drawdown,
+    Turnover and Cost (fraction of equity paid on rebalance bars), and
+    Benchmark, an equal-weight buy-everything-listed index for comparison.
+    """
+    prices = close.to_numpy(dtype=np.float64)
+    listed = listed_mask(prices)
+    prices = forward_fill(prices)
+    weights = target_weights(close, signals, scheme, vol_lookback).to_numpy()
+    n = len(prices)
+    dates = rebalance_dates(close.index, rebalance)
+
+    # Growth of each bar's portfolio since the last rebalance before it:
+    # cash weight plus the held weights times each name's price relative
+    segment = np.searchsorted(dates, np.arange(n), side='left') - 1
+    segment[0] = 0
+    start = dates[segment]
+    held = weights[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relative = np.where(held > 0, prices / prices[start], 0.0)
+    growth = 1.0 - held.sum(axis=1) + (held * relative).sum(axis=1)
+    growth[0] = 1.0
+
+    # Turnover at each rebalance: from the drifted weights to the new targets
+    drifted = np.zeros_like(weights[dates])
+    drifted[1:] = held[dates[1:]] * relative[dates[1:]] / growth[dates[1:], None]
+    turnover = np.abs(weights[dates] - drifted).sum(axis=1)
+    cost = turnover * cost_bps / 1e4
+
+    # Equity after each rebalance, compounded over the (few) rebalance dates
+    after = np.cumprod(growth[dates] * (1.0 - cost))
+    equity = after[segment] * growth
+    equity[dates] = after
+
+    turnover_col = np.zeros(n)
+    turnover_col[dates] = turnover
+    cost_col = np.zeros(n)
+    cost_col[dates] = cost
+
+    both = listed[1:] & listed[:-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        market = np.where(both, prices[1:] / prices[:-1] - 1.0, 0.0).sum(axis=1) / both.sum(axis=1)
+    benchmark = np.concatenate(([0.0], np.nan_to_num(market)))
+
+    df = pd.DataFrame(index=close.index)
+    df['Equity_Curve'] = equity * initial_capital
+    df['Strategy_Returns'] = df['Equity_Curve'].pct_change()
+    df['Peak'] = df['Equity_Curve'].cummax()
+    df['Drawdown'] = (df['Equity_Curve'] - df['Peak']) / df['Peak']
+    df['Turnover'] = turnover_col
+    df['Cost'] = cost_col
+    df['Benchmark'] = np.cumprod(1.0 + benchmark) * initial_capital
+    return df
+
+def portfolio_metrics(results: pd.DataFrame, risk_free_rate: float = 0.0) -> dict:
+    """
+    `compute_metrics` for a `run_portfolio` result (Market Return is the
+    equal-weight benchmark's) plus annualized turnover and total costs paid.
+    """
+    metrics = compute_metrics(results.assign(Close=results['Benchmark']), risk_free_rate)
+    years = len(results) / periods_per_year(results.index)
+    metrics["Annual Turnover"] = float(results['Turnover'].sum() / years) if years else 0.0
+    metrics["Total Costs"] = float(results['Cost'].sum())
+    return metrics
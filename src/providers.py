@@ -0,0 +1,146 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bar providers and concurrent bulk fetching. A provider is any callable
+# `provider(symbol, start, end, interval) -> DataFrame` returning bars for
+# [start, end), as `OHLCVStore` expects; it may also be an async function.
+# `stream_fetch` fans a symbol list out over a bounded number of concurrent
+# requests (blocking providers run in worker threads), paces them with a
+# token-bucket rate limit, retries failures with exponential backoff and
+# yields each symbol's frame as soon as it arrives.
+
+class LocalFileProvider:
+    """
+    Serves bars from one file per symbol under `root` (`<symbol>.csv`, with
+    the timestamp in the first column, or `<symbol>.parquet`), so the fetch
+    path can run and be benchmarked offline. `latency` seconds are slept per
+    request to stand in for a network round trip.
+    """
+
+    def __init__(self, root: str, fmt: str = "csv", latency: float = 0.0):
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported file format: {fmt}")
+        self.root = root
+        self.fmt = fmt
+        self.latency = latency
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.replace(os.sep, '_')}.{self.fmt}")
+
+    def save(self, symbol: str, df: pd.DataFrame):
+        """Writes a symbol's bars, e.g. to record a universe for offline runs."""
+        os.makedirs(self.root, exist_ok=True)
+        if self.fmt == "csv":
+            df.to_csv(self.path(symbol))
+        else:
+            df.to_parquet(self.path(symbol))
+
+    def __call__(self, symbol: str, start, end, interval: str = "1d") -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        path = self.path(symbol)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        if self.fmt == "csv":
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+        else:
+            df = pd.read_parquet(path)
+        return df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+
+class RateLimiter:
+    """Async token bucket: at most `rate` acquisitions per second, in bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+async def _fetch_one(symbol, start, end, interval, get, executor, limiter, semaphore, retries, backoff):
+    async with semaphore:
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                if inspect.iscoroutinefunction(get):
+                    return symbol, await get(symbol, start, end, interval)
+                call = functools.partial(get, symbol, start, end, interval)
+                return symbol, await asyncio.get_running_loop().run_in_executor(executor, call)
+            except Exception as e:
+                if attempt == retries:
+                    logger.error(f"Fetching {symbol} failed after {retries + 1} attempts: {e}")
+                    return symbol, e
+                # Exponential backoff with jitter so retries from many symbols don't line up
+                delay = backoff * 2 ** attempt * (0.5 + random.random())
+                logger.warning(f"Fetching {symbol} failed ({e}); retrying in {delay:.2f} s")
+                await asyncio.sleep(delay)
+
+async def stream_fetch(symbols, start, end, provider, interval: str = "1d", max_concurrency: int = 8,
+                       rate: float = None, burst: int = 1, retries: int = 3, backoff: float = 0.5, store=None):
+    """
+    Fetches every symbol and yields `(symbol, frame)` pairs in completion
+    order; after `retries` failed retries the second item is the exception
+    instead. At most `max_concurrency` requests are in flight and, with
+    `rate`, at most `rate` requests start per second. With an `OHLCVStore`
+    as `store`, bars are read through it, so cached ranges are served from
+    disk and only missing ones reach the provider.
+    """
+    if store is not None:
+        def get(symbol, start, end, interval):
+            return store.get(symbol, start, end, interval)
+    else:
+        get = provider
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(rate, burst) if rate else None
+    # Blocking providers run in a thread pool as wide as the fan-out
+    executor = None if inspect.iscoroutinefunction(get) else ThreadPoolExecutor(max_workers=max_concurrency)
+    tasks = [asyncio.create_task(_fetch_one(symbol, start, end, interval, get, executor, limiter, semaphore,
+                                            retries, backoff))
+             for symbol in dict.fromkeys(symbols)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_universe(symbols, start, end, provider, **kwargs) -> tuple:
+    """
+    Blocking wrapper around `stream_fetch`: returns `(frames, errors)`, dicts
+    of symbol -> DataFrame and symbol -> exception. Symbols with no bars in
+    the range are left out of both.
+    """
+    async def collect():
+        frames, errors = {}, {}
+        async for symbol, result in stream_fetch(symbols, start, end, provider, **kwargs):
+            if isinstance(result, Exception):
+                errors[symbol] = result
+            elif result is not None and not result.empty:
+                frames[symbol] = result
+        return frames, errors
+
+    return asyncio.run(collect())
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.bars import periods_per_year
+from src.metrics import RunningMetrics
+from src.moomoo import LocalTradeSimulator
+from src.streaming import create_stream
+
+logger = logging.getLogger(__name__)
+
+# Offline rehearsal of the live path: recorded bars are released on their own
+# clock (scaled by `speed`) by a feed task, and a strategy task takes each bar
+# off a queue, updates the streaming signal and sends any resulting order to
+# the simulator. Two clocks are kept per bar: decision latency (strategy task
+# picks the bar up -> signal updated and any order placed) and lag (feed
+# releases the bar -> decision done), which adds queueing and event-loop
+# wake-up delay, as against a live feed.
+
+def read_bars(path: str) -> pd.DataFrame:
+    """Loads a recorded bar file (.csv with the timestamp in the first column, or .parquet)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+    if ext in (".parquet", ".pq"):
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported bar file: {path}")
+
+async def _feed(queue, times, count, speed):
+    """Puts bar positions on the queue with their release time, pacing them by `speed` (None = no pacing)."""
+    clock = time.perf_counter_ns
+    start = clock()
+    for i in range(count):
+        if speed:
+            due = start + (times[i] - times[0]) / speed
+            delay = (due - clock()) / 1e9
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await queue.put((i, clock()))
+        if not speed and i % 256 == 255:
+            # Unpaced: still let the strategy task run between bursts
+            await asyncio.sleep(0)
+    await queue.put(None)
+
+async def replay(bars, strategy_type: str, params: dict, symbol: str = "REPLAY", speed: float = None,
+                 qty: float = 1, portfolio: dict = None, simulator: LocalTradeSimulator = None,
+                 queue_size: int = 1024) -> dict:
+    """
+    Replays `bars` (a DataFrame or a path for `read_bars`) through
+    `create_stream(strategy_type, params)` and `simulator.place_order`:
+    a buy of `qty` when the Signal turns on, a sell when it turns off, at
+    the bar's Close.
+
+    `speed` scales the recorded bar spacing: 1.0 is real time, 60 replays a
+    minute of bars per second, and None replays as fast as possible.
+
+    Returns a dict with "bars", "orders", "filled", "seconds",
+    "bars_per_second", decision latency percentiles in microseconds
+    ("p50_us", "p99_us", "max_us"), lag percentiles ("lag_p50_us",
+    "lag_p99_us"), the final "portfolio" and "metrics", the `compute_metrics`
+    figures of the Signal kept current bar by bar with `RunningMetrics`.
+    """
+    if isinstance(bars, (str, os.PathLike)):
+        bars = read_bars(bars)
+    if portfolio is None:
+        portfolio = {"cash": 100000.0, "positions": {}, "history": []}
+    simulator = simulator or LocalTradeSimulator()
+    stream = create_stream(strategy_type, params)
+    running = RunningMetrics(periods_per_year=periods_per_year(bars.index))
+
+    columns = [c for c in ('Close', 'High', 'Low') if c in bars]
+    records = bars[columns].to_dict('records')
+    times = pd.DatetimeIndex(bars.index).as_unit('ns').asi8 if isinstance(bars.index, pd.DatetimeIndex) \
+        else np.arange(len(bars), dtype=np.int64) * 1_000_000_000
+    latency = np.empty(len(records), dtype=np.int64)
+    lag = np.empty(len(records), dtype=np.int64)
+    clock = time.perf_counter_ns
+    orders = filled = 0
+
+    queue = asyncio.Queue(maxsize=queue_size)
+    start = time.perf_counter()
+    feed = asyncio.create_task(_feed(queue, times, len(records), speed))
+    while (item := await queue.get()) is not None:
+        i, released = item
+        picked = clock()
+        bar = records[i]
+        stream.update(bar)
+        change = stream.position
+        if change == 1 or change == -1:
+            orders += 1
+            ok, _ = simulator.place_order(portfolio, symbol, qty, "BUY" if change > 0 else "SELL", bar['Close'])
+            filled += ok
+        done = clock()
+        latency[i] = done - picked
+        lag[i] = done - released
+        running.update(bar['Close'], stream.signal)
+    await feed
+    elapsed = time.perf_counter() - start
+
+    p50, p99, worst = np.percentile(latency, [50, 99, 100]) / 1e3 if len(latency) else (0.0, 0.0, 0.0)
+    lag_p50, lag_p99 = np.percentile(lag, [50, 99]) / 1e3 if len(lag) else (0.0, 0.0)
+    logger.info(f"Replayed {len(records)} bars in {elapsed:.2f} s: p50 {p50:.1f} us, p99 {p99:.1f} us")
+    return {
+        "bars": len(records),
+        "orders": orders,
+        "filled": filled,
+        "seconds": elapsed,
+        "bars_per_second": len(records) / elapsed if elapsed else float('inf'),
+        "p50_us": float(p50),
+        "p99_us": float(p99),
+        "max_us": float(worst),
+        "lag_p50_us": float(lag_p50),
+        "lag_p99_us": float(lag_p99),
+        "portfolio": portfolio,
+        "metrics": running.result() if records else {},
+    }
+
+def run_replay(bars, strategy_type: str, params: dict, **kwargs) -> dict:
+    """Synchronous entry point for `replay` (starts its own event loop)."""
+    return asyncio.run(replay(bars, strategy_type, params, **kwargs))
@@ -0,0 +1,129 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.bars import periods_per_year
+
+# Monte Carlo robustness checks for a `run_backtest` result. Alternative
+# return paths are resampled from its Strategy_Returns, a chunk of paths at a
+# time as a (bars x paths) array, and the `calculate_metrics` statistics are
+# computed column-wise over each chunk, so memory stays bounded by
+# `chunk_size` however many paths are drawn.
+
+PATH_METRICS = ["Total Return", "Annualized Return", "Annualized Volatility", "Sharpe Ratio", "Max Drawdown"]
+
+def path_metrics(returns: np.ndarray, risk_free_rate: float = 0.0, periods: float = 252) -> dict:
+    """
+    `compute_metrics` statistics for every column of a (bars x paths) array
+    of per-bar returns (the backtest's first bar, which has no return, excluded).
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volatility = returns.std(axis=0, ddof=1) * np.sqrt(periods)
+    # Two scratch arrays: growth, then the running peak reused for growth / peak
+    growth = returns + 1.0
+    np.cumprod(growth, axis=0, out=growth)
+    total_return = growth[-1] - 1.0 if len(growth) else np.zeros(returns.shape[1])
+    annual_return = (1 + total_return) ** (periods / (len(returns) + 1)) - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe_ratio = np.where(volatility != 0, (annual_return - risk_free_rate) / volatility, 0.0)
+    peak = np.maximum.accumulate(growth, axis=0)
+    np.maximum(peak, 1.0, out=peak)
+    np.divide(growth, peak, out=peak)
+    max_drawdown = peak.min(axis=0, initial=1.0) - 1.0
+    return {
+        "Total Return": total_return,
+        "Annualized Return": annual_return,
+        "Annualized Volatility": volatility,
+        "Sharpe Ratio": sharpe_ratio,
+        "Max Drawdown": max_drawdown,
+    }
+
+def block_bootstrap(n: int, paths: int, block_size: int, rng) -> np.ndarray:
+    """
+    (n x paths) indices of a circular block bootstrap: each path strings
+    together blocks of `block_size` consecutive bars from random starts,
+    which keeps short-range autocorrelation and volatility clustering.
+    """
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_blocks, 1, paths))
+    idx = (starts + np.arange(block_size)[None, :, None]) % n
+    return idx.reshape(n_blocks * block_size, paths)[:n]
+
+def trade_segments(position: np.ndarray) -> np.ndarray:
+    """
+    Start positions of the segments that shuffling keeps intact: each trade
+    (a run of bars held in the market) together with the flat bars after it.
+    """
+    position = np.nan_to_num(np.asarray(position, dtype=np.float64))
+    entries = np.flatnonzero((position[1:] != 0) & (position[:-1] == 0)) + 1
+    return np.unique(np.concatenate(([0], entries)))
+
+def shuffle_trades(starts: np.ndarray, n: int, paths: int, rng) -> np.ndarray:
+    """
+    (n x paths) indices that replay the segments beginning at `starts` in a
+    random order per path. Every path has the same bar returns, so total
+    return and volatility are unchanged; drawdowns depend on the order.
+    """
+    lengths = np.diff(np.append(starts, n))
+    order = np.argsort(rng.random((paths, len(starts))), axis=1).ravel()
+    seg_lengths = lengths[order]
+    # Output position at which each placed segment begins, per path
+    seg_out = np.cumsum(seg_lengths) - seg_lengths
+    seg_out -= np.repeat(np.arange(paths) * n, len(starts))
+    seg = np.repeat(order, seg_lengths)
+    within = np.tile(np.arange(n), paths) - np.repeat(seg_out, seg_lengths)
+    return (starts[seg] + within).reshape(paths, n).T
+
+def monte_carlo(results: pd.DataFrame, n_paths: int = 10_000, method: str = "block", block_size: int = 20,
+                chunk_size: int = 250, confidence: float = 0.95, risk_free_rate: float = 0.0,
+                seed: int = None) -> dict:
+    """
+    Resamples the Strategy_Returns of a `run_backtest` frame into `n_paths`
+    alternative histories and reports how the metrics are distributed.
+
+    `method` is "block" (circular block bootstrap of bar returns) or
+    "shuffle" (the trades, each with the flat stretch after it, replayed in
+    random order). Returns a dict with "paths" (one row of metrics per path),
+    "summary" (the original value, mean, standard deviation and
+    `confidence` interval per metric) and "paths_per_second".
+    """
+    returns = results['Strategy_Returns'].to_numpy(dtype=np.float64)[1:]
+    returns = np.nan_to_num(returns)
+    n = len(returns)
+    if n < 2:
+        raise ValueError("Need at least three bars of backtest results")
+    periods = periods_per_year(results.index)
+    rng = np.random.default_rng(seed)
+    if method == "shuffle":
+        position = results['Signal'].shift(1).to_numpy()[1:]
+        starts = trade_segments(position)
+    elif method != "block":
+        raise ValueError(f"Unknown resampling method: {method}")
+
+    start = time.perf_counter()
+    chunks = []
+    for done in range(0, n_paths, chunk_size):
+        paths = min(chunk_size, n_paths - done)
+        if method == "block":
+            idx = block_bootstrap(n, paths, block_size, rng)
+        else:
+            idx = shuffle_trades(starts, n, paths, rng)
+        chunks.append(path_metrics(returns[idx], risk_free_rate, periods))
+    elapsed = time.perf_counter() - start
+
+    paths = pd.DataFrame({k: np.concatenate([c[k] for c in chunks]) for k in PATH_METRICS})
+    original = {k: float(v[0]) for k, v in path_metrics(returns, risk_free_rate, periods).items()}
+    tail = (1 - confidence) / 2
+    summary = pd.DataFrame({
+        "Original": pd.Series(original),
+        "Mean": paths.mean(),
+        "Std": paths.std(),
+        f"Lower {confidence:.0%}": paths.quantile(tail),
+        "Median": paths.median(),
+        f"Upper {confidence:.0%}": paths.quantile(1 - tail),
+    }).loc[PATH_METRICS]
+    return {"paths": paths, "summary": summary, "paths_per_second": n_paths / elapsed if elapsed else float('inf')}
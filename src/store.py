@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class StoreStats:
+    """Counters for cache effectiveness."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return f"StoreStats({', '.join(f'{k}={v}' for k, v in vars(self).items())})"
+
+class OHLCVStore:
+    """
+    Persistent columnar cache of OHLCV bars, keyed by symbol and bar size.
+
+    Each (interval, symbol) pair is a directory of memory-mapped `.npy` column
+    files plus a `meta.json` recording the contiguous date range already
+    requested from the provider. A request only calls the provider for the
+    missing leading/trailing part of its range; repeat requests are served
+    from disk. A past range that comes back empty (a weekend or holiday
+    tail, dates before a listing) is covered like any other, so it is not
+    asked for again; a provider error covers nothing. Coverage never extends
+    past the last bar received for ranges that end after today, so later
+    bars are fetched when they exist.
+
+    `provider(symbol, start, end, interval)` must return a DataFrame indexed by
+    timestamp for the half-open range [start, end), possibly empty, and raise
+    when the download fails.
+    """
+
+    def __init__(self, root: str, provider):
+        self.root = root
+        self.provider = provider
+        self.stats = StoreStats()
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.replace(os.sep, "_"))
+
+    def _read_meta(self, path: str):
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def get(self, symbol: str, start, end, interval: str = "1d") -> pd.DataFrame:
+        """
+        Returns bars for [start, end), fetching only the ranges not yet on disk.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        path = self._path(symbol, interval)
+        meta = self._read_meta(path)
+
+        missing = []
+        if meta is None:
+            missing.append((start, end))
+        else:
+            covered_start, covered_end = pd.Timestamp(meta['start']), pd.Timestamp(meta['end'])
+            # Extending to the covered edge keeps the covered range contiguous
+            if start < covered_start:
+                missing.append((start, covered_start))
+            if end > covered_end:
+                missing.append((max(covered_end, start), end))
+
+        if missing:
+            self.stats.misses += 1
+            fetched = []
+            for lo, hi in missing:
+                logger.info(f"Store miss for {symbol} ({interval}): fetching {lo.date()} to {hi.date()}")
+                self.stats.fetches += 1
+                frame = self.provider(symbol, lo.strftime('%Y-%m-%d'), hi.strftime('%Y-%m-%d'), interval)
+                if frame is None or frame.empty:
+                    logger.info(f"No bars for {symbol} ({interval}) from {lo.date()} to {hi.date()}")
+                    if hi > pd.Timestamp.today().normalize():
+                        # Bars for a range still under way may yet arrive
+                        continue
+                    frame = pd.DataFrame()
+                fetched.append((lo, _covered_until(frame, hi), frame))
+            if fetched:
+                meta = self._merge(path, meta, fetched)
+        else:
+            self.stats.hits += 1
+
+        return self._read(path, meta, start, end)
+
+    def load(self, symbol: str, interval: str = "1d"):
+        """
+        Returns (index, {column: array}) for everything stored, memory-mapped
+        read-only, or None if the symbol has not been cached yet.
+        """
+        path = self._path(symbol, interval)
+        meta = self._read_meta(path)
+        if meta is None:
+            return None
+        index = np.load(os.path.join(path, "index.npy"), mmap_mode='r')
+        columns = {col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r') for col in meta['columns']}
+        return index, columns
+
+    def meta(self, symbol: str, interval: str = "1d"):
+        """The stored `meta.json` (columns, tz, covered range, rows) or None."""
+        return self._read_meta(self._path(symbol, interval))
+
+    def clear(self, symbol: str = None, interval: str = "1d"):
+        """Removes one symbol's cached bars, or the whole store."""
+        target = self.root if symbol is None else self._path(symbol, interval)
+        shutil.rmtree(target, ignore_errors=True)
+
+    def _read(self, path: str, meta: dict, start=None, end=None, count: bool = True) -> pd.DataFrame:
+        if meta is None or not meta['columns']:
+            return pd.DataFrame()
+        tz = meta.get('tz')
+        index = np.load(os.path.join(path, "index.npy"), mmap_mode='r')
+        lo = 0 if start is None else np.searchsorted(index, _to_int(start, tz), side='left')
+        hi = len(index) if end is None else np.searchsorted(index, _to_int(end, tz), side='left')
+
+        idx = np.array(index[lo:hi])
+        data = {}
+        for col in meta['columns']:
+            values = np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r')
+            data[col] = np.array(values[lo:hi])
+        if count:
+            self.stats.bytes_read += idx.nbytes + sum(v.nbytes for v in data.values())
+
+        dates = pd.DatetimeIndex(idx.astype('datetime64[ns]'), name=meta.get('index_name') or 'Date')
+        if tz:
+            dates = dates.tz_localize('UTC').tz_convert(tz)
+        return pd.DataFrame(data, index=dates)
+
+    def _merge(self, path: str, meta, fetched) -> dict:
+        """Stores the `fetched` (lo, covered end, frame) ranges next to the existing bars."""
+        frames = [frame for _, _, frame in fetched if not frame.empty]
+        existing = self._read(path, meta, count=False) if meta else None
+        if existing is not None and not existing.empty:
+            frames.insert(0, existing)
+        if frames:
+            merged = pd.concat(frames)
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = pd.DataFrame()
+
+        # Every fetched range touches the covered one, so the union stays contiguous
+        bounds = [(lo, hi) for lo, hi, _ in fetched]
+        if meta is not None:
+            bounds.append((pd.Timestamp(meta['start']), pd.Timestamp(meta['end'])))
+        covered_start = min(lo for lo, _ in bounds)
+        covered_end = max(hi for _, hi in bounds)
+        return self._write(path, merged, covered_start, covered_end)
+
+    def _write(self, path: str, df: pd.DataFrame, covered_start, covered_end) -> dict:
+        os.makedirs(path, exist_ok=True)
+        tz = None
+        if not df.empty:
+            index = pd.DatetimeIndex(df.index)
+            if index.tz is not None:
+                tz = str(index.tz)
+                index = index.tz_convert('UTC').tz_localize(None)
+            arrays = {"index": index.as_unit('ns').asi8}
+            for col in df.columns:
+                arrays[col] = df[col].to_numpy(dtype=np.float64)
+            for name, values in arrays.items():
+                tmp = os.path.join(path, f"{name}.tmp.npy")
+                np.save(tmp, values)
+                os.replace(tmp, os.path.join(path, f"{name}.npy"))
+                self.stats.bytes_written += values.nbytes
+
+        meta = {
+            "columns": [] if df.empty else [str(c) for c in df.columns],
+            "tz": tz,
+            "index_name": df.index.name,
+            "start": covered_start.isoformat(),
+            "end": covered_end.isoformat(),
+            "rows": len(df),
+        }
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+        return meta
+
+def _covered_until(frame: pd.DataFrame, end: pd.Timestamp) -> pd.Timestamp:
+    """
+    How far a fetch for [.., end) counts as covered: all of it when the range
+    is already over, else only up to the last bar received (so that bar, which
+    may still be forming, and any later ones are fetched next time).
+    """
+    if end <= pd.Timestamp.today().normalize():
+        return end
+    last = pd.DatetimeIndex(frame.index).max()
+    if last.tzinfo is not None:
+        last = last.tz_localize(None)
+    return min(end, last)
+
+def _to_int(ts, tz) -> int:
+    """Converts a request bound to the int64 nanosecond scale used on disk."""
+    if tz:
+        ts = (ts.tz_localize(tz) if ts.tzinfo is None else ts).tz_convert('UTC').tz_localize(None)
+    return ts.as_unit('ns').value
@@ -1,51 +1,88 @@
 import pandas as pd
 import numpy as np
 
-def calculate_rsi(series, period=14):
+# Storage dtype of compact-mode frames (see `calculate_signals(compact=True)`)
+COMPACT_DTYPE = np.float32
+
+# Columns the strategies add for charting only; compact mode drops them
+PLOT_COLUMNS = ('Short_MA', 'Long_MA', 'MA', 'STD', 'Upper_Band', 'Lower_Band', 'RSI', 'MACD', 'MACD_Signal',
+                '%K', '%D')
+
+def _cached(cache, key, compute):
+    """Looks up a shared indicator primitive in `cache` when one is given."""
+    return compute() if cache is None else cache.get_or_compute(key, compute)
+
+def calculate_rsi(series, period=14, cache=None):
     """Calculates the Relative Strength Index."""
-    delta = series.diff()
+    delta = _cached(cache, ('diff', series.name), series.diff)
     gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
     loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
     rs = gain / loss
     return 100 - (100 / (1 + rs))
 
-def calculate_sma_crossover(df, short_window, long_window):
-    df['Short_MA'] = df['Close'].rolling(window=short_window, min_periods=1).mean()
-    df['Long_MA'] = df['Close'].rolling(window=long_window, min_periods=1).mean()
+def latch_signal(enter, exit_, initial=None):
+    """
+    Vectorized hysteresis latch: 1 where `enter` is true, 0 where `exit_` is
+    true (entry wins when both fire), otherwise the previous value is held.
+    The first bar is always flat, unless `initial` (the state before the first
+    bar, e.g. carried over from a previous chunk) is given. Works on 1D arrays
+    or column-wise on 2D (bars x columns) arrays.
+    """
+    enter = np.asarray(enter, dtype=bool)
+    exit_ = np.asarray(exit_, dtype=bool)
+    if len(enter) == 0:
+        return np.zeros(enter.shape)
+    state = np.where(enter, 1.0, 0.0)
+    changed = enter | exit_
+    if initial is None:
+        state[0] = 0.0
+    else:
+        state[0] = np.where(changed[0], state[0], initial)
+    changed[0] = True
+    # Index of the last bar that set the state, carried forward
+    rows = np.arange(len(enter)).reshape((-1,) + (1,) * (enter.ndim - 1))
+    last = np.where(changed, rows, 0)
+    np.maximum.accumulate(last, axis=0, out=last)
+    return np.take_along_axis(state, last, axis=0)
+
+def calculate_sma_crossover(df, short_window, long_window, cache=None):
+    df['Short_MA'] = _cached(cache, ('rolling_mean', 'Close', short_window, 1),
+                             lambda: df['Close'].rolling(window=short_window, min_periods=1).mean())
+    df['Long_MA'] = _cached(cache, ('rolling_mean', 'Close', long_window, 1),
+                            lambda: df['Close'].rolling(window=long_window, min_periods=1).mean())
     df['Signal'] = np.where(df['Short_MA'] > df['Long_MA'], 1.0, 0.0)
     return df
 
-def calculate_ema_crossover(df, short_window, long_window):
-    df['Short_MA'] = df['Close'].ewm(span=short_window, adjust=False).mean()
-    df['Long_MA'] = df['Close'].ewm(span=long_window, adjust=False).mean()
+def calculate_ema_crossover(df, short_window, long_window, cache=None):
+    df['Short_MA'] = _cached(cache, ('ewm_mean', 'Close', short_window),
+                             lambda: df['Close'].ewm(span=short_window, adjust=False).mean())
+    df['Long_MA'] = _cached(cache, ('ewm_mean', 'Close', long_window),
+                            lambda: df['Close'].ewm(span=long_window, adjust=False).mean())
     df['Signal'] = np.where(df['Short_MA'] > df['Long_MA'], 1.0, 0.0)
     return df
 
-def calculate_sma_long_only(df, window):
-    df['Long_MA'] = df['Close'].rolling(window=window, min_periods=1).mean()
+def calculate_sma_long_only(df, window, cache=None):
+    df['Long_MA'] = _cached(cache, ('rolling_mean', 'Close', window, 1),
+                            lambda: df['Close'].rolling(window=window, min_periods=1).mean())
     df['Short_MA'] = df['Close'] # For plotting price as "short" line
     df['Signal'] = np.where(df['Close'] > df['Long_MA'], 1.0, 0.0)
     return df
 
-def calculate_rsi_strategy(df, period, overbought, oversold):
-    df['RSI'] = calculate_rsi(df['Close'], period)
+def calculate_rsi_strategy(df, period, overbought, oversold, cache=None):
+    df['RSI'] = _cached(cache, ('rsi', 'Close', period), lambda: calculate_rsi(df['Close'], period, cache))
     df['Short_MA'] = df['Close'] # Plotting
     df['Long_MA'] = df['Close'] # Plotting
     
     # 1 if RSI < oversold (Buy), 0 if RSI > overbought (Sell), else stay
-    df['Signal'] = 0.0
-    for i in range(1, len(df)):
-        if df['RSI'].iloc[i] < oversold:
-            df.loc[df.index[i], 'Signal'] = 1.0
-        elif df['RSI'].iloc[i] > overbought:
-            df.loc[df.index[i], 'Signal'] = 0.0
-        else:
-            df.loc[df.index[i], 'Signal'] = df['Signal'].iloc[i-1]
+    rsi = df['RSI'].to_numpy()
+    df['Signal'] = latch_signal(rsi < oversold, rsi > overbought)
     return df
 
-def calculate_bollinger_bands(df, window, num_std):
-    df['MA'] = df['Close'].rolling(window=window).mean()
-    df['STD'] = df['Close'].rolling(window=window).std()
+def calculate_bollinger_bands(df, window, num_std, cache=None):
+    df['MA'] = _cached(cache, ('rolling_mean', 'Close', window, None),
+                       lambda: df['Close'].rolling(window=window).mean())
+    df['STD'] = _cached(cache, ('rolling_std', 'Close', window),
+                        lambda: df['Close'].rolling(window=window).std())
     df['Upper_Band'] = df['MA'] + (num_std * df['STD'])
     df['Lower_Band'] = df['MA'] - (num_std * df['STD'])
     
@@ -53,19 +90,13 @@ def calculate_bollinger_bands(df, window, num_std):
     df['Long_MA'] = df['Lower_Band'] # For plotting context
     
     # Signal = 1 if close crosses above lower band, 0 if close crosses below upper band
-    df['Signal'] = 0.0
-    for i in range(1, len(df)):
-        if df['Close'].iloc[i] < df['Lower_Band'].iloc[i]:
-            df.loc[df.index[i], 'Signal'] = 1.0
-        elif df['Close'].iloc[i] > df['Upper_Band'].iloc[i]:
-            df.loc[df.index[i], 'Signal'] = 0.0
-        else:
-            df.loc[df.index[i], 'Signal'] = df['Signal'].iloc[i-1]
+    close = df['Close'].to_numpy()
+    df['Signal'] = latch_signal(close < df['Lower_Band'].to_numpy(), close > df['Upper_Band'].to_numpy())
     return df
 
-def calculate_macd(df, fast=12, slow=26, signal=9):
-    fast_ema = df['Close'].ewm(span=fast, adjust=False).mean()
-    slow_ema = df['Close'].ewm(span=slow, adjust=False).mean()
+def calculate_macd(df, fast=12, slow=26, signal=9, cache=None):
+    fast_ema = _cached(cache, ('ewm_mean', 'Close', fast), lambda: df['Close'].ewm(span=fast, adjust=False).mean())
+    slow_ema = _cached(cache, ('ewm_mean', 'Close', slow), lambda: df['Close'].ewm(span=slow, adjust=False).mean())
     df['MACD'] = fast_ema - slow_ema
     df['MACD_Signal'] = df['MACD'].ewm(span=signal, adjust=False).mean()
     
@@ -76,9 +107,9 @@ def calculate_macd(df, fast=12, slow=26, signal=9):
     df['Signal'] = np.where(df['MACD'] > df['MACD_Signal'], 1.0, 0.0)
     return df
 
-def calculate_stochastic(df, k_period=14, d_period=3, overbought=80, oversold=20):
-    low_min = df['Low'].rolling(window=k_period).min()
-    high_max = df['High'].rolling(window=k_period).max()
+def calculate_stochastic(df, k_period=14, d_period=3, overbought=80, oversold=20, cache=None):
+    low_min = _cached(cache, ('rolling_min', 'Low', k_period), lambda: df['Low'].rolling(window=k_period).min())
+    high_max = _cached(cache, ('rolling_max', 'High', k_period), lambda: df['High'].rolling(window=k_period).max())
     df['%K'] = 100 * ((df['Close'] - low_min) / (high_max - low_min))
     df['%D'] = df['%K'].rolling(window=d_period).mean()
     
@@ -86,38 +117,53 @@ def calculate_stochastic(df, k_period=14, d_period=3, overbought=80, oversold=20
     df['Short_MA'] = df['%K']
     df['Long_MA'] = df['%D']
     
-    df['Signal'] = 0.0
-    for i in range(1, len(df)):
-        if df['%K'].iloc[i] < oversold:
-            df.loc[df.index[i], 'Signal'] = 1.0
-        elif df['%K'].iloc[i] > overbought:
-            df.loc[df.index[i], 'Signal'] = 0.0
-        else:
-            df.loc[df.index[i], 'Signal'] = df['Signal'].iloc[i-1]
+    k = df['%K'].to_numpy()
+    df['Signal'] = latch_signal(k < oversold, k > overbought)
     return df
 
-def calculate_signals(data, strategy_type, params):
+def calculate_signals(data, strategy_type, params, cache=None, compact=False):
     """
     Main entry point for calculating signals based on strategy type.
+
+    An `IndicatorCache` built for `data` may be passed to share indicator
+    primitives (moving averages, EMAs, price deltas, ...) across calls.
+
+    With `compact=True` the input is not copied and the result keeps only
+    Close/High/Low, Volume (for slippage costs), Signal and Position, stored
+    as float32 (indicators are still computed in float64, so the Signal is
+    identical). The plotting columns can be rebuilt on demand with
+    `src.compact.with_plot_columns`.
     """
-    df = data.copy()
+    if cache is not None and not cache.matches(data):
+        raise ValueError("Indicator cache was built for a different dataset")
+    if compact:
+        # A frame over the input's own column arrays: `data[[...]]` would copy them (on pandas 2
+        # and 3 alike), and the strategies only add columns, never write to these
+        df = pd.DataFrame({c: data[c] for c in ('Close', 'High', 'Low', 'Volume') if c in data}, copy=False)
+    else:
+        df = data.copy()
     
     if strategy_type == "SMA Crossover":
-        df = calculate_sma_crossover(df, params['short_window'], params['long_window'])
+        df = calculate_sma_crossover(df, params['short_window'], params['long_window'], cache)
     elif strategy_type == "EMA Crossover":
-        df = calculate_ema_crossover(df, params['short_window'], params['long_window'])
+        df = calculate_ema_crossover(df, params['short_window'], params['long_window'], cache)
     elif strategy_type == "SMA Long Only":
-        df = calculate_sma_long_only(df, params['window'])
+        df = calculate_sma_long_only(df, params['window'], cache)
     elif strategy_type == "RSI Strategy":
-        df = calculate_rsi_strategy(df, params['period'], params['overbought'], params['oversold'])
+        df = calculate_rsi_strategy(df, params['period'], params['overbought'], params['oversold'], cache)
     elif strategy_type == "Bollinger Bands":
-        df = calculate_bollinger_bands(df, params['window'], params['num_std'])
+        df = calculate_bollinger_bands(df, params['window'], params['num_std'], cache)
     elif strategy_type == "MACD Crossover":
-        df = calculate_macd(df, params['fast'], params['slow'], params['signal'])
+        df = calculate_macd(df, params['fast'], params['slow'], params['signal'], cache)
     elif strategy_type == "Stochastic Oscillator":
-        df = calculate_stochastic(df, params['k_period'], params['d_period'], params['overbought'], params['oversold'])
+        df = calculate_stochastic(df, params['k_period'], params['d_period'], params['overbought'], params['oversold'], cache)
     
     # Generate trading orders (1 = Buy, -1 = Sell) for the simulator
     df['Position'] = df['Signal'].diff()
-    
+
+    if compact:
+        # Straight to float32 column by column, with no intermediate frame (a drop copies on pandas 2)
+        df = pd.DataFrame({c: df[c].to_numpy(dtype=COMPACT_DTYPE) for c in df if c not in PLOT_COLUMNS},
+                          index=df.index, copy=False)
+        df.attrs.update(strategy=strategy_type, params=dict(params))
     return df
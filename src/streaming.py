@@ -0,0 +1,301 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from src.strategy import calculate_signals
+
+# Incremental (one bar at a time) versions of the indicators and signal rules
+# in `src/strategy.py`. Every update is O(1) time and each object holds at most
+# one window of values, so a live feed can produce the new Signal per bar
+# without recomputing history.
+
+class RollingMean:
+    """Rolling mean with pandas' `min_periods` and NaN semantics."""
+
+    def __init__(self, window: int, min_periods: int = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque()
+        self.count = 0
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def _add(self, x):
+        # Kahan summation keeps the running sum from drifting over long feeds
+        y = x - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        if not math.isnan(x):
+            self.count += 1
+            self._add(x)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.count -= 1
+                self._add(-old)
+        if self.count == 0:
+            self.total = self.compensation = 0.0
+        if self.count < max(self.min_periods, 1):
+            return math.nan
+        return self.total / self.count
+
+class RollingStd:
+    """Rolling sample standard deviation (ddof=1) via add/remove Welford updates."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.count = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        if not math.isnan(x):
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.ssqdm += delta * (x - self.mean)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.count -= 1
+                if self.count:
+                    delta = old - self.mean
+                    self.mean -= delta / self.count
+                    self.ssqdm -= delta * (old - self.mean)
+                else:
+                    self.mean = self.ssqdm = 0.0
+        if self.count < max(self.window, 2):
+            return math.nan
+        return math.sqrt(max(self.ssqdm, 0.0) / (self.count - 1))
+
+class RollingExtreme:
+    """Rolling min or max over a monotonic deque; NaN until the window is full."""
+
+    def __init__(self, window: int, mode: str = "min"):
+        self.window = window
+        self.better = (lambda a, b: a <= b) if mode == "min" else (lambda a, b: a >= b)
+        self.candidates = deque()  # (bar number, value), monotonic in value
+        self.bars = 0
+        self.last_nan = -1
+
+    def update(self, x: float) -> float:
+        i = self.bars
+        self.bars += 1
+        if math.isnan(x):
+            self.last_nan = i
+        else:
+            while self.candidates and self.better(x, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((i, x))
+        while self.candidates and self.candidates[0][0] <= i - self.window:
+            self.candidates.popleft()
+        if self.bars < self.window or self.last_nan > i - self.window:
+            return math.nan
+        return self.candidates[0][1]
+
+class EMA:
+    """`ewm(span, adjust=False).mean()`, using pandas' update arithmetic."""
+
+    def __init__(self, span: float):
+        self.alpha = 2.0 / (span + 1.0)
+        self.old_wt = 1.0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        if self.value != self.value:
+            if x == x:
+                self.value = x
+            return self.value
+        self.old_wt *= 1.0 - self.alpha
+        if x == x:
+            if self.value != x:
+                self.value = (self.old_wt * self.value + self.alpha * x) / (self.old_wt + self.alpha)
+            self.old_wt = 1.0
+        return self.value
+
+class RSI:
+    """Relative Strength Index from rolling mean gains and losses."""
+
+    def __init__(self, period: int = 14):
+        self.gains = RollingMean(period)
+        self.losses = RollingMean(period)
+        self.prev = math.nan
+
+    def update(self, close: float) -> float:
+        delta = close - self.prev
+        self.prev = close
+        gain = self.gains.update(delta if delta > 0 else 0.0)
+        loss = self.losses.update(-delta if delta < 0 else 0.0)
+        return _rsi(gain, loss)
+
+def _rsi(gain, loss):
+    if math.isnan(gain) or math.isnan(loss):
+        return math.nan
+    if loss == 0:
+        return math.nan if gain == 0 else 100.0
+    return 100 - (100 / (1 + gain / loss))
+
+class Latch:
+    """Hold-until-flip signal: 1 on enter, 0 on exit, otherwise hold. First bar is flat."""
+
+    def __init__(self):
+        self.state = None
+
+    def update(self, enter: bool, exit_: bool) -> float:
+        if self.state is None:
+            self.state = 0.0
+        elif enter:
+            self.state = 1.0
+        elif exit_:
+            self.state = 0.0
+        return self.state
+
+def crossover(fast: float, slow: float) -> float:
+    """1 while `fast` is above `slow`, else 0 (NaN compares as not above)."""
+    return 1.0 if fast > slow else 0.0
+
+class SignalStream:
+    """
+    Base class for per-strategy streams. `update(bar)` takes a mapping with
+    'Close' (and 'High'/'Low' where needed) and returns the new Signal;
+    `position` is the Signal change, as in `calculate_signals`.
+    """
+
+    def __init__(self):
+        self.signal = math.nan
+        self.position = math.nan
+
+    def update(self, bar) -> float:
+        signal = self._signal(bar)
+        self.position = signal - self.signal
+        self.signal = signal
+        return signal
+
+class SMACrossoverStream(SignalStream):
+    def __init__(self, short_window, long_window):
+        super().__init__()
+        self.short = RollingMean(short_window, min_periods=1)
+        self.long = RollingMean(long_window, min_periods=1)
+
+    def _signal(self, bar):
+        close = bar['Close']
+        return crossover(self.short.update(close), self.long.update(close))
+
+class EMACrossoverStream(SignalStream):
+    def __init__(self, short_window, long_window):
+        super().__init__()
+        self.short = EMA(short_window)
+        self.long = EMA(long_window)
+
+    def _signal(self, bar):
+        close = bar['Close']
+        return crossover(self.short.update(close), self.long.update(close))
+
+class SMALongOnlyStream(SignalStream):
+    def __init__(self, window):
+        super().__init__()
+        self.ma = RollingMean(window, min_periods=1)
+
+    def _signal(self, bar):
+        close = bar['Close']
+        return crossover(close, self.ma.update(close))
+
+class RSIStream(SignalStream):
+    def __init__(self, period, overbought, oversold):
+        super().__init__()
+        self.rsi = RSI(period)
+        self.latch = Latch()
+        self.overbought, self.oversold = overbought, oversold
+
+    def _signal(self, bar):
+        rsi = self.rsi.update(bar['Close'])
+        return self.latch.update(rsi < self.oversold, rsi > self.overbought)
+
+class BollingerStream(SignalStream):
+    def __init__(self, window, num_std):
+        super().__init__()
+        self.ma = RollingMean(window)
+        self.std = RollingStd(window)
+        self.latch = Latch()
+        self.num_std = num_std
+
+    def _signal(self, bar):
+        close = bar['Close']
+        ma, std = self.ma.update(close), self.std.update(close)
+        return self.latch.update(close < ma - self.num_std * std, close > ma + self.num_std * std)
+
+class MACDStream(SignalStream):
+    def __init__(self, fast=12, slow=26, signal=9):
+        super().__init__()
+        self.fast, self.slow, self.signal_line = EMA(fast), EMA(slow), EMA(signal)
+
+    def _signal(self, bar):
+        close = bar['Close']
+        macd = self.fast.update(close) - self.slow.update(close)
+        return crossover(macd, self.signal_line.update(macd))
+
+class StochasticStream(SignalStream):
+    def __init__(self, k_period=14, d_period=3, overbought=80, oversold=20):
+        super().__init__()
+        self.low = RollingExtreme(k_period, "min")
+        self.high = RollingExtreme(k_period, "max")
+        self.d = RollingMean(d_period)  # %D is kept for parity; the signal uses %K
+        self.latch = Latch()
+        self.overbought, self.oversold = overbought, oversold
+        self.k = math.nan
+
+    def _signal(self, bar):
+        low_min, high_max = self.low.update(bar['Low']), self.high.update(bar['High'])
+        span = high_max - low_min
+        if span == 0:
+            k = math.nan if bar['Close'] == low_min else math.copysign(math.inf, bar['Close'] - low_min)
+        else:
+            k = 100 * ((bar['Close'] - low_min) / span)
+        self.k = k
+        self.d.update(k)
+        return self.latch.update(k < self.oversold, k > self.overbought)
+
+def create_stream(strategy_type: str, params: dict) -> SignalStream:
+    """
+    Streaming counterpart of `calculate_signals`: returns an object whose
+    `update(bar)` yields the same Signal the batch path gives for that bar.
+    """
+    if strategy_type == "SMA Crossover":
+        return SMACrossoverStream(params['short_window'], params['long_window'])
+    elif strategy_type == "EMA Crossover":
+        return EMACrossoverStream(params['short_window'], params['long_window'])
+    elif strategy_type == "SMA Long Only":
+        return SMALongOnlyStream(params['window'])
+    elif strategy_type == "RSI Strategy":
+        return RSIStream(params['period'], params['overbought'], params['oversold'])
+    elif strategy_type == "Bollinger Bands":
+        return BollingerStream(params['window'], params['num_std'])
+    elif strategy_type == "MACD Crossover":
+        return MACDStream(params['fast'], params['slow'], params['signal'])
+    elif strategy_type == "Stochastic Oscillator":
+        return StochasticStream(params['k_period'], params['d_period'], params['overbought'], params['oversold'])
+    raise ValueError(f"Unknown strategy: {strategy_type}")
+
+def verify_stream(data, strategy_type: str, params: dict) -> dict:
+    """
+    Replays `data` bar by bar through `create_stream` and compares every
+    Signal with `calculate_signals` over the full history.
+    """
+    expected = calculate_signals(data, strategy_type, params)['Signal'].to_numpy()
+    stream = create_stream(strategy_type, params)
+    columns = [c for c in ('Close', 'High', 'Low') if c in data]
+    arrays = [data[c].to_numpy(dtype=np.float64) for c in columns]
+    streamed = np.array([stream.update(dict(zip(columns, bar))) for bar in zip(*arrays)])
+    mismatches = np.flatnonzero(streamed != expected)
+    return {
+        "bars": len(expected),
+        "mismatches": len(mismatches),
+        "first_mismatch": int(mismatches[0]) if len(mismatches) else None,
+    }
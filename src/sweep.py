@@ -0,0 +1,137 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import backtest_columns
+from src.bars import periods_per_year
+from src.indicators import ewm_mean, rolling_max, rolling_mean_grid, rolling_min, rolling_std_grid
+from src.strategy import latch_signal
+
+# Parameter names each strategy takes, in the order `calculate_signals` reads them
+SWEEP_PARAMS = {
+    "SMA Crossover": ["short_window", "long_window"],
+    "EMA Crossover": ["short_window", "long_window"],
+    "SMA Long Only": ["window"],
+    "RSI Strategy": ["period", "overbought", "oversold"],
+    "Bollinger Bands": ["window", "num_std"],
+    "MACD Crossover": ["fast", "slow", "signal"],
+    "Stochastic Oscillator": ["k_period", "d_period", "overbought", "oversold"],
+}
+
+# Each builder takes the price arrays and one chunk of parameter columns and
+# returns a (bars x chunk) Signal block matching `calculate_signals`.
+
+def _sma_crossover(prices, p):
+    shorts, si = np.unique(p['short_window'].astype(np.int64), return_inverse=True)
+    longs, li = np.unique(p['long_window'].astype(np.int64), return_inverse=True)
+    short_ma = rolling_mean_grid(prices['Close'], shorts, min_periods=1)
+    long_ma = rolling_mean_grid(prices['Close'], longs, min_periods=1)
+    return (short_ma[:, si] > long_ma[:, li]).astype(np.float64)
+
+def _ema_crossover(prices, p):
+    shorts, si = np.unique(p['short_window'], return_inverse=True)
+    longs, li = np.unique(p['long_window'], return_inverse=True)
+    short_ma = ewm_mean(prices['Close'], shorts)
+    long_ma = ewm_mean(prices['Close'], longs)
+    return (short_ma[:, si] > long_ma[:, li]).astype(np.float64)
+
+def _sma_long_only(prices, p):
+    windows, wi = np.unique(p['window'].astype(np.int64), return_inverse=True)
+    ma = rolling_mean_grid(prices['Close'], windows, min_periods=1)
+    return (prices['Close'][:, None] > ma[:, wi]).astype(np.float64)
+
+def _rsi_strategy(prices, p):
+    periods, pi = np.unique(p['period'].astype(np.int64), return_inverse=True)
+    delta = np.diff(prices['Close'], prepend=np.nan)
+    gain = rolling_mean_grid(np.where(delta > 0, delta, 0.0), periods)
+    loss = rolling_mean_grid(np.where(delta < 0, -delta, 0.0), periods)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi = 100 - (100 / (1 + gain / loss))
+    rsi = rsi[:, pi]
+    return latch_signal(rsi < p['oversold'], rsi > p['overbought'])
+
+def _bollinger_bands(prices, p):
+    windows, wi = np.unique(p['window'].astype(np.int64), return_inverse=True)
+    close = prices['Close'][:, None]
+    ma = rolling_mean_grid(prices['Close'], windows)[:, wi]
+    std = rolling_std_grid(prices['Close'], windows)[:, wi]
+    return latch_signal(close < ma - p['num_std'] * std, close > ma + p['num_std'] * std)
+
+def _macd(prices, p):
+    fasts, fi = np.unique(p['fast'], return_inverse=True)
+    slows, si = np.unique(p['slow'], return_inverse=True)
+    macd = ewm_mean(prices['Close'], fasts)[:, fi] - ewm_mean(prices['Close'], slows)[:, si]
+    return (macd > ewm_mean(macd, p['signal'])).astype(np.float64)
+
+def _stochastic(prices, p):
+    # %D only feeds the plot, so `d_period` does not change the signal
+    k_periods, ki = np.unique(p['k_period'].astype(np.int64), return_inverse=True)
+    k = np.empty((len(prices['Close']), len(k_periods)))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for j, period in enumerate(k_periods):
+            low_min = rolling_min(prices['Low'], period)
+            high_max = rolling_max(prices['High'], period)
+            k[:, j] = 100 * ((prices['Close'] - low_min) / (high_max - low_min))
+    k = k[:, ki]
+    return latch_signal(k < p['oversold'], k > p['overbought'])
+
+_BUILDERS = {
+    "SMA Crossover": _sma_crossover,
+    "EMA Crossover": _ema_crossover,
+    "SMA Long Only": _sma_long_only,
+    "RSI Strategy": _rsi_strategy,
+    "Bollinger Bands": _bollinger_bands,
+    "MACD Crossover": _macd,
+    "Stochastic Oscillator": _stochastic,
+}
+
+def signal_block(prices: dict, strategy_type: str, params: dict) -> np.ndarray:
+    """
+    Builds the Signal column for each parameter set directly from price arrays.
+    `prices` maps 'Close'/'High'/'Low' to 1D arrays and `params` maps each
+    parameter name to an array of values (one per column of the result).
+    """
+    if strategy_type not in _BUILDERS:
+        raise ValueError(f"Unknown strategy: {strategy_type}")
+    return _BUILDERS[strategy_type](prices, {name: np.asarray(v, dtype=np.float64) for name, v in params.items()})
+
+def param_grid(strategy_type: str, grid: dict) -> pd.DataFrame:
+    """Every combination in `grid` (param name -> list of values), one row each."""
+    if strategy_type not in SWEEP_PARAMS:
+        raise ValueError(f"Unknown strategy: {strategy_type}")
+    names = SWEEP_PARAMS[strategy_type]
+    missing = [name for name in names if name not in grid]
+    if missing:
+        raise ValueError(f"Grid for {strategy_type} is missing {', '.join(missing)}")
+    return pd.DataFrame(list(itertools.product(*(grid[name] for name in names))), columns=names)
+
+def sweep(data: pd.DataFrame, strategy_type: str, grid: dict, initial_capital: float = 100000.0,
+          risk_free_rate: float = 0.0, chunk_size: int = 256, costs: dict = None) -> pd.DataFrame:
+    """
+    Evaluates every combination in `grid` (param name -> list of values) for
+    one strategy and returns one row of numeric metrics per combination.
+
+    Indicators for all parameter values are computed as (bars x params) blocks
+    and the backtest runs column-wise, `chunk_size` combinations at a time, so
+    peak memory is roughly bars x chunk_size x a few float64 arrays.
+    With `costs` every combination pays trading costs as in `run_backtest`.
+    """
+    combos = param_grid(strategy_type, grid)
+    names = list(combos.columns)
+    prices = {col: data[col].to_numpy(dtype=np.float64) for col in ("Close", "High", "Low") if col in data}
+    values = combos.to_numpy(dtype=np.float64)
+    periods = periods_per_year(data.index)
+    volume = data['Volume'].to_numpy() if costs and 'Volume' in data else None
+
+    chunks = []
+    for start in range(0, len(combos), chunk_size):
+        chunk = values[start:start + chunk_size]
+        signals = signal_block(prices, strategy_type, {name: chunk[:, j] for j, name in enumerate(names)})
+        chunks.append(backtest_columns(prices['Close'], signals, initial_capital, risk_free_rate, periods,
+                                       costs, volume))
+
+    if not chunks:
+        return combos
+    metrics = {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+    return pd.concat([combos, pd.DataFrame(metrics, index=combos.index)], axis=1)
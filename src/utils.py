@@ -1,39 +1,151 @@
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 
-def plot_interactive_results(df: pd.DataFrame, symbol: str):
+from src.compact import with_plot_columns
+
+# Plotly and matplotlib are imported inside the functions that draw, so
+# importing this module (e.g. for the downsampling helpers) stays cheap.
+
+def downsample_minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the min and max of `y` in each of n_out/2 equal buckets (plus the
+    first and last point), so peaks and troughs survive downsampling.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    buckets = max(n_out // 2, 1)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    # NaNs never win a bucket unless the whole bucket is NaN
+    lows = np.where(np.isnan(padded), np.inf, padded).argmin(axis=1)
+    highs = np.where(np.isnan(padded), -np.inf, padded).argmax(axis=1)
+    offsets = np.arange(buckets) * size
+    idx = np.concatenate(([0, n - 1], offsets + lows, offsets + highs))
+    return np.unique(idx[idx < n])
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices chosen by Largest-Triangle-Three-Buckets: per bucket, the point that
+    forms the largest triangle with the previously kept point and the next
+    bucket's average, which preserves the visual shape of the line. A few
+    whole-array passes, but still several times the cost of
+    `downsample_minmax`, which stays the charts' default.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 buckets between the first and the last point, which are always kept
+    bounds = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    lo, hi = bounds[:-1], bounds[1:]
+    # Each bucket's average (NaN-aware for y) is the third corner for the bucket before
+    valid = ~np.isnan(y[:-1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_x = np.add.reduceat(x[:-1], lo) / (hi - lo)
+        avg_y = np.add.reduceat(np.where(valid, y[:-1], 0.0), lo) / np.add.reduceat(valid, lo)
+    next_x, next_y = np.append(avg_x[1:], x[-1]), np.append(avg_y[1:], y[-1])
+
+    # The buckets as rows of a padded (buckets x width) grid; padding is NaN,
+    # which scores like a missing point but always sits after the real ones
+    cols = np.arange((hi - lo).max())
+    grid = np.minimum(lo[:, None] + cols, n - 1)
+    grid_x, grid_y = x[grid], y[grid]
+    grid_y[lo[:, None] + cols >= hi[:, None]] = np.nan
+
+    def pick(rows, anchors):
+        xa, ya = x[anchors], y[anchors]
+        ay = np.where(np.isnan(next_y[rows]), ya, next_y[rows])
+        area = (xa - next_x[rows])[:, None] * (grid_y[rows] - ya[:, None])
+        area -= (xa[:, None] - grid_x[rows]) * (ay - ya)[:, None]
+        np.abs(area, out=area)
+        # A missing point (NaN area) scores -1: it is kept only if the whole bucket is missing
+        np.fmax(area, -1.0, out=area)
+        return lo[rows] + area.argmax(axis=1)
+
+    # Each bucket's pick depends on the one kept in the bucket before, so all
+    # buckets are picked at once from the current anchors, then only those
+    # whose anchor moved are picked again. After k passes the first k picks
+    # are final, and in practice a change dies out within a few buckets.
+    everything = slice(None)
+    chosen = pick(everything, lo - 1)
+    picked = pick(everything, np.concatenate(([0], chosen[:-1])))
+    rows = np.flatnonzero(picked != chosen)
+    chosen = picked
+    rows = rows[rows < len(lo) - 1] + 1
+    while len(rows):
+        picked = pick(rows, chosen[rows - 1])
+        moved = rows[picked != chosen[rows]]
+        chosen[rows] = picked
+        rows = moved[moved < len(lo) - 1] + 1
+    return np.concatenate(([0], chosen, [n - 1]))
+
+def _line(x, y, name, line, max_points, method, webgl_threshold):
+    """A line trace, downsampled to `max_points` and drawn with WebGL when large."""
+    import plotly.graph_objects as go
+
+    y = np.asarray(y, dtype=np.float64)
+    if max_points and len(y) > max_points:
+        if method == "lttb":
+            # Bar positions rather than timestamps, so market closures don't skew the triangles
+            idx = downsample_lttb(np.arange(len(y)), y, max_points)
+        else:
+            idx = downsample_minmax(y, max_points)
+        x, y = x[idx], y[idx]
+    trace = go.Scattergl if len(y) > webgl_threshold else go.Scatter
+    return trace(x=x, y=y, name=name, line=line)
+
+def plot_interactive_results(df: pd.DataFrame, symbol: str, max_points: int = 4000, method: str = "minmax",
+                             webgl_threshold: int = 5000):
     """
     Creates an interactive Plotly chart with buy/sell signals and equity curve.
+
+    Line traces longer than `max_points` are downsampled ("minmax" or "lttb")
+    so long histories stay light in the browser; every buy/sell marker is
+    always kept. Traces with more than `webgl_threshold` points (e.g. with
+    `max_points=None`) are drawn with WebGL. Compact-mode results get their
+    indicator lines rebuilt here, only when charted.
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    df = with_plot_columns(df)
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
                         vertical_spacing=0.1, 
                         subplot_titles=(f"{symbol} - Price and Signals", "Equity Curve"),
                         row_heights=[0.7, 0.3])
 
+    def line(y, name, style):
+        return _line(df.index, y, name, style, max_points, method, webgl_threshold)
+
     # Price and Moving Averages
-    fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Close', line=dict(color='rgba(100, 100, 100, 0.4)')), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['Short_MA'], name='Short MA', line=dict(color='blue')), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['Long_MA'], name='Long MA', line=dict(color='red')), row=1, col=1)
+    fig.add_trace(line(df['Close'], 'Close', dict(color='rgba(100, 100, 100, 0.4)')), row=1, col=1)
+    fig.add_trace(line(df['Short_MA'], 'Short MA', dict(color='blue')), row=1, col=1)
+    fig.add_trace(line(df['Long_MA'], 'Long MA', dict(color='red')), row=1, col=1)
 
     # Buy Signals
+    marker_trace = go.Scattergl if (df['Position'] != 0).sum() > webgl_threshold else go.Scatter
     buy_signals = df[df['Position'] == 1]
-    fig.add_trace(go.Scatter(x=buy_signals.index, y=buy_signals['Short_MA'], 
-                             mode='markers', name='Buy', 
-                             marker=dict(symbol='triangle-up', size=12, color='green')), row=1, col=1)
+    fig.add_trace(marker_trace(x=buy_signals.index, y=buy_signals['Short_MA'], 
+                               mode='markers', name='Buy', 
+                               marker=dict(symbol='triangle-up', size=12, color='green')), row=1, col=1)
 
     # Sell Signals
     sell_signals = df[df['Position'] == -1]
-    fig.add_trace(go.Scatter(x=sell_signals.index, y=sell_signals['Short_MA'], 
-                             mode='markers', name='Sell', 
-                             marker=dict(symbol='triangle-down', size=12, color='red')), row=1, col=1)
+    fig.add_trace(marker_trace(x=sell_signals.index, y=sell_signals['Short_MA'], 
+                               mode='markers', name='Sell', 
+                               marker=dict(symbol='triangle-down', size=12, color='red')), row=1, col=1)
 
     # Equity Curves
-    fig.add_trace(go.Scatter(x=df.index, y=df['Equity_Curve'], name='Strategy Equity', line=dict(color='orange')), row=2, col=1)
+    fig.add_trace(line(df['Equity_Curve'], 'Strategy Equity', dict(color='orange')), row=2, col=1)
     
     # Calculate Buy & Hold Equity Curve for comparison
     bh_equity = (1.0 + df['Market_Returns'].fillna(0)).cumprod() * df['Equity_Curve'].iloc[0]
-    fig.add_trace(go.Scatter(x=df.index, y=bh_equity, name='Buy & Hold', line=dict(color='gray', dash='dash')), row=2, col=1)
+    fig.add_trace(line(bh_equity, 'Buy & Hold', dict(color='gray', dash='dash')), row=2, col=1)
 
     fig.update_layout(height=800, template='plotly_dark', showlegend=True)
     return fig
@@ -43,7 +155,12 @@ def plot_results(df: pd.DataFrame, symbol: str):
     """
     Plots the price, moving averages, signals, and equity curve.
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
+    # A bare Figure renders straight to the file: no pyplot, no GUI backend
+    from matplotlib.figure import Figure
+
+    df = with_plot_columns(df)
+    fig = Figure(figsize=(14, 10))
+    ax1, ax2 = fig.subplots(2, 1, sharex=True)
     
     # Plot Price and MAs
     ax1.plot(df.index, df['Close'], label='Close Price', alpha=0.5)
@@ -68,7 +185,6 @@ def plot_results(df: pd.DataFrame, symbol: str):
     ax2.legend()
     ax2.grid()
     
-    plt.tight_layout()
-    plt.savefig('backtest_results.png')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig('backtest_results.png')
     print("Results plotted and saved to 'backtest_results.png'")
@@ -0,0 +1,135 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src import instrument
+from src.backtest import backtest_columns, run_backtest
+from src.bars import periods_per_year
+from src.metrics import compute_metrics
+from src.parallel import _attach, _detach, _worker
+from src.sweep import param_grid, signal_block
+
+def walk_forward_folds(n_bars: int, train_bars: int, test_bars: int, anchored: bool = False) -> list:
+    """
+    (train_start, train_end, test_start, test_end) bar positions, end-exclusive.
+    Each test window follows its training window; windows roll forward by
+    `test_bars`. With `anchored=True` every training window starts at bar 0.
+    """
+    folds = []
+    test_start = train_bars
+    while test_start < n_bars:
+        test_end = min(test_start + test_bars, n_bars)
+        folds.append((0 if anchored else test_start - train_bars, test_start, test_start, test_end))
+        test_start = test_end
+    return folds
+
+def _fit_fold(fold):
+    """Scores every combination on the fold's training window and returns the best (index, score)."""
+    train_start, train_end, _, _ = fold
+    objective, initial_capital, risk_free_rate, periods = _worker['args']
+    block = _worker['block'][train_start:train_end]
+    scores = backtest_columns(block[:, 0], block[:, 1:], initial_capital, risk_free_rate, periods)[objective]
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    best = int(np.argmax(scores))
+    return best, float(scores[best])
+
+def walk_forward(data: pd.DataFrame, strategy_type: str, grid: dict, train_bars: int = 756, test_bars: int = 252,
+                 objective: str = "Sharpe Ratio", anchored: bool = False, initial_capital: float = 100000.0,
+                 risk_free_rate: float = 0.0, max_workers: int = None) -> dict:
+    """
+    Walk-forward optimization of one strategy over `grid` (param name -> list
+    of values): on each training window the combination with the best
+    `objective` (a `backtest_columns` metric) is chosen, then traded with
+    `run_backtest` on the following test window. Signals for every
+    combination are computed once over the full history (indicators only look
+    back, so slicing them leaks nothing) and the folds are fitted in parallel.
+
+    Returns a dict with "folds" (chosen params and in/out-of-sample scores per
+    fold), "equity" (the stitched out-of-sample backtest frame), "metrics"
+    (`compute_metrics` of that frame) and "seconds" (wall time per stage).
+    """
+    wall_start = time.perf_counter()
+    combos = param_grid(strategy_type, grid)
+    folds = walk_forward_folds(len(data), train_bars, test_bars, anchored)
+    if not folds:
+        raise ValueError(f"Need more than {train_bars} bars for one walk-forward fold, got {len(data)}")
+    periods = periods_per_year(data.index)
+    seconds = {}
+
+    start = time.perf_counter()
+    with instrument.span("walk_forward.signals", strategy=strategy_type, combos=len(combos), rows=len(data)):
+        prices = {col: data[col].to_numpy(dtype=np.float64) for col in ("Close", "High", "Low") if col in data}
+        signals = signal_block(prices, strategy_type, {name: combos[name].to_numpy() for name in combos})
+    seconds["signals"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shape = (len(data), 1 + len(combos))
+    shm = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1] * 8, 1))
+    block = None
+    try:
+        # Column 0 is Close, the rest one Signal column per parameter combination
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+        block[:, 0] = prices['Close']
+        block[:, 1:] = signals
+        del signals
+        initargs = (shm.name, shape, {'args': (objective, initial_capital, risk_free_rate, periods)}, 'F')
+        max_workers = min(max_workers or os.cpu_count() or 1, len(folds))
+        with instrument.span("walk_forward.fit", folds=len(folds), workers=max_workers):
+            if max_workers == 1:
+                _attach(*initargs)
+                try:
+                    fits = [_fit_fold(fold) for fold in folds]
+                finally:
+                    _detach()
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach, initargs=initargs) as pool:
+                    fits = list(pool.map(_fit_fold, folds))
+        seconds["fit"] = time.perf_counter() - start
+
+        # Out of sample: trade each fold's pick, starting one bar early so the
+        # first test bar's return (on the signal set at the previous close) counts
+        start = time.perf_counter()
+        records = combos.to_dict('records')
+        pieces, rows = [], []
+        capital = initial_capital
+        with instrument.span("walk_forward.test", folds=len(folds)):
+            for i, ((train_start, train_end, test_start, test_end), (best, score)) in enumerate(zip(folds, fits)):
+                frame = data[['Close']].iloc[test_start - 1:test_end].copy()
+                frame['Signal'] = block[test_start - 1:test_end, 1 + best].copy()
+                # The first fold keeps its starting bar so the curve begins at initial_capital
+                result = run_backtest(frame, capital).iloc[0 if i == 0 else 1:]
+                result['Fold'] = i
+                pieces.append(result)
+                test_return = result['Equity_Curve'].iloc[-1] / capital - 1
+                capital = result['Equity_Curve'].iloc[-1]
+                rows.append({
+                    "Fold": i,
+                    "Train Start": data.index[train_start],
+                    "Train End": data.index[train_end - 1],
+                    "Test Start": data.index[test_start],
+                    "Test End": data.index[test_end - 1],
+                    **records[best],
+                    f"In-Sample {objective}": score,
+                    "Out-of-Sample Return": test_return,
+                })
+        seconds["test"] = time.perf_counter() - start
+    finally:
+        # Views into the block must go before the segment can be closed
+        block = None
+        shm.close()
+        shm.unlink()
+
+    equity = pd.concat(pieces)
+    equity['Peak'] = equity['Equity_Curve'].cummax()
+    equity['Drawdown'] = (equity['Equity_Curve'] - equity['Peak']) / equity['Peak']
+    seconds["total"] = time.perf_counter() - wall_start
+    return {
+        "folds": pd.DataFrame(rows),
+        "equity": equity,
+        "metrics": compute_metrics(equity, risk_free_rate, periods),
+        "seconds": seconds,
+    }
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest import backtest_columns, run_backtest
+from src.metrics import compute_metrics
+from src.strategy import calculate_signals
+
+COSTS = {"commission_bps": 1.0, "spread_bps": 2.0, "impact_bps": 10.0}
+
+class MetricsOnlyTest(unittest.TestCase):
+    def setUp(self):
+        self.signals = calculate_signals(make_ohlcv(2000), "SMA Crossover", {'short_window': 20, 'long_window': 50})
+
+    def assertSameMetrics(self, data, costs=None):
+        full = compute_metrics(run_backtest(data, costs=costs))
+        lean = run_backtest(data, metrics_only=True, costs=costs)
+        for key, value in full.items():
+            self.assertTrue(np.isfinite(lean[key]), key)
+            self.assertAlmostEqual(lean[key], value, places=10, msg=key)
+
+    def test_matches_full_path(self):
+        self.assertSameMetrics(self.signals)
+        self.assertSameMetrics(self.signals, COSTS)
+
+    def test_missing_close_matches_full_path(self):
+        data = self.signals.copy()
+        data.iloc[[100, 900, 901], data.columns.get_loc('Close')] = np.nan
+        self.assertSameMetrics(data)
+        self.assertSameMetrics(data, COSTS)
+
+    def test_missing_signal_matches_full_path(self):
+        data = self.signals.copy()
+        data.iloc[500, data.columns.get_loc('Signal')] = np.nan
+        self.assertSameMetrics(data)
+
+    def test_gap_in_one_column_leaves_the_others(self):
+        data = self.signals.copy()
+        data.iloc[300, data.columns.get_loc('Close')] = np.nan
+        block = np.column_stack([data['Signal'].to_numpy(), np.ones(len(data))])
+        columns = backtest_columns(data['Close'].to_numpy(), block)
+        single = run_backtest(data, metrics_only=True)
+        for key, value in single.items():
+            self.assertAlmostEqual(columns[key][0], value, places=12, msg=key)
+            self.assertTrue(np.isfinite(columns[key][1]), key)
+
+    def test_costs_per_column_match_single_runs(self):
+        # More columns than one impact block, some trading from the first bar, with a missing Close
+        data = make_ohlcv(600, seed=2)
+        close, volume = data['Close'].to_numpy().copy(), data['Volume'].to_numpy()
+        close[250] = np.nan
+        rng = np.random.default_rng(0)
+        block = (rng.random((len(close), 150)) < rng.uniform(0.2, 0.8, 150)).astype(np.float64)
+        block[:, :10] = 0.0
+        columns = backtest_columns(close, block, costs=COSTS, volume=volume)
+        for j in (0, 10, 63, 64, 100, 149):
+            single = backtest_columns(close, block[:, j], costs=COSTS, volume=volume)
+            for key, value in single.items():
+                self.assertAlmostEqual(columns[key][j], value, places=12, msg=f"{key} column {j}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from src.batch import METRIC_COLUMNS, ResultsStore, expand_jobs, run_batch
+
+CONFIG = {
+    "start_date": "2020-01-01",
+    "end_date": "2024-01-01",
+    "batch": {
+        "symbols": ["AAA"],
+        "strategies": {"SMA Crossover": {"short_window": [10, 20], "long_window": [50]}},
+    },
+}
+
+def fetch_with_gap(symbol, start, end):
+    data = make_ohlcv(1000)
+    data.iloc[400, data.columns.get_loc('Close')] = np.nan
+    return data
+
+class ResultsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.db = os.path.join(tempfile.mkdtemp(), "results.db")
+
+    def test_missing_price_gives_finite_metrics(self):
+        summary = run_batch(CONFIG, self.db, fetch_with_gap, max_workers=1)
+        self.assertEqual(summary["completed"], 2)
+        with ResultsStore(self.db) as store:
+            runs = store.top(n=10)
+        self.assertEqual(len(runs), 2)
+        self.assertTrue(np.isfinite(runs[list(METRIC_COLUMNS)].to_numpy()).all())
+
+    def test_runs_without_results_are_rerun(self):
+        jobs = expand_jobs(CONFIG)
+        with ResultsStore(self.db) as store:
+            store.append(jobs, {name: np.full(len(jobs), np.nan) for name in METRIC_COLUMNS})
+            self.assertEqual(store.completed(), set())
+        summary = run_batch(CONFIG, self.db, fetch_with_gap, max_workers=1)
+        self.assertEqual((summary["skipped"], summary["completed"]), (0, 2))
+        with ResultsStore(self.db) as store:
+            self.assertEqual(store.completed(), set(jobs['job_id']))
+            self.assertEqual(store.count(), 2)
+
+if __name__ == "__main__":
+    unittest.main()
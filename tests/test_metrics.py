@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest import run_backtest
+from src.metrics import compute_metrics, rolling_metrics
+from src.strategy import calculate_signals
+
+class RollingMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.result = run_backtest(calculate_signals(make_ohlcv(1000), "SMA Long Only", {'window': 50}))
+
+    def test_matches_compute_metrics_over_the_window(self):
+        rolling = rolling_metrics(self.result, 63)
+        for end in (62, 400, 999):
+            expected = compute_metrics(self.result.iloc[end - 62:end + 1])
+            self.assertAlmostEqual(rolling['Rolling_Volatility'].iloc[end], expected['Annualized Volatility'], places=10)
+
+    def test_flat_window_has_zero_volatility(self):
+        # Volatile bars, then a flat stretch (with a missing bar in it): the
+        # online rolling sums are left with a residual after the volatile part
+        for missing in (None, 750):
+            with self.subTest(missing=missing):
+                returns = np.zeros(len(self.result))
+                returns[1:500] = np.random.default_rng(1).normal(0, 0.02, 499)
+                if missing:
+                    returns[missing] = np.nan
+                rolling = rolling_metrics(self.result.assign(Strategy_Returns=returns), 63)
+                flat = rolling.iloc[563:]
+                self.assertTrue((flat['Rolling_Volatility'] == 0).all())
+                self.assertTrue((flat['Rolling_Sharpe'] == 0).all())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import logging
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.moomoo import LocalTradeSimulator, TradeLedger
+
+logging.getLogger("src.moomoo").setLevel(logging.WARNING)
+
+def random_orders(n, seed=0, fractional=False):
+    rng = np.random.default_rng(seed)
+    qtys = rng.integers(1, 20, n).astype(np.float64)
+    if fractional:
+        qtys += rng.random(n).round(3)
+    # A few zero and negative quantities, which both paths reject
+    qtys[rng.random(n) < 0.03] = 0.0
+    qtys[rng.random(n) < 0.03] *= -1
+    return {
+        "symbols": rng.choice(["AAA", "BBB", "CCC", "DDD"], n).astype(object),
+        "qtys": qtys,
+        "sides": rng.choice(["BUY", "SELL", "buy", "HOLD"], n, p=[0.5, 0.4, 0.05, 0.05]),
+        "prices": rng.uniform(10, 200, n).round(2),
+    }
+
+class PlaceOrdersTest(unittest.TestCase):
+    def assertSameAsSequential(self, orders, cash):
+        simulator = LocalTradeSimulator()
+        sequential = {"cash": cash, "positions": {"AAA": 5}, "history": []}
+        expected = [simulator.place_order(sequential, *args)[0] for args in zip(
+            orders['symbols'], orders['qtys'].tolist(), orders['sides'], orders['prices'].tolist())]
+        batch = {"cash": cash, "positions": {"AAA": 5}, "history": []}
+        accepted = simulator.place_orders(batch, **orders)
+        self.assertEqual(accepted.tolist(), expected)
+        self.assertEqual(batch['cash'], sequential['cash'])
+        self.assertEqual(batch['positions'], sequential['positions'])
+        for key in ("symbol", "side", "qty", "price"):
+            np.testing.assert_array_equal([t[key] for t in batch['history']], [t[key] for t in sequential['history']],
+                                          err_msg=key)
+        return accepted
+
+    def test_matches_sequential_with_rejections(self):
+        accepted = self.assertSameAsSequential(random_orders(2000), cash=20000.0)
+        self.assertGreater((~accepted).sum(), 100)
+
+    def test_matches_sequential_with_fractional_quantities(self):
+        self.assertSameAsSequential(random_orders(2000, seed=1, fractional=True), cash=50000.0)
+
+    def test_non_positive_quantity_is_rejected(self):
+        simulator = LocalTradeSimulator()
+        for qty, side in ((0, "BUY"), (-5, "BUY"), (-5, "sell"), (float("nan"), "BUY")):
+            with self.subTest(qty=qty, side=side):
+                portfolio = {"cash": 1000.0, "positions": {"AAA": 5}, "history": []}
+                self.assertFalse(simulator.place_order(portfolio, "AAA", qty, side, 10.0)[0])
+                self.assertFalse(simulator.place_orders(portfolio, ["AAA"], [qty], [side], [10.0])[0])
+                self.assertEqual(portfolio, {"cash": 1000.0, "positions": {"AAA": 5}, "history": []})
+
+class TradeLedgerTest(unittest.TestCase):
+    def test_spill_dir_reused_by_a_new_ledger(self):
+        spill_dir = tempfile.mkdtemp()
+        # The first ledger spills more files than the second one overwrites
+        for n in (20, 6):
+            ledger = TradeLedger(capacity=4, spill_dir=spill_dir)
+            ledger.append(np.arange(n), np.zeros(n, dtype=np.int32), np.ones(n, dtype=np.int8), np.ones(n),
+                          np.arange(n, dtype=np.float64))
+            frame = ledger.to_frame()
+            self.assertEqual(frame['price'].tolist(), list(range(n)))
+        self.assertEqual(len(os.listdir(spill_dir)), 2)
+
+    def test_no_spill_dir_drops_oldest(self):
+        ledger = TradeLedger(capacity=4)
+        ledger.append(np.arange(10), np.zeros(10, dtype=np.int32), np.ones(10, dtype=np.int8), np.ones(10),
+                      np.arange(10, dtype=np.float64))
+        self.assertEqual(ledger.to_frame()['price'].tolist()[-1], 9.0)
+        self.assertEqual(ledger.dropped + len(ledger), 10)
+
+if __name__ == "__main__":
+    unittest.main()
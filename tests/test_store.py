@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data import fetch_data
+from src.store import OHLCVStore
+
+def make_bars(start, end) -> pd.DataFrame:
+    index = pd.bdate_range(start, end, inclusive="left", name="Date")
+    close = 100.0 + np.arange(len(index))
+    return pd.DataFrame({"Close": close, "Volume": 1000.0}, index=index)
+
+class FakeProvider:
+    """Serves bars from `history` for [start, end); the first `failures` calls raise ConnectionError."""
+
+    def __init__(self, history: pd.DataFrame, failures: int = 0):
+        self.history = history
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, symbol, start, end, interval):
+        self.calls.append((start, end))
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("download failed")
+        h = self.history
+        return h[(h.index >= pd.Timestamp(start)) & (h.index < pd.Timestamp(end))]
+
+class StoreCoverageTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def test_failed_fetch_is_retried(self):
+        provider = FakeProvider(make_bars("2020-01-01", "2021-01-01"), failures=1)
+        store = OHLCVStore(self.root, provider)
+        with self.assertRaises(ConnectionError):
+            fetch_data("AAA", "2020-01-01", "2021-01-01", store=store)
+        data = fetch_data("AAA", "2020-01-01", "2021-01-01", store=store)
+        self.assertEqual(len(provider.calls), 2)
+        self.assertEqual(len(data), len(provider.history))
+
+    def test_failed_extension_is_retried(self):
+        provider = FakeProvider(make_bars("2020-01-01", "2021-01-01"))
+        store = OHLCVStore(self.root, provider)
+        store.get("AAA", "2020-06-01", "2020-09-01")
+        provider.failures = 1
+        with self.assertRaises(ConnectionError):
+            store.get("AAA", "2020-06-01", "2020-12-01")
+        self.assertEqual(store.meta("AAA")["end"], pd.Timestamp("2020-09-01").isoformat())
+        data = store.get("AAA", "2020-06-01", "2020-12-01")
+        self.assertEqual(data.index.max(), pd.Timestamp("2020-11-30"))
+
+    def test_provider_error_records_nothing(self):
+        def broken(symbol, start, end, interval):
+            raise ConnectionError("offline")
+        store = OHLCVStore(self.root, broken)
+        with self.assertRaises(ConnectionError):
+            store.get("AAA", "2020-01-01", "2021-01-01")
+        self.assertIsNone(store.meta("AAA"))
+
+    def test_empty_past_ranges_are_not_fetched_again(self):
+        # Bars stop on Friday 2020-01-31, the request runs over the weekend into Monday
+        provider = FakeProvider(make_bars("2020-01-02", "2020-02-01"))
+        store = OHLCVStore(self.root, provider)
+        for _ in range(4):
+            data = store.get("AAA", "2020-01-02", "2020-02-03")
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(data.index.max(), pd.Timestamp("2020-01-31"))
+
+        # Listed on 2020-06-01: the earlier dates have no bars, and the symbol none at all before
+        provider = FakeProvider(make_bars("2020-06-01", "2021-01-01"))
+        store = OHLCVStore(self.root, provider)
+        for _ in range(3):
+            store.get("BBB", "2020-01-01", "2020-03-01")
+            data = store.get("BBB", "2020-01-01", "2020-09-01")
+        self.assertEqual(provider.calls, [("2020-01-01", "2020-03-01"), ("2020-03-01", "2020-09-01")])
+        self.assertEqual(data.index.min(), pd.Timestamp("2020-06-01"))
+
+    def test_future_end_fetches_later_bars(self):
+        today = pd.Timestamp.today().normalize()
+        history = make_bars(today - pd.Timedelta(days=60), today - pd.Timedelta(days=10))
+        provider = FakeProvider(history)
+        store = OHLCVStore(self.root, provider)
+        end = today + pd.Timedelta(days=30)
+        first = store.get("AAA", today - pd.Timedelta(days=60), end)
+        self.assertLessEqual(pd.Timestamp(store.meta("AAA")["end"]), history.index.max())
+
+        provider.history = make_bars(today - pd.Timedelta(days=60), today)
+        second = store.get("AAA", today - pd.Timedelta(days=60), end)
+        self.assertEqual(len(provider.calls), 2)
+        self.assertGreater(len(second), len(first))
+        self.assertEqual(second.index.max(), provider.history.index.max())
+
+    def test_past_range_is_served_from_disk(self):
+        provider = FakeProvider(make_bars("2020-01-01", "2021-01-01"))
+        store = OHLCVStore(self.root, provider)
+        store.get("AAA", "2020-01-01", "2021-01-01")
+        store.get("AAA", "2020-03-01", "2020-06-01")
+        self.assertEqual(len(provider.calls), 1)
+
+if __name__ == "__main__":
+    unittest.main()
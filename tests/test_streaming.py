@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_PARAMS, make_ohlcv
+from src.strategy import calculate_signals
+from src.streaming import SignalStream, create_stream
+
+# Short windows so the fixed histories below cover warm-up and steady state
+PARAMS = {
+    "SMA Crossover": {'short_window': 5, 'long_window': 20},
+    "EMA Crossover": {'short_window': 5, 'long_window': 20},
+    "SMA Long Only": {'window': 20},
+    "RSI Strategy": {'period': 14, 'overbought': 70, 'oversold': 30},
+    "Bollinger Bands": {'window': 20, 'num_std': 2.0},
+    "MACD Crossover": {'fast': 12, 'slow': 26, 'signal': 9},
+    "Stochastic Oscillator": {'k_period': 14, 'd_period': 3, 'overbought': 80, 'oversold': 20},
+}
+
+def with_gaps(data):
+    """Missing Close, High and Low values at the start, inside a window and on consecutive bars."""
+    data = data.copy()
+    for column, rows in (("Close", [0, 7, 120, 121, 300]), ("High", [50, 301]), ("Low", [51, 302])):
+        data.iloc[rows, data.columns.get_loc(column)] = np.nan
+    return data
+
+class StreamEquivalenceTest(unittest.TestCase):
+    def assertStreamMatches(self, data, strategy, params):
+        expected = calculate_signals(data, strategy, params)
+        stream = create_stream(strategy, params)
+        signals, positions = [], []
+        for bar in data[['Close', 'High', 'Low']].to_dict('records'):
+            signals.append(stream.update(bar))
+            positions.append(stream.position)
+        np.testing.assert_array_equal(signals, expected['Signal'].to_numpy(), err_msg=f"{strategy} Signal")
+        np.testing.assert_array_equal(positions, expected['Position'].to_numpy(), err_msg=f"{strategy} Position")
+
+    def test_every_stream_is_covered(self):
+        streams = {type(create_stream(strategy, params)) for strategy, params in PARAMS.items()}
+        self.assertEqual(streams, set(SignalStream.__subclasses__()))
+
+    def test_matches_batch(self):
+        data = make_ohlcv(400, seed=3)
+        for strategy, params in PARAMS.items():
+            with self.subTest(strategy=strategy):
+                self.assertStreamMatches(data, strategy, params)
+
+    def test_matches_batch_during_warm_up(self):
+        # Fewer bars than the longest default window: every bar is warm-up
+        data = make_ohlcv(150, seed=4)
+        for strategy, params in DEFAULT_PARAMS.items():
+            with self.subTest(strategy=strategy):
+                self.assertStreamMatches(data, strategy, params)
+
+    def test_matches_batch_with_missing_prices(self):
+        data = with_gaps(make_ohlcv(400, seed=5))
+        for strategy, params in PARAMS.items():
+            with self.subTest(strategy=strategy):
+                self.assertStreamMatches(data, strategy, params)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from src.utils import downsample_lttb, downsample_minmax
+
+def reference_lttb(x, y, n_out):
+    """Textbook Largest-Triangle-Three-Buckets, one bucket at a time (NaN points score lowest)."""
+    n = len(y)
+    bounds = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(int) + 1
+    bounds[-1] = n - 1
+    kept, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        if i + 1 < n_out - 2:
+            nxt = slice(bounds[i + 1], bounds[i + 2])
+            cx = x[nxt].mean()
+            cy = np.nanmean(y[nxt]) if not np.isnan(y[nxt]).all() else np.nan
+        else:
+            cx, cy = x[-1], y[-1]
+        if np.isnan(cy):
+            cy = y[a]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        kept.append(a)
+    return np.array(kept + [n - 1])
+
+class DownsampleTest(unittest.TestCase):
+    def test_lttb_matches_reference(self):
+        rng = np.random.default_rng(0)
+        for trial in range(60):
+            n = int(rng.integers(10, 3000))
+            n_out = int(rng.integers(3, n))
+            y = np.cumsum(rng.normal(size=n))
+            if trial % 3 == 0:
+                y[rng.random(n) < 0.2] = np.nan
+            if trial % 4 == 0:
+                y[:n // 3] = np.nan
+            x = np.arange(n, dtype=np.float64) if trial % 2 else np.sort(rng.random(n)) * 100
+            with self.subTest(n=n, n_out=n_out):
+                np.testing.assert_array_equal(downsample_lttb(x, y, n_out), reference_lttb(x, y, n_out))
+
+    def test_lttb_keeps_ends_and_size(self):
+        y = np.sin(np.linspace(0, 20, 10_000))
+        idx = downsample_lttb(np.arange(len(y)), y, 500)
+        self.assertEqual(len(idx), 500)
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        self.assertTrue((np.diff(idx) > 0).all())
+
+    def test_short_input_is_kept(self):
+        y = np.arange(5.0)
+        np.testing.assert_array_equal(downsample_lttb(y, y, 10), np.arange(5))
+        np.testing.assert_array_equal(downsample_minmax(y, 10), np.arange(5))
+
+    def test_minmax_keeps_extremes(self):
+        rng = np.random.default_rng(1)
+        y = rng.normal(size=10_000)
+        idx = downsample_minmax(y, 400)
+        self.assertIn(int(np.argmax(y)), idx)
+        self.assertIn(int(np.argmin(y)), idx)
+
+if __name__ == "__main__":
+    unittest.main()